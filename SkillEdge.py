@@ -1,32 +1,184 @@
-import subprocess
-import webbrowser
-import os
-import sys
-import time
-
-# Path to your Django project directory
-project_dir = r"C:\Users\shg187514\OneDrive - TATA MOTORS LTD\Python Projects\TrainingMgmt\skilledge-main\skilledge-main\training_mgmt"
-
-# Activate virtual environment if needed
-venv_activate = os.path.join(project_dir, "venv", "Scripts", "activate_this.py")
-if os.path.exists(venv_activate):
-    exec(open(venv_activate).read(), dict(__file__=venv_activate))
-
-# Change working directory to project
-os.chdir(project_dir)
-
-# Start Django server in a subprocess
-# Use 0.0.0.0:8000 if you want to access from other devices
-server = subprocess.Popen([sys.executable, "manage.py", "runserver"], shell=False)
-
-# Wait a moment to let the server start
-time.sleep(2)
-
-# Open the browser
-webbrowser.open("http://127.0.0.1:8000/")
-
-# Wait for the server process to finish
-try:
-    server.wait()
-except KeyboardInterrupt:
-    server.terminate()
\ No newline at end of file
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+import webbrowser
+
+# Path to your Django project directory
+project_dir = r"C:\Users\shg187514\OneDrive - TATA MOTORS LTD\Python Projects\TrainingMgmt\skilledge-main\skilledge-main\training_mgmt"
+FROZEN = getattr(sys, "frozen", False)
+if not os.path.isdir(project_dir):
+    # A PyInstaller build keeps its database and media next to the executable
+    project_dir = os.path.dirname(sys.executable if FROZEN else os.path.abspath(__file__))
+
+HOST = "127.0.0.1"
+PORT = 8000
+READY_TIMEOUT = 60  # seconds to wait for the health check before giving up
+SHUTDOWN_TIMEOUT = 15  # seconds to let in-flight requests finish
+# Written into STATIC_ROOT after a successful collectstatic
+STATIC_STAMP = ".collected"
+
+
+def wait_until_ready(url, server, timeout):
+    """Poll the health-check endpoint until it answers 200 or the server dies."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=2) as response:
+                if response.status == 200 and json.load(response).get("status") == "ok":
+                    return True
+        except (OSError, ValueError):
+            pass
+        time.sleep(0.25)
+    return False
+
+
+def stop_server(server):
+    """Ask the server to finish in-flight requests, then force it down."""
+    if server.poll() is not None:
+        return
+    if os.name == "nt":
+        server.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=SHUTDOWN_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def django_version():
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return version("django")
+    except PackageNotFoundError:
+        return ""
+
+
+def static_sources():
+    dirs = [os.path.join(project_dir, "static")]
+    dirs += [os.path.join(project_dir, app, "static") for app in ("dashboard", "scheduler")]
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+def static_is_stale(static_root):
+    """True when STATIC_ROOT is missing, or older than a static file or the Django install."""
+    stamp = os.path.join(static_root, STATIC_STAMP)
+    try:
+        collected_at = os.path.getmtime(stamp)
+        with open(stamp, encoding="utf-8") as f:
+            collected_for = f.read().strip()
+    except OSError:
+        return True
+    # Django's admin assets change with the Django version
+    if collected_for != django_version():
+        return True
+    for source in static_sources():
+        for root, _, files in os.walk(source):
+            if any(os.path.getmtime(os.path.join(root, name)) > collected_at for name in files):
+                return True
+    return False
+
+
+def collect_static():
+    """Run collectstatic only when the collected files are out of date (source checkouts only)."""
+    static_root = os.path.join(project_dir, "staticfiles")
+    if not static_is_stale(static_root):
+        return
+    result = subprocess.run(manage_command("collectstatic", "--noinput", "-v", "0"), check=False)
+    if result.returncode == 0:
+        with open(os.path.join(static_root, STATIC_STAMP), "w", encoding="utf-8") as f:
+            f.write(django_version())
+
+
+def manage_command(*args):
+    # In a frozen build sys.executable is SkillEdge.exe, which dispatches --manage itself
+    if FROZEN:
+        return [sys.executable, "--manage", *args]
+    return [sys.executable, "manage.py", *args]
+
+
+def server_command(args):
+    if args.dev:
+        return manage_command("runserver", f"{HOST}:{args.port}", "--noreload")
+    try:
+        import waitress  # noqa: F401
+    except ImportError:
+        print("waitress is not installed; falling back to the development server (pip install waitress)")
+        return manage_command("runserver", f"{HOST}:{args.port}", "--noreload")
+    server_args = ["--host", HOST, "--port", str(args.port),
+                   "--threads", str(args.threads), "--workers", str(args.workers)]
+    if FROZEN:
+        return [sys.executable, "--serve", *server_args]
+    return [sys.executable, "-m", "training_mgmt.server", *server_args]
+
+
+def run_embedded(mode, argv):
+    """Entry points the frozen executable re-launches itself with."""
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "training_mgmt.settings")
+    if mode == "--serve":
+        from training_mgmt.server import main as serve
+        return serve(argv)
+    from django.core.management import execute_from_command_line
+    execute_from_command_line(["manage.py", *argv])
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Start SkillEdge")
+    parser.add_argument("--dev", action="store_true", help="Use Django's development server")
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (not on Windows)")
+    parser.add_argument("--no-browser", action="store_true")
+    parser.add_argument("--skip-collectstatic", action="store_true")
+    args = parser.parse_args()
+
+    # Activate virtual environment if needed
+    venv_activate = os.path.join(project_dir, "venv", "Scripts", "activate_this.py")
+    if not FROZEN and os.path.exists(venv_activate):
+        exec(open(venv_activate).read(), dict(__file__=venv_activate))
+
+    # Change working directory to project
+    os.chdir(project_dir)
+
+    # The frozen build ships static files collected by SkillEdge.spec at build time
+    if not args.dev and not args.skip_collectstatic and not FROZEN:
+        collect_static()
+
+    # A new process group lets us send CTRL_BREAK to the server alone on Windows
+    popen_kwargs = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP} if os.name == "nt" else {}
+    server = subprocess.Popen(server_command(args), shell=False, **popen_kwargs)
+
+    base_url = f"http://{HOST}:{args.port}/"
+    if wait_until_ready(base_url + "healthz/", server, READY_TIMEOUT):
+        print(f"SkillEdge is ready at {base_url}")
+        if not args.no_browser:
+            webbrowser.open(base_url)
+    else:
+        print("SkillEdge did not become ready; check the server output above.")
+        stop_server(server)
+        return 1
+
+    # Wait for the server process to finish
+    try:
+        return server.wait()
+    except KeyboardInterrupt:
+        stop_server(server)
+        return 0
+
+
+if __name__ == "__main__":
+    # Lets ProcessPoolExecutor workers start from a frozen Windows build
+    multiprocessing.freeze_support()
+    if len(sys.argv) > 1 and sys.argv[1] in ("--serve", "--manage"):
+        sys.exit(run_embedded(sys.argv[1], sys.argv[2:]))
+    sys.exit(main())
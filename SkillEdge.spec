@@ -0,0 +1,78 @@
+# -*- mode: python ; coding: utf-8 -*-
+#
+# Onedir build of SkillEdge.
+#
+# The old onefile build (pyinstaller --onefile SkillEdge.py) unpacked the whole
+# bundle into a temp directory on every launch. This profile writes a folder
+# (dist/SkillEdge/SkillEdge.exe + _internal/) so launching only maps files that
+# are already on disk. pandas/openpyxl are still bundled but only imported by
+# the views that need them; check with `python -m benchmarks.import_profile`.
+#
+# Static files are collected here, at build time, and shipped in the bundle
+# (STATIC_ROOT is BASE_DIR/staticfiles, i.e. _internal/staticfiles when
+# frozen), so the executable never runs collectstatic on start.
+#
+# Build: pyinstaller SkillEdge.spec --noconfirm
+import subprocess
+import sys
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+subprocess.run([sys.executable, 'manage.py', 'collectstatic', '--noinput', '--clear', '-v', '0'], check=True)
+
+hiddenimports = (
+    collect_submodules('training_mgmt')
+    + collect_submodules('dashboard')
+    + collect_submodules('scheduler')
+    + collect_submodules('django.contrib')
+    + collect_submodules('rest_framework')
+    + ['waitress', 'whitenoise']
+)
+
+datas = [
+    ('dashboard/templates', 'dashboard/templates'),
+    ('static', 'static'),
+    ('staticfiles', 'staticfiles'),
+] + collect_data_files('django') + collect_data_files('rest_framework')
+
+# Modules that are never used at runtime but get pulled in by pandas/numpy hooks
+excludes = ['tkinter', 'matplotlib', 'IPython', 'notebook', 'pytest', 'scipy', 'sphinx', 'jedi']
+
+a = Analysis(
+    ['SkillEdge.py'],
+    pathex=[],
+    binaries=[],
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=excludes,
+    noarchive=False,
+    optimize=1,
+)
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='SkillEdge',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    # UPX-compressed DLLs have to be decompressed on every start
+    upx=False,
+    console=True,
+    disable_windowed_traceback=False,
+    icon=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    name='SkillEdge',
+)
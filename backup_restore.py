@@ -10,6 +10,8 @@ class BackupRestore:
         self.backup_dir = self.base_dir / 'backups'
         self.db_path = self.base_dir / 'db.sqlite3'
         self.media_dir = self.base_dir / 'media'
+        # Uploaded documents moved into the content-addressed store (DOCUMENT_STORE_PATH)
+        self.document_store_dir = self.base_dir / 'local_storage' / 'document_store'
         self.static_dir = self.base_dir / 'static'
         
         # Create backup directory if it doesn't exist
@@ -33,6 +35,12 @@ class BackupRestore:
                 shutil.copytree(self.media_dir, media_backup)
                 print(f"Media files backed up to {media_backup}")
 
+            # Backup stored documents
+            if self.document_store_dir.exists():
+                store_backup = backup_path / 'document_store'
+                shutil.copytree(self.document_store_dir, store_backup)
+                print(f"Stored documents backed up to {store_backup}")
+
             # Backup static files
             if self.static_dir.exists():
                 static_backup = backup_path / 'static'
@@ -44,6 +52,7 @@ class BackupRestore:
                 f.write(f"Backup created at: {datetime.datetime.now()}\n")
                 f.write(f"Database size: {os.path.getsize(self.db_path) if self.db_path.exists() else 0} bytes\n")
                 f.write(f"Media directory size: {self._get_dir_size(self.media_dir) if self.media_dir.exists() else 0} bytes\n")
+                f.write(f"Document store size: {self._get_dir_size(self.document_store_dir) if self.document_store_dir.exists() else 0} bytes\n")
                 f.write(f"Static directory size: {self._get_dir_size(self.static_dir) if self.static_dir.exists() else 0} bytes\n")
 
             print(f"Backup completed successfully at {backup_path}")
@@ -76,6 +85,14 @@ class BackupRestore:
                 shutil.copytree(media_backup, self.media_dir)
                 print(f"Media files restored from {media_backup}")
 
+            # Restore stored documents
+            store_backup = Path(backup_path) / 'document_store'
+            if store_backup.exists():
+                if self.document_store_dir.exists():
+                    shutil.rmtree(self.document_store_dir)
+                shutil.copytree(store_backup, self.document_store_dir)
+                print(f"Stored documents restored from {store_backup}")
+
             # Restore static files
             static_backup = Path(backup_path) / 'static'
             if static_backup.exists():
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+Synthetic workbook generator for the benchmark suite.
+
+Extends onedrive_data/synthetic_training_data.xlsx (names, departments,
+trainings and faculty are sampled from it) into pre/post assessment,
+feedback, attendance and MOR workbooks of a given size.
+
+Run: python -m benchmarks.generate_workbooks --rows 100 1000 10000 100000
+"""
+
+import argparse
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SEED_WORKBOOK = BASE_DIR / 'onedrive_data' / 'synthetic_training_data.xlsx'
+DATA_DIR = Path(__file__).resolve().parent / 'data'
+DEFAULT_SIZES = [100, 1000, 10000, 100000]
+QUESTION_COUNT = 10
+
+PERS_NO_COL = 'पदनाम क्रमांक (Pers No.)'
+NAME_COL = 'कर्मचाऱ्याचे नाव (Employee Name)'
+FEEDBACK_WEIGHTS = ['F1', 'F2', 'F3', 'F4']
+
+
+def load_seed():
+    seed = pd.read_excel(SEED_WORKBOOK)
+    return {
+        'names': seed['Complete name'].dropna().unique().tolist(),
+        'departments': seed['Faculty Dept'].dropna().unique().tolist(),
+        'subareas': seed['Personnel Subarea'].dropna().unique().tolist(),
+        'trainings': seed['Training Name'].dropna().unique().tolist(),
+        'faculty': seed['Faculty Name'].dropna().unique().tolist(),
+        'grades': seed['Grade'].dropna().unique().tolist(),
+        'template': seed,
+    }
+
+
+def _pers_nos(rng, rows):
+    return rng.sample(range(100000, 100000 + rows * 10), rows)
+
+
+def _start_times(rng, rows, days=5):
+    base = datetime(2025, 6, 2, 9, 0)
+    return [
+        (base + timedelta(days=rng.randrange(days), minutes=rng.randrange(480))).strftime('%d-%m-%Y %I:%M:%S %p')
+        for _ in range(rows)
+    ]
+
+
+def assessment_frame(rng, seed, pers_nos, improve=0.0):
+    rows = len(pers_nos)
+    data = {
+        'ID': range(1, rows + 1),
+        'Start time': _start_times(rng, rows),
+        PERS_NO_COL: pers_nos,
+        'Employee Name': [rng.choice(seed['names']) for _ in range(rows)],
+        'Faculty Name': [rng.choice(seed['faculty']) for _ in range(rows)],
+    }
+    total = [0] * rows
+    for q in range(1, QUESTION_COUNT + 1):
+        answers, points = [], []
+        for i in range(rows):
+            correct = rng.random() < min(0.45 + improve + q * 0.02, 0.98)
+            answers.append('A' if correct else rng.choice('BCD'))
+            points.append(1 if correct else 0)
+            total[i] += points[-1]
+        data[f'Que - Question {q}'] = answers
+        data[f'Points - Question {q}'] = points
+    data['Total points'] = total
+    return pd.DataFrame(data)
+
+
+def feedback_frame(rng, seed, pers_nos):
+    rows = len(pers_nos)
+    data = {
+        'ID': range(1, rows + 1),
+        'Start time': _start_times(rng, rows),
+        NAME_COL: [rng.choice(seed['names']) for _ in range(rows)],
+        PERS_NO_COL: pers_nos,
+        'व्याख्यात्याचे नाव (Name of Lecturer)': [rng.choice(seed['faculty']) for _ in range(rows)],
+    }
+    for col in FEEDBACK_WEIGHTS:
+        data[col] = [rng.randint(1, 4) for _ in range(rows)]
+    return pd.DataFrame(data)
+
+
+def attendance_frame(rng, seed, pers_nos):
+    template = seed['template']
+    rows = len(pers_nos)
+    picks = [template.iloc[rng.randrange(len(template))] for _ in range(min(rows, 500))]
+    frame = pd.DataFrame([picks[i % len(picks)] for i in range(rows)]).reset_index(drop=True)
+    frame['Sr.No'] = range(1, rows + 1)
+    frame['Pers.No.'] = pers_nos
+    frame['Complete name'] = [rng.choice(seed['names']) for _ in range(rows)]
+    return frame
+
+
+def mor_frame(rng, seed, pers_nos):
+    rows = len(pers_nos)
+    return pd.DataFrame({
+        'Pers.no.': pers_nos,
+        'Name': [rng.choice(seed['names']) for _ in range(rows)],
+        'Joining Date': [datetime(2000, 1, 1) + timedelta(days=rng.randrange(9000)) for _ in range(rows)],
+        'Employee Group': 'Permanent',
+        'Employee Subgroup': [rng.choice(seed['grades']) for _ in range(rows)],
+        'Personnel Subarea': [rng.choice(seed['subareas']) for _ in range(rows)],
+        'Gender Key': [rng.choice(['Male', 'Female']) for _ in range(rows)],
+        'Employment Status': 'Active',
+    })
+
+
+def generate(rows, out_dir=DATA_DIR, seed_value=42, seed=None):
+    rng = random.Random(seed_value + rows)
+    seed = seed or load_seed()
+    target = Path(out_dir) / str(rows)
+    target.mkdir(parents=True, exist_ok=True)
+    pers_nos = _pers_nos(rng, rows)
+    # Roughly 90% of the pre cohort also sits the post assessment
+    post_pers_nos = rng.sample(pers_nos, int(rows * 0.9)) or pers_nos[:1]
+    frames = {
+        'pre': assessment_frame(rng, seed, pers_nos),
+        'post': assessment_frame(rng, seed, post_pers_nos, improve=0.2),
+        'feedback': feedback_frame(rng, seed, pers_nos),
+        'attendance': attendance_frame(rng, seed, pers_nos),
+        'mor': mor_frame(rng, seed, pers_nos),
+    }
+    paths = {}
+    for kind, frame in frames.items():
+        path = target / f'{kind}.xlsx'
+        frame.to_excel(path, index=False)
+        paths[kind] = path
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic benchmark workbooks')
+    parser.add_argument('--rows', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--out', default=str(DATA_DIR))
+    args = parser.parse_args()
+    seed = load_seed()
+    for rows in args.rows:
+        paths = generate(rows, args.out, seed=seed)
+        print(f"Generated {rows} rows: {', '.join(str(p) for p in paths.values())}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Startup import-time report with a budget.
+
+Runs a fresh interpreter with ``-X importtime`` that boots Django and loads
+the URLconf (which imports every view module), then reports the slowest
+top-level packages. Fails if the total exceeds the budget or if a heavy
+analytics package is imported at startup instead of lazily inside a view.
+
+Run: python -m benchmarks.import_profile --budget-ms 1500 --top 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_BUDGET_MS = 1500
+# Packages that must only be imported by the views that need them
+LAZY_PACKAGES = ('pandas', 'numpy', 'openpyxl', 'pyarrow', 'matplotlib')
+
+BOOT_SNIPPET = (
+    "import os; os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'training_mgmt.settings'); "
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+LINE_RE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def profile_imports(snippet=BOOT_SNIPPET):
+    """Return ``[(module, self_us, cumulative_us, depth)]`` for a fresh interpreter."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='0')
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', snippet],
+                          cwd=BASE_DIR, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError(errors[-1] if errors else 'import failed')
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def summarise(rows):
+    by_package = defaultdict(int)
+    for module, self_us, _, _ in rows:
+        by_package[module.split('.')[0]] += self_us
+    total_us = sum(self_us for _, self_us, _, _ in rows)
+    return total_us, sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report startup import time against a budget')
+    parser.add_argument('--budget-ms', type=int, default=DEFAULT_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = profile_imports()
+    total_us, packages = summarise(rows)
+    print(f'Total import time: {total_us / 1000:.0f} ms (budget {args.budget_ms} ms)')
+    for package, self_us in packages[:args.top]:
+        print(f'  {package:<30} {self_us / 1000:>8.1f} ms')
+
+    loaded = {module.split('.')[0] for module, _, _, _ in rows}
+    eager = [pkg for pkg in LAZY_PACKAGES if pkg in loaded]
+    failed = False
+    if eager:
+        print(f"Heavy packages imported at startup: {', '.join(eager)}")
+        failed = True
+    if total_us / 1000 > args.budget_ms:
+        print('Import time budget exceeded')
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
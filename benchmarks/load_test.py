@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+WSGI vs ASGI throughput comparison at a fixed number of concurrent users.
+
+Starts the project under a threaded WSGI server (waitress) and an ASGI server
+(uvicorn), logs in once, then has N simulated users hit the read-only JSON
+APIs for a fixed duration and reports requests/s and latency percentiles.
+
+Run: python -m benchmarks.load_test --username admin --password secret --users 50 --duration 30
+"""
+
+import argparse
+import http.cookiejar
+import re
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import urllib.request
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SERVERS = {
+    'wsgi': [sys.executable, '-m', 'waitress', '--threads=16', '--listen=127.0.0.1:{port}',
+             'training_mgmt.wsgi:application'],
+    'asgi': [sys.executable, '-m', 'uvicorn', '--host', '127.0.0.1', '--port', '{port}',
+             '--log-level', 'warning', 'training_mgmt.asgi:application'],
+}
+ENDPOINTS = {
+    'wsgi': ['/api/halls/', '/api/programs/', '/api/faculty/', '/api/trainings/', '/uploaded-files/'],
+    'asgi': ['/api/async/halls/', '/api/async/programs/', '/api/async/faculty/', '/api/async/trainings/',
+             '/api/async/uploaded-files/'],
+}
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(base_url + '/accounts/login/', timeout=2)
+            return True
+        except OSError:
+            time.sleep(0.25)
+    return False
+
+
+def login(base_url, username, password):
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    page = opener.open(base_url + '/accounts/login/').read().decode('utf-8', 'ignore')
+    match = re.search(r'name="csrfmiddlewaretoken" value="([^"]+)"', page)
+    data = urllib.parse.urlencode({
+        'username': username, 'password': password,
+        'csrfmiddlewaretoken': match.group(1) if match else '',
+    }).encode()
+    request = urllib.request.Request(base_url + '/accounts/login/', data=data,
+                                     headers={'Referer': base_url + '/accounts/login/'})
+    opener.open(request)
+    return '; '.join(f'{c.name}={c.value}' for c in jar)
+
+
+def run_load(base_url, endpoints, cookie, users, duration):
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def user_loop(offset):
+        i = offset
+        while time.monotonic() < stop_at:
+            url = base_url + endpoints[i % len(endpoints)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                request = urllib.request.Request(url, headers={'Cookie': cookie})
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+            except OSError:
+                with lock:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=user_loop, args=(n,)) for n in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+
+    def pct(p):
+        return round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 1) if latencies else None
+
+    return {
+        'requests': len(latencies),
+        'errors': errors[0],
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': pct(50),
+        'p95_ms': pct(95),
+        'p99_ms': pct(99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare WSGI and ASGI throughput')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--duration', type=int, default=30)
+    parser.add_argument('--modes', nargs='+', default=['wsgi', 'asgi'], choices=list(SERVERS))
+    args = parser.parse_args()
+
+    for mode in args.modes:
+        port = free_port()
+        base_url = f'http://127.0.0.1:{port}'
+        command = [part.format(port=port) for part in SERVERS[mode]]
+        server = subprocess.Popen(command, cwd=BASE_DIR)
+        try:
+            if not wait_until_ready(base_url):
+                print(f'{mode}: server did not start')
+                continue
+            cookie = login(base_url, args.username, args.password)
+            result = run_load(base_url, ENDPOINTS[mode], cookie, args.users, args.duration)
+            print(f"{mode}: {result['rps']} req/s, p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+                  f"p99 {result['p99_ms']} ms, {result['errors']} errors ({args.users} users)")
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python
+"""
+Performance benchmark suite for the analytics and import paths.
+
+Every case runs in its own subprocess against a throw-away test database so
+peak RSS is measured per case. Input workbooks are generated by the driver
+before any worker starts, so generating them never counts towards a case.
+Each request a case makes must answer 200; anything else (an error page,
+a redirect to login) fails the case instead of timing it. Results (wall time, peak RSS, SQL query count)
+are appended to benchmarks/history.json and compared with the previous run
+to catch regressions between releases.
+
+Run: python -m benchmarks.run_benchmarks --rows 100 1000 --cases all
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, time as dtime
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+HISTORY_FILE = Path(__file__).resolve().parent / 'history.json'
+CASES = ['excel_ingest', 'analysis', 'schedule_api', 'report_export']
+DEFAULT_THRESHOLD = 0.20
+
+
+def peak_rss_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS and kilobytes on Linux
+        return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 2)
+    except ImportError:
+        pass
+    try:
+        import psutil
+        info = psutil.Process().memory_info()
+        return round(getattr(info, 'peak_wset', info.rss) / (1024 * 1024), 2)
+    except ImportError:
+        return None
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=BASE_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# Worker side ----------------------------------------------------------------
+
+def _setup_django(media_root):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'training_mgmt.settings')
+    import django
+    from django.conf import settings
+    django.setup()
+    settings.MEDIA_ROOT = media_root
+    settings.ALLOWED_HOSTS = ['*']
+    settings.SECURE_SSL_REDIRECT = False
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+
+def _create_fixtures(paths, rows):
+    from django.contrib.auth.models import User
+    from django.core.files import File
+    from dashboard.models import Program, Training, Schedule, Hall, Faculty
+    from dashboard.assessment_models import FeedbackExcelUpload
+
+    user = User.objects.create_superuser('bench', 'bench@example.com', 'bench')
+    program = Program.objects.create(name='Benchmark Program', category='SHE',
+                                     program_type='Non Calendar Program', status='Planned')
+    training = Training.objects.create(training_name='Benchmark Training', program=program,
+                                       program_type='Non Calendar Program', hours=4)
+    hall = Hall.objects.create(name='Benchmark Hall', capacity=60)
+    faculty = Faculty.objects.create(name='Benchmark Faculty', faculty_t_no='BENCH1', is_active=True)
+    schedules = [
+        Schedule(program=program, training=training, hall=hall, faculty=faculty,
+                 date=date(2025, 6, 2 + (i % 25)), start_time=dtime(9, 0), end_time=dtime(13, 0),
+                 duration=4, students=30, status='Planned')
+        for i in range(max(1, min(rows // 10, 10000)))
+    ]
+    Schedule.objects.bulk_create(schedules, batch_size=500)
+    schedule = Schedule.objects.filter(training=training).first()
+    for category in ('pre', 'post', 'feedback'):
+        with open(paths[category], 'rb') as fh:
+            upload = FeedbackExcelUpload(training=training, schedule=schedule, category=category,
+                                         original_name=paths[category].name)
+            upload.file.save(paths[category].name, File(fh), save=True)
+    return {'user': user, 'program': program, 'training': training, 'schedule': schedule,
+            'hall': hall, 'faculty': faculty}
+
+
+KINDS = ('pre', 'post', 'feedback', 'attendance', 'mor')
+
+
+def _workbook_paths(rows, data_dir):
+    target = Path(data_dir) / str(rows)
+    return {kind: target / f'{kind}.xlsx' for kind in KINDS}
+
+
+def _ensure_workbooks(rows, data_dir):
+    if not all(p.exists() for p in _workbook_paths(rows, data_dir).values()):
+        from benchmarks.generate_workbooks import generate
+        generate(rows, data_dir)
+
+
+def _check(response):
+    if response.status_code != 200:
+        location = f" -> {response['Location']}" if response.has_header('Location') else ''
+        raise AssertionError(f'{response.request["PATH_INFO"]} answered {response.status_code}{location}')
+    return response
+
+
+def _run_case(case, paths, fixtures):
+    from django.test import Client
+    from django.urls import reverse
+
+    if case == 'excel_ingest':
+        import pandas as pd
+        for kind in KINDS:
+            pd.read_excel(paths[kind])
+        return
+
+    client = Client()
+    client.force_login(fixtures['user'])
+    if case == 'analysis':
+        for category in ('pre', 'feedback'):
+            _check(client.get(reverse('dashboard:analysis', args=[category, fixtures['schedule'].id])))
+    elif case == 'schedule_api':
+        _check(client.get(reverse('dashboard:api_schedules')))
+        payload = {
+            'program_id': fixtures['program'].id,
+            'schedules': [{
+                'training_id': fixtures['training'].id, 'date': '2025-07-01', 'start_time': '09:00',
+                'duration': 4, 'faculty_id': fixtures['faculty'].id, 'hall_id': fixtures['hall'].id,
+                'students': 30,
+            }],
+        }
+        _check(client.post(reverse('dashboard:api_schedules_batch'), data=json.dumps(payload),
+                           content_type='application/json'))
+    elif case == 'report_export':
+        _check(client.get(reverse('dashboard:generate_report', args=[fixtures['program'].id])))
+        _check(client.get(reverse('dashboard:generate_attendance_report')))
+
+
+def worker(case, rows, data_dir):
+    paths = _workbook_paths(rows, data_dir)
+    missing = [str(p) for p in paths.values() if not p.exists()]
+    if missing:
+        # Generating here would count towards this case's peak RSS
+        raise SystemExit(f"Missing benchmark workbooks (the driver generates them): {', '.join(missing)}")
+
+    with tempfile.TemporaryDirectory() as media_root:
+        _setup_django(media_root)
+        fixtures = _create_fixtures(paths, rows) if case != 'excel_ingest' else {}
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        rss_before = peak_rss_mb()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            _run_case(case, paths, fixtures)
+            wall = time.perf_counter() - started
+    return {
+        'case': case,
+        'rows': rows,
+        'wall_s': round(wall, 4),
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': rss_before,
+        'queries': len(queries),
+    }
+
+
+# Driver side ----------------------------------------------------------------
+
+def load_history():
+    if HISTORY_FILE.exists():
+        return json.loads(HISTORY_FILE.read_text(encoding='utf-8'))
+    return []
+
+
+def find_regressions(previous, current, threshold):
+    regressions = []
+    prev_by_key = {(r['case'], r['rows']): r for r in (previous or {}).get('results', [])}
+    for result in current['results']:
+        prev = prev_by_key.get((result['case'], result['rows']))
+        if not prev or 'error' in result or 'error' in prev:
+            continue
+        for metric in ('wall_s', 'peak_rss_mb', 'queries'):
+            old, new = prev.get(metric), result.get(metric)
+            if old and new and new > old * (1 + threshold):
+                regressions.append(f"{result['case']}@{result['rows']}: {metric} {old} -> {new}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the performance benchmark suite')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--cases', nargs='+', default=['all'], choices=CASES + ['all'])
+    parser.add_argument('--data-dir', default=str(Path(__file__).resolve().parent / 'data'))
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Relative increase treated as a regression (default 0.20)')
+    parser.add_argument('--no-save', action='store_true', help='Do not append to history.json')
+    parser.add_argument('--fail-on-regression', action='store_true')
+    parser.add_argument('--worker', nargs=2, metavar=('CASE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], int(args.worker[1]), args.data_dir)))
+        return 0
+
+    cases = CASES if 'all' in args.cases else args.cases
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': [],
+    }
+    for rows in args.rows:
+        _ensure_workbooks(rows, args.data_dir)
+        for case in cases:
+            proc = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.run_benchmarks', '--worker', case, str(rows),
+                 '--data-dir', args.data_dir],
+                cwd=BASE_DIR, capture_output=True, text=True,
+            )
+            if proc.returncode == 0:
+                result = json.loads(proc.stdout.strip().splitlines()[-1])
+                print(f"{case:<15} {rows:>7} rows  {result['wall_s']:>9.3f}s  "
+                      f"{result['peak_rss_mb']} MB  {result['queries']} queries")
+            else:
+                result = {'case': case, 'rows': rows, 'error': proc.stderr.strip().splitlines()[-1:]}
+                print(f"{case:<15} {rows:>7} rows  FAILED: {result['error']}")
+            run['results'].append(result)
+
+    history = load_history()
+    regressions = find_regressions(history[-1] if history else None, run, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not args.no_save:
+        history.append(run)
+        HISTORY_FILE.write_text(json.dumps(history, indent=2), encoding='utf-8')
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
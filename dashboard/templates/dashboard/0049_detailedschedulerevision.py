@@ -0,0 +1,44 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dashboard', '0048_chartanalysis'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DetailedScheduleRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField()),
+                ('is_keyframe', models.BooleanField(default=False)),
+                ('data', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+                ('detailed_schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='dashboard.detailedschedule')),
+            ],
+            options={
+                'ordering': ['detailed_schedule', 'version'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='detailedschedulerevision',
+            constraint=models.UniqueConstraint(fields=('detailed_schedule', 'version'), name='unique_schedule_revision'),
+        ),
+        migrations.AddIndex(
+            model_name='detailedschedulerevision',
+            index=models.Index(fields=['detailed_schedule', 'is_keyframe', 'version'], name='schedule_rev_keyframe_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='detailedschedulerevision',
+            index=models.Index(fields=['detailed_schedule', 'created_at'], name='schedule_rev_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.3 on 2026-10-19 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0049_detailedschedulerevision'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['model_name', 'record_id', 'timestamp'], name='auditlog_model_record_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0050_auditlog_model_record_timestamp_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['date', 'start_time'], name='schedule_date_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['status', 'date'], name='schedule_status_date_idx'),
+        ),
+    ]
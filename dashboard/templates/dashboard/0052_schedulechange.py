@@ -0,0 +1,33 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:30
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0051_schedule_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleChange',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model_name', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('op', models.CharField(choices=[('upsert', 'Insert/update'), ('delete', 'Delete')], max_length=10)),
+                ('data', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('changed_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['seq'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='schedulechange',
+            index=models.Index(fields=['model_name', 'seq'], name='schedulechange_model_seq_idx'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.3 on 2026-10-19 14:10
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0052_schedulechange'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Question',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=20, unique=True)),
+                ('text', models.TextField()),
+                ('normalised_text', models.TextField()),
+                ('first_seen', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='QuestionStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=10)),
+                ('batch_date', models.DateField(blank=True, null=True)),
+                ('participants', models.PositiveIntegerField(default=0)),
+                ('difficulty', models.FloatField()),
+                ('discrimination', models.FloatField(blank=True, null=True)),
+                ('point_biserial', models.FloatField(blank=True, null=True)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='dashboard.question')),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='question_stats', to='dashboard.schedule')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='questionstat',
+            index=models.Index(fields=['question', 'batch_date'], name='questionstat_trend_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='questionstat',
+            constraint=models.UniqueConstraint(fields=('question', 'schedule', 'category'), name='unique_question_stat_per_batch'),
+        ),
+    ]
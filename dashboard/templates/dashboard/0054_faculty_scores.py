@@ -0,0 +1,61 @@
+# Generated by Django 4.2.3 on 2026-10-19 15:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0053_question_questionstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacultyScoreMonth',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('trainings', models.PositiveIntegerField(default=0)),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('weighted_sum', models.FloatField(default=0)),
+                ('f1_sum', models.FloatField(default=0)),
+                ('f2_sum', models.FloatField(default=0)),
+                ('f3_sum', models.FloatField(default=0)),
+                ('f4_sum', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_months', to='dashboard.faculty')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='FacultyScoreContribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('month', models.DateField()),
+                ('responses', models.PositiveIntegerField(default=0)),
+                ('weighted_sum', models.FloatField(default=0)),
+                ('f1_sum', models.FloatField(default=0)),
+                ('f2_sum', models.FloatField(default=0)),
+                ('f3_sum', models.FloatField(default=0)),
+                ('f4_sum', models.FloatField(default=0)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('faculty', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_contributions', to='dashboard.faculty')),
+                ('schedule', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='faculty_score', to='dashboard.schedule')),
+                ('upload', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='dashboard.feedbackexcelupload')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='facultyscoremonth',
+            constraint=models.UniqueConstraint(fields=('faculty', 'month'), name='unique_faculty_score_month'),
+        ),
+        migrations.AddIndex(
+            model_name='facultyscoremonth',
+            index=models.Index(fields=['month'], name='facultyscoremonth_month_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='facultyscorecontribution',
+            index=models.Index(fields=['faculty', 'month'], name='facultyscorecontrib_fac_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.3 on 2026-10-19 16:05
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0054_faculty_scores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadDataProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(blank=True, max_length=255)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('total_columns', models.PositiveIntegerField(default=0)),
+                ('null_cells', models.PositiveIntegerField(default=0)),
+                ('completeness_rate', models.FloatField(default=0)),
+                ('columns', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+                ('upload', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='data_profile', to='dashboard.feedbackexcelupload')),
+            ],
+        ),
+    ]
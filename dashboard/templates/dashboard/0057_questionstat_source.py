@@ -0,0 +1,25 @@
+# Generated by Django 4.2.3 on 2026-10-19 19:40
+
+from django.db import migrations, models
+
+
+def mark_idi_stats(apps, schema_editor):
+    # Item analysis always stores a discrimination index; IDI backfill rows never have one
+    QuestionStat = apps.get_model('dashboard', 'QuestionStat')
+    QuestionStat.objects.filter(discrimination__isnull=True).update(source='idi')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0056_documentblob_documentalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='questionstat',
+            name='source',
+            field=models.CharField(choices=[('item_analysis', 'Item analysis'), ('idi', 'IDI results')], default='item_analysis', max_length=20),
+        ),
+        migrations.RunPython(mark_idi_stats, migrations.RunPython.noop),
+    ]
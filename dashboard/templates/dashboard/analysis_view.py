@@ -1,84 +1,77 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .models import Schedule, ChartAnalysis
+from django.urls import reverse
+from .models import Schedule
 from .assessment_models import FeedbackExcelUpload
+from .instrumentation import instrument_view, timed
+from .workbook_loader import load_workbooks
+from . import single_flight
+from .chart_analyses import save_chart_analysis
+from .analytics_helpers import (
+    detect_question_and_points_columns, extract_question_text, extract_points_text, get_pandas,
+)
+from .participant_keys import PARTICIPANT_KEY, add_participant_key
+from .frame_dtypes import plain_dtypes
+from .data_grid import PAGE_SIZE as GRID_PAGE_SIZE, grid_page
+from .upload_profile_models import profile_for
+from training_mgmt.log_config import debug_enabled
+from datetime import datetime
 import json
+import logging
+import re
 
-@login_required
-def analysis(request, category, schedule_id):
-    valid_categories = ['feedback', 'pre', 'post']
-    if category not in valid_categories:
-        return render(request, 'dashboard/assessment/analysis_error.html', {
-            'error_message': 'Invalid analysis category.'
-        })
-    import re
-    def is_english_only(text):
-        return all(c.isascii() and (c.isalpha() or c.isdigit() or c in ' .,-()[]') for c in text) and any(c.isalpha() for c in text)
-    def extract_english(col):
-        match = re.search(r'\(([^)]+)\)', col)
-        if match and is_english_only(match.group(1)):
-            return match.group(1).strip()
-        if is_english_only(col):
-            return col.strip()
-        if '-' in col:
-            parts = [p.strip() for p in col.split('-')]
-            for part in parts:
-                if is_english_only(part):
-                    return part
-        return None
-    try:
-        schedule = get_object_or_404(Schedule, id=schedule_id)
-        training = schedule.training
-        improvement_rates = None
-        idi_data = None
-        
-        # Initialize variables
-        grouped_improvement_json = '{}'
-        normalized_gain_json = '{}'
-        normalized_gain_data = None
-        
-        if category in ['pre', 'post']:
-            pre_upload = FeedbackExcelUpload.objects.filter(training=training, schedule=schedule, category='pre').order_by('-uploaded_at').first()
-            post_upload = FeedbackExcelUpload.objects.filter(training=training, schedule=schedule, category='post').order_by('-uploaded_at').first()
-            if pre_upload and post_upload and pre_upload.file and post_upload.file:
-                import pandas as pd
-                pre_df = pd.read_excel(pre_upload.file.path)
-                post_df = pd.read_excel(post_upload.file.path)
-                # Robustly find Pers No. column (English only, case-insensitive)
-                pers_no_col = None
-                for col in pre_df.columns:
-                    if 'pers no' in col.lower():
-                        pers_no_col = col
-                        break
+logger = logging.getLogger(__name__)
+
+def _assessment_charts(frames, schedule_id, category):
+    """
+    Improvement, IDI, date-wise improvement and normalized gain charts of a
+    pre/post pair. Returns plain data so single_flight can share it between
+    concurrent requests.
+    """
+    pd = get_pandas()
+    improvement_rates = None
+    idi_data = None
+    grouped_improvement = None
+    grouped_improvement_json = '{}'
+    normalized_gain_json = '{}'
+    normalized_gain_data = None
+    if category in ['pre', 'post']:
+        with timed('pandas'):
+            if 'pre' in frames and 'post' in frames:
+                # Work on copies: the raw frames are reused further down. Answers
+                # are compared with '>' below, which categoricals do not support
+                pre_df = plain_dtypes(frames['pre']).copy()
+                post_df = plain_dtypes(frames['post']).copy()
+                # Join on canonical integer Pers No. keys: '12345', 12345.0 and ' 012345' all match
+                pre_df, pre_key_source = add_participant_key(pre_df)
+                post_df, post_key_source = add_participant_key(post_df)
+                pers_no_col = PARTICIPANT_KEY if pre_key_source and post_key_source else None
                 if pers_no_col:
-                    print("Columns in pre_df:", list(pre_df.columns))
-                    print("Columns in post_df:", list(post_df.columns))
-                    print("pers_no_col:", pers_no_col)
-                    
-                    # Force string conversion for Pers No. column to avoid merge issues
-                    pre_df[pers_no_col] = pre_df[pers_no_col].astype(str)
-                    post_df[pers_no_col] = post_df[pers_no_col].astype(str)
-                    
+                    if debug_enabled(logger):
+                        logger.debug('Columns in pre_df: %s', list(pre_df.columns))
+                        logger.debug('Columns in post_df: %s', list(post_df.columns))
+                        logger.debug('Participant key columns: %s / %s', pre_key_source, post_key_source)
+
                     # Use new standardized naming convention for questions and points
-                    from .views import detect_question_and_points_columns, extract_question_text
                     pre_questions, pre_points = detect_question_and_points_columns(pre_df.columns)
                     post_questions, post_points = detect_question_and_points_columns(post_df.columns)
-                    
+
                     # Find matching question columns between pre and post files
                     matching_questions = [q for q in pre_questions if q in post_questions]
-                    
-                    print("Pre questions:", pre_questions)
-                    print("Post questions:", post_questions)
-                    print("Matching questions:", matching_questions)
-                    
+
+                    if debug_enabled(logger):
+                        logger.debug('Pre questions: %s', pre_questions)
+                        logger.debug('Post questions: %s', post_questions)
+                        logger.debug('Matching questions: %s', matching_questions)
+
                     # Calculate improvement rates (existing logic)
                     if matching_questions:
                         # Merge pre and post on Pers No.
                         merged = pd.merge(pre_df[[pers_no_col] + matching_questions], \
                                         post_df[[pers_no_col] + matching_questions], \
                                         on=pers_no_col, suffixes=('_pre', '_post'))
-                        
+
                         improvement_rates = {}
                         for question in matching_questions:
                             pre_scores = merged[f'{question}_pre']
@@ -87,45 +80,45 @@ def analysis(request, category, schedule_id):
                             improvement_count = ((post_scores[valid] > pre_scores[valid])).sum()
                             total_students = valid.sum()
                             rate = (improvement_count / total_students * 100) if total_students > 0 else 0
-                            
+
                             # Use the question text (without "Que -" prefix) as the key
                             question_text = extract_question_text(question)
                             improvement_rates[question_text] = round(rate, 2)
-                    
+
                     # Calculate IDI (Item Difficulty Index) - NEW ADDITION
                     matching_points = [p for p in pre_points if p in post_points]
                     if matching_points:
                         idi_data = {}
-                        
+
                         for points_col in matching_points:
                             # Get the corresponding question text for display
                             question_text = extract_question_text(points_col.replace('Points -', 'Que -'))
-                            
+
                             # Use the same logic as improvement chart - only count students in both files
                             # Get the corresponding question column for merging
                             question_col = points_col.replace('Points -', 'Que -')
-                            
+
                             # Merge pre and post data for this specific question
                             merged_question = pd.merge(
                                 pre_df[[pers_no_col, points_col]], \
                                 post_df[[pers_no_col, points_col]], \
                                 on=pers_no_col, suffixes=('_pre', '_post')
                             )
-                            
+
                             # Calculate Pre-test IDI using only students in both files
                             pre_scores = merged_question[f'{points_col}_pre']
                             pre_valid = pre_scores.notnull()
                             pre_correct = (pre_scores[pre_valid] == 1).sum()  # Count students who scored 1 (correct)
                             pre_total = pre_valid.sum()  # Count students with valid scores in both files
                             pre_idi = (pre_correct / pre_total * 100) if pre_total > 0 else 0
-                            
+
                             # Calculate Post-test IDI using only students in both files
                             post_scores = merged_question[f'{points_col}_post']
                             post_valid = post_scores.notnull()
                             post_correct = (post_scores[post_valid] == 1).sum()  # Count students who scored 1 (correct)
                             post_total = post_valid.sum()  # Count students with valid scores in both files
                             post_idi = (post_correct / post_total * 100) if post_total > 0 else 0
-                            
+
                             # Store IDI data
                             idi_data[question_text] = {
                                 'pre_idi': round(pre_idi, 2),
@@ -136,7 +129,7 @@ def analysis(request, category, schedule_id):
                                 'post_total': int(post_total),
                                 'improvement': round(post_idi - pre_idi, 2)
                             }
-                        
+
                         # Determine color scheme based on IDI patterns
                         def get_idi_status(pre_idi, post_idi):
                             if post_idi > 70:
@@ -145,11 +138,11 @@ def analysis(request, category, schedule_id):
                                 return 'moderate'  # Yellow: 50-70% Moderate
                             else:
                                 return 'needs_attention'  # Red: <50% Poor understanding (Needs attention)
-                        
+
                         # Add status to each question
                         for question, data in idi_data.items():
                             data['status'] = get_idi_status(data['pre_idi'], data['post_idi'])
-                    
+
                     # Find Total Points column in both files (existing logic)
                     total_points_col_pre = None
                     total_points_col_post = None
@@ -181,25 +174,20 @@ def analysis(request, category, schedule_id):
                     improvement_count = ((post_scores[valid] > pre_scores[valid])).sum()
                     total_students = valid.sum()
                     rate = (improvement_count / total_students * 100) if total_students > 0 else 0
-                    print(f"Improvement Count (Total Points): {improvement_count}")
-                    print(f"Total Valid Students (Total Points): {total_students}")
-                    print(f"Improvement Rate (Total Points): {rate:.2f}%")
-                    if employee_name_col and employee_name_col in merged.columns:
-                        print("Employee Names of Valid Students:")
-                        print(merged.loc[valid, employee_name_col].tolist())
-                        # Print valid पदनाम क्रमांक (Pers No.)
-                        if 'पदनाम क्रमांक (Pers No.)' in merged.columns:
-                            print("Valid पदनाम क्रमांक (Pers No.) of Valid Students:")
-                            print(merged.loc[valid, 'पदनाम क्रमांक (Pers No.)'].tolist())
-                    else:
-                        print("Employee Name column not found in merged data.")
+                    logger.info(
+                        'Total Points improvement for schedule %s: %s of %s students (%.2f%%)',
+                        schedule_id, improvement_count, total_students, rate,
+                        extra={'schedule_id': schedule_id, 'category': category},
+                    )
+                    if debug_enabled(logger):
+                        if employee_name_col and employee_name_col in merged.columns:
+                            logger.debug('Employee Names of Valid Students: %s', merged.loc[valid, employee_name_col].tolist())
+                            logger.debug('Valid Pers No. of Valid Students: %s', merged.loc[valid, pers_no_col].tolist())
+                        else:
+                            logger.debug('Employee Name column not found in merged data.')
                     improvement_rates = {'Total Points': round(rate, 2)} 
-                    
+
                     # IDI chart logic ends here. Now add grouped improvement logic for Total Points (date-wise and combined)
-                    import pandas as pd
-                    from datetime import datetime
-                    import re as _re
-                    import json as _json
 
                     grouped_improvement = {}
 
@@ -219,10 +207,6 @@ def analysis(request, category, schedule_id):
                         pers_no_col and total_points_col_pre and total_points_col_post
                         and start_time_col_pre and start_time_col_post
                     ):
-                        # Ensure string type for merge
-                        pre_df[pers_no_col] = pre_df[pers_no_col].astype(str)
-                        post_df[pers_no_col] = post_df[pers_no_col].astype(str)
-
                         # Robust date extraction
                         def extract_date(val):
                             if pd.isnull(val):
@@ -231,7 +215,7 @@ def analysis(request, category, schedule_id):
                                 return val.strftime("%d-%m-%Y")
                             try:
                                 s = str(val).strip()
-                                s = _re.sub(r'\s+', ' ', s)
+                                s = re.sub(r'\s+', ' ', s)
                                 s = s.strip()
                                 dt = datetime.strptime(s, "%d-%m-%Y %I:%M:%S %p")
                                 return dt.strftime("%d-%m-%Y")
@@ -309,11 +293,11 @@ def analysis(request, category, schedule_id):
                                     'total_students': int(total_students)
                                 }
 
-                        grouped_improvement_json = _json.dumps(grouped_improvement)
-                        
+                        grouped_improvement_json = json.dumps(grouped_improvement)
+
                         # NEW: Normalized Gain (Hake's Gain) Calculation (NEW FORMULA)
                         normalized_gain_data = {}
-                        
+
                         # --- Combined Analysis ---
                         # Use all valid students across all dates
                         merged_combined = pd.merge(
@@ -350,7 +334,7 @@ def analysis(request, category, schedule_id):
                                 'norm_post': round(norm_post_combined, 4),
                                 'valid_students': int(total_students_combined)
                             }
-                        
+
                         # --- Date-wise Analysis ---
                         for date in all_dates:
                             pre_sub = pre_df[pre_df['__date'] == date]
@@ -389,11 +373,63 @@ def analysis(request, category, schedule_id):
                                     'norm_post': round(norm_post, 4),
                                     'valid_students': int(total_students)
                                 }
-                        
-                        normalized_gain_json = _json.dumps(normalized_gain_data)
+
+                        normalized_gain_json = json.dumps(normalized_gain_data)
                     else:
                         grouped_improvement_json = '{}'
                         normalized_gain_json = '{}'
+    return {
+        'improvement_rates': improvement_rates,
+        'idi_data': idi_data,
+        'grouped_improvement': grouped_improvement,
+        'grouped_improvement_json': grouped_improvement_json,
+        'normalized_gain_data': normalized_gain_data,
+        'normalized_gain_json': normalized_gain_json,
+    }
+
+
+def _save_charts(request, training, schedule, category, charts, df, excel_upload, pre_upload, post_upload):
+    """Keep the computed charts and the item analysis as the schedule's latest ChartAnalysis rows."""
+    input_files = {
+        'pre': pre_upload.file.name if pre_upload and pre_upload.file else None,
+        'post': post_upload.file.name if post_upload and post_upload.file else None,
+    }
+    charts_to_save = {
+        # Saved even when empty (no dated rows) so it replaces the chart of an older pair
+        'improvement': charts['grouped_improvement'],
+        'idi': charts['idi_data'] or None,
+        'normalized_gain': charts['normalized_gain_data'] or None,
+    }
+    for analysis_type, chart_data in charts_to_save.items():
+        if chart_data is None:
+            continue
+        try:
+            save_chart_analysis(training, schedule, analysis_type, chart_data, input_files=input_files,
+                                user=request.user, notes='Auto-saved from analysis view')
+        except Exception:
+            logger.exception('Error saving %s analysis for schedule %s', analysis_type, schedule.id)
+    # Save psychometric item analysis of the uploaded assessment
+    try:
+        if category in ['pre', 'post']:
+            from .item_analysis import store_item_analysis
+            with timed('pandas'):
+                store_item_analysis(training, schedule, category, df, upload=excel_upload, user=request.user)
+    except Exception:
+        logger.exception('Error saving item analysis for schedule %s', schedule.id)
+
+
+@login_required
+@instrument_view
+def analysis(request, category, schedule_id):
+    valid_categories = ['feedback', 'pre', 'post']
+    if category not in valid_categories:
+        return render(request, 'dashboard/assessment/analysis_error.html', {
+            'error_message': 'Invalid analysis category.'
+        })
+    try:
+        schedule = get_object_or_404(Schedule, id=schedule_id)
+        training = schedule.training
+        pre_upload = post_upload = None
         
         excel_upload = FeedbackExcelUpload.objects.filter(
             training=training,
@@ -405,14 +441,44 @@ def analysis(request, category, schedule_id):
                 'error_message': f'No Excel file found for {category} analysis for this schedule.'
             })
         file_path = excel_upload.file.path
-        import pandas as pd
-        df = pd.read_excel(file_path)
+        workbook_paths = {'current': file_path}
+        if category in ['pre', 'post']:
+            pre_upload = FeedbackExcelUpload.objects.filter(training=training, schedule=schedule, category='pre').order_by('-uploaded_at').first()
+            post_upload = FeedbackExcelUpload.objects.filter(training=training, schedule=schedule, category='post').order_by('-uploaded_at').first()
+            if pre_upload and post_upload and pre_upload.file and post_upload.file:
+                workbook_paths.update({'pre': pre_upload.file.path, 'post': post_upload.file.path})
+
+        def compute():
+            # Parse every workbook this request needs in parallel, once
+            with timed('excel'):
+                frames.update(load_workbooks(workbook_paths))
+            charts = _assessment_charts(frames, schedule_id, category)
+            _save_charts(request, training, schedule, category, charts, frames['current'],
+                         excel_upload, pre_upload, post_upload)
+            return charts
+
+        # Identical concurrent requests (e.g. a shared analysis link) wait for one computation
+        frames = {}
+        charts = single_flight.run(
+            ['analysis', schedule.id, category, single_flight.input_hash(workbook_paths.values())], compute)
+        if not frames:
+            # Computed by another request: the workbooks are in the frame cache now
+            with timed('excel'):
+                frames = load_workbooks(workbook_paths)
+        pd = get_pandas()
+        improvement_rates = charts['improvement_rates']
+        idi_data = charts['idi_data']
+        grouped_improvement_json = charts['grouped_improvement_json']
+        normalized_gain_json = charts['normalized_gain_json']
+        normalized_gain_data = charts['normalized_gain_data']
+
+        df = frames['current']
         original_columns = list(df.columns)
         
         missing_assessment_table = []
         if category in ['pre', 'post'] and pre_upload and post_upload and pre_upload.file and post_upload.file:
-           pre_df = pd.read_excel(pre_upload.file.path)
-           post_df = pd.read_excel(post_upload.file.path)
+           pre_df = frames['pre']
+           post_df = frames['post']
 
            def find_col(df, search):
                for col in df.columns:
@@ -420,41 +486,33 @@ def analysis(request, category, schedule_id):
                        return col
                return None
 
+           def names_by_key(df):
+               df, key_source = add_participant_key(plain_dtypes(df))
+               if key_source is None:
+                   return {}
+               name_col = find_col(df, 'employeename')
+               names = df[name_col].where(df[name_col].notna(), '') if name_col else pd.Series('', index=df.index)
+               # First row wins for participants listed twice
+               keys = df[PARTICIPANT_KEY].drop_duplicates()
+               return dict(zip(keys.tolist(), names.loc[keys.index].tolist()))
+
            missing_assessment_table = []
-           pers_no_col_pre = find_col(pre_df, 'persno')
-           emp_name_col_pre = find_col(pre_df, 'employeename')
-           pers_no_col_post = find_col(post_df, 'persno')
-           emp_name_col_post = find_col(post_df, 'employeename')
-
-           pre_pnos = set(pre_df[pers_no_col_pre].dropna().astype(str)) if pers_no_col_pre else set()
-           post_pnos = set(post_df[pers_no_col_post].dropna().astype(str)) if pers_no_col_post else set()
-           only_in_pre = pre_pnos - post_pnos
-           only_in_post = post_pnos - pre_pnos
+           pre_names = names_by_key(pre_df)
+           post_names = names_by_key(post_df)
            sr_no = 1
-           # Students who missed post assessment (look up name in pre)
-           for pno in only_in_pre:
-               row = pre_df[pre_df[pers_no_col_pre].astype(str) == pno].iloc[0] if pers_no_col_pre else None
-               employee_name = row.get(emp_name_col_pre, '') if row is not None and emp_name_col_pre else ''
-               missing_assessment_table.append({
-                   'sr_no': sr_no,
-                   'pers_no': pno,
-                   'employee_name': employee_name if pd.notnull(employee_name) else '',
-                   'missing': 'Post Assessment'
-               })
-               sr_no += 1
-           # Students who missed pre assessment (look up name in post)
-           for pno in only_in_post:
-               row = post_df[post_df[pers_no_col_post].astype(str) == pno].iloc[0] if pers_no_col_post else None
-               employee_name = row.get(emp_name_col_post, '') if row is not None and emp_name_col_post else ''
-               missing_assessment_table.append({
-                   'sr_no': sr_no,
-                   'pers_no': pno,
-                   'employee_name': employee_name if pd.notnull(employee_name) else '',
-                   'missing': 'Pre Assessment'
-               })
-               sr_no += 1
+           for names, others, missing in ((pre_names, post_names, 'Post Assessment'), (post_names, pre_names, 'Pre Assessment')):
+               # Students who missed one assessment (name looked up in the one they took)
+               for pno, employee_name in names.items():
+                   if pno in others:
+                       continue
+                   missing_assessment_table.append({
+                       'sr_no': sr_no,
+                       'pers_no': str(pno),
+                       'employee_name': employee_name,
+                       'missing': missing
+                   })
+                   sr_no += 1
         # Use new standardized naming convention
-        from .views import detect_question_and_points_columns, extract_question_text, extract_points_text
         questions, points = detect_question_and_points_columns(df.columns)
         
         # Extract question and points texts for display
@@ -464,24 +522,16 @@ def analysis(request, category, schedule_id):
         # Create English columns list (for backward compatibility)
         english_columns = question_texts + points_texts
         
-        data_rows = df.to_dict(orient='records') if not df.empty else []
-        total_rows = int(len(df))
-        total_columns = int(len(df.columns))
-        column_info = []
-        for col in df.columns:
-            col_data = df[col].dropna()
-            column_info.append({
-                'name': str(col),
-                'type': str(df[col].dtype),
-                'non_null_count': int(len(col_data)),
-                'null_count': int(df[col].isnull().sum()),
-                'unique_values': int(df[col].nunique()) if df[col].dtype in ['object', 'string'] else None
-            })
-        data_quality = {
-            'total_cells': int(total_rows * total_columns),
-            'null_cells': int(df.isnull().sum().sum()),
-            'completeness_rate': float(((total_rows * total_columns) - df.isnull().sum().sum()) / (total_rows * total_columns) * 100)
-        }
+        # Only the first page goes into the page; the grid fetches the rest from api_upload_rows
+        data_grid = grid_page(df, 0, GRID_PAGE_SIZE)
+        data_rows = [dict(zip(data_grid['columns'], row)) for row in data_grid['rows']]
+        # Column and data-quality figures are profiled once per upload, not per view
+        with timed('pandas'):
+            profile = profile_for(excel_upload, df=df)
+        total_rows = profile.total_rows
+        total_columns = profile.total_columns
+        column_info = profile.columns
+        data_quality = profile.data_quality
         chart_data = {
             'improvement_rates': improvement_rates,
             'idi_data': idi_data
@@ -513,117 +563,41 @@ def analysis(request, category, schedule_id):
             'english_columns': english_columns,
             'dropdown_options': dropdown_options,
             'data_rows': data_rows,
+            'data_grid': data_grid,
+            'data_grid_url': reverse('dashboard:api_upload_rows', args=[excel_upload.id]),
             'grouped_improvement_json': grouped_improvement_json,
             'normalized_gain_json': normalized_gain_json,
             'show_normalized_gain_chart': normalized_gain_data is not None and len(normalized_gain_data) > 0,
         }
-        # Save improvement chart analysis (keep only latest per training, schedule, type)
-        try:
-            ChartAnalysis.objects.filter(
-                training=training,
-                schedule=schedule,
-                analysis_type='improvement'
-            ).delete()
-            ChartAnalysis.objects.create(
-                training=training,
-                schedule=schedule,
-                analysis_type='improvement',
-                input_files={
-                    'pre': pre_upload.file.name if pre_upload and pre_upload.file else None,
-                    'post': post_upload.file.name if post_upload and post_upload.file else None,
-                },
-                chart_data=grouped_improvement,
-                run_by=request.user if hasattr(request, 'user') and request.user.is_authenticated else None,
-                notes='Auto-saved from analysis view'
-            )
-        except Exception as e:
-            print('Error saving improvement analysis:', e)
-        # Save idi chart analysis (keep only latest per training, schedule, type)
-        try:
-            if idi_data:
-                ChartAnalysis.objects.filter(
-                    training=training,
-                    schedule=schedule,
-                    analysis_type='idi'
-                ).delete()
-                ChartAnalysis.objects.create(
-                    training=training,
-                    schedule=schedule,
-                    analysis_type='idi',
-                    input_files={
-                        'pre': pre_upload.file.name if pre_upload and pre_upload.file else None,
-                        'post': post_upload.file.name if post_upload and post_upload.file else None,
-                    },
-                    chart_data=idi_data,
-                    run_by=request.user if hasattr(request, 'user') and request.user.is_authenticated else None,
-                    notes='Auto-saved from analysis view'
-                )
-        except Exception as e:
-            print('Error saving idi analysis:', e)
-        # Save normalized gain chart analysis (keep only latest per training, schedule, type)
-        try:
-            if normalized_gain_data:
-                ChartAnalysis.objects.filter(
-                    training=training,
-                    schedule=schedule,
-                    analysis_type='normalized_gain'
-                ).delete()
-                ChartAnalysis.objects.create(
-                    training=training,
-                    schedule=schedule,
-                    analysis_type='normalized_gain',
-                    input_files={
-                        'pre': pre_upload.file.name if pre_upload and pre_upload.file else None,
-                        'post': post_upload.file.name if post_upload and post_upload.file else None,
-                    },
-                    chart_data=normalized_gain_data,
-                    run_by=request.user if hasattr(request, 'user') and request.user.is_authenticated else None,
-                    notes='Auto-saved from analysis view'
-                )
-        except Exception as e:
-            print('Error saving normalized gain analysis:', e)
         # Robust feedback column detection and debug for feedback category
         detected_feedback_columns = None
         final_weighted_average = None
         faculty_training_ratings = []
         if category == 'feedback':
-            def clean_col(col):
-                return str(col).replace('\xa0', ' ').replace('\u200c', '').strip()
-            f1_col = next((c for c in df.columns if clean_col(c).startswith('F1Que')), None)
-            f2_col = next((c for c in df.columns if clean_col(c).startswith('F2Que')), None)
-            f3_col = next((c for c in df.columns if clean_col(c).startswith('F3Que')), None)
-            f4_col = next((c for c in df.columns if clean_col(c).startswith('F4Que')), None)
-            if not (f1_col and f2_col and f3_col and f4_col):
-                f1_col = f1_col or next((c for c in df.columns if clean_col(c) == 'F1'), None)
-                f2_col = f2_col or next((c for c in df.columns if clean_col(c) == 'F2'), None)
-                f3_col = f3_col or next((c for c in df.columns if clean_col(c) == 'F3'), None)
-                f4_col = f4_col or next((c for c in df.columns if clean_col(c) == 'F4'), None)
-            detected_feedback_columns = {
-                'f1_col': f1_col,
-                'f2_col': f2_col,
-                'f3_col': f3_col,
-                'f4_col': f4_col,
-            }
-            valid_row_count = 0
-            weighted_scores = []
-            if f1_col and f2_col and f3_col and f4_col:
-                for _, row in df.iterrows():
-                    try:
-                        f1 = float(row[f1_col]) if pd.notnull(row[f1_col]) else None
-                        f2 = float(row[f2_col]) if pd.notnull(row[f2_col]) else None
-                        f3 = float(row[f3_col]) if pd.notnull(row[f3_col]) else None
-                        f4 = float(row[f4_col]) if pd.notnull(row[f4_col]) else None
-                        if None not in (f1, f2, f3, f4):
-                            weighted = (f1 * 0.30) + (f2 * 0.25) + (f3 * 0.25) + (f4 * 0.20)
-                            weighted_scores.append(weighted)
-                            valid_row_count += 1
-                    except Exception:
-                        continue
-                if weighted_scores:
-                    final_weighted_average = round(sum(weighted_scores) / len(weighted_scores), 2)
-            # For the chart: show a single bar for this training
-            faculty_training_ratings = []
-            if final_weighted_average is not None:
+            from .faculty_score_models import FacultyScoreContribution, apply_feedback_upload, feedback_sums
+            with timed('pandas'):
+                columns, sums = feedback_sums(df)
+            detected_feedback_columns = {f'{key}_col': col for key, col in columns.items()}
+            if sums['responses']:
+                final_weighted_average = round(sums['weighted_sum'] / sums['responses'], 2)
+            try:
+                apply_feedback_upload(excel_upload, df)
+            except Exception:
+                logger.exception('Error updating faculty scores for schedule %s', schedule_id)
+            # Every scored training of this faculty, not only the current one
+            contributions = (FacultyScoreContribution.objects
+                             .filter(faculty_id=schedule.faculty_id)
+                             .select_related('schedule__training')
+                             .order_by('-schedule__date')[:24]) if schedule.faculty_id else []
+            faculty_training_ratings = [
+                {
+                    'training': str(c.schedule.training.training_name),
+                    'date': str(c.schedule.date),
+                    'score': c.weighted_average,
+                }
+                for c in reversed(list(contributions))
+            ]
+            if not faculty_training_ratings and final_weighted_average is not None:
                 faculty_training_ratings.append({
                     'training': str(schedule.training.training_name),
                     'date': str(schedule.date),
@@ -634,5 +608,6 @@ def analysis(request, category, schedule_id):
         context['faculty_training_ratings_json'] = json.dumps(faculty_training_ratings)
         return render(request, 'dashboard/assessment/feedback_analysis.html', context)
     except Exception as e:
+        logger.exception('Error analyzing %s Excel file for schedule %s', category, schedule_id)
         messages.error(request, f'Error analyzing Excel file: {str(e)}')
         return redirect('dashboard:feedback_form') 
\ No newline at end of file
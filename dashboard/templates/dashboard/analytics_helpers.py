@@ -0,0 +1,66 @@
+"""
+Column-name helpers for the assessment analysis views.
+
+Only the standard library is imported here, so view modules can use these
+at import time without loading pandas or the main views module. pandas
+itself is reached through ``get_pandas()``, which imports it on first use.
+"""
+import re
+from functools import lru_cache
+
+QUESTION_PREFIX = 'Que -'
+POINTS_PREFIX = 'Points -'
+
+
+@lru_cache(maxsize=None)
+def get_pandas():
+    """Import pandas on first use and hand back the module."""
+    import pandas
+    return pandas
+
+
+def detect_question_and_points_columns(columns):
+    """Detect question and points columns using standardized naming convention"""
+    questions = []
+    points = []
+    for col in columns:
+        col_str = str(col).strip()
+        if col_str.startswith(QUESTION_PREFIX):
+            questions.append(col)
+        elif col_str.startswith(POINTS_PREFIX):
+            points.append(col)
+    return questions, points
+
+
+def extract_question_text(column_name):
+    """Extract the question text from a column name"""
+    col_str = str(column_name).strip()
+    if col_str.startswith(QUESTION_PREFIX):
+        return col_str[len(QUESTION_PREFIX):].strip()
+    return col_str
+
+
+def extract_points_text(column_name):
+    """Extract the question text from a points column name"""
+    col_str = str(column_name).strip()
+    if col_str.startswith(POINTS_PREFIX):
+        return col_str[len(POINTS_PREFIX):].strip()
+    return col_str
+
+
+def is_english_only(text):
+    return all(c.isascii() and (c.isalpha() or c.isdigit() or c in ' .,-()[]') for c in text) and any(c.isalpha() for c in text)
+
+
+def extract_english(col):
+    """Return the English part of a bilingual header such as 'पदनाम क्रमांक (Pers No.)'."""
+    match = re.search(r'\(([^)]+)\)', col)
+    if match and is_english_only(match.group(1)):
+        return match.group(1).strip()
+    if is_english_only(col):
+        return col.strip()
+    if '-' in col:
+        for part in (p.strip() for p in col.split('-')):
+            if is_english_only(part):
+                return part
+    return None
@@ -0,0 +1,74 @@
+"""
+Move audit entries past the retention period into monthly archive files.
+
+Entries older than AUDIT_RETENTION_DAYS are written to
+BACKUP_PATH/audit/auditlog-YYYY-MM.jsonl.gz (one JSON object per line,
+appended as a new gzip member if the month already has a file) and then
+deleted from the table. Each chunk is deleted only after it was flushed to
+disk, so an interrupted run never loses entries.
+
+Run: python manage.py archive_audit_logs --retention-days 365
+"""
+import gzip
+import json
+import os
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard.models import AuditLog
+
+CHUNK_SIZE = 2000
+FIELDS = ('id', 'user_id', 'action', 'model_name', 'record_id', 'changes', 'timestamp')
+
+
+def archive_path(archive_dir, timestamp):
+    return Path(archive_dir) / f'auditlog-{timestamp:%Y-%m}.jsonl.gz'
+
+
+class Command(BaseCommand):
+    help = 'Archive audit log entries older than the retention period to monthly JSONL.gz files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retention-days', type=int,
+                            default=getattr(settings, 'AUDIT_RETENTION_DAYS', 365))
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['retention_days'])
+        expired = AuditLog.objects.filter(timestamp__lt=cutoff)
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} audit entries older than {cutoff:%Y-%m-%d} would be archived')
+            return
+
+        archive_dir = Path(settings.BACKUP_PATH) / 'audit'
+        archive_dir.mkdir(parents=True, exist_ok=True)
+        archived = 0
+        files = set()
+        while True:
+            rows = list(expired.order_by('timestamp', 'id').values(*FIELDS)[:CHUNK_SIZE])
+            if not rows:
+                break
+            by_month = {}
+            for row in rows:
+                by_month.setdefault(archive_path(archive_dir, timezone.localtime(row['timestamp'])), []).append(row)
+            for path, month_rows in by_month.items():
+                with open(path, 'ab') as raw:
+                    with gzip.GzipFile(fileobj=raw, mode='wb') as out:
+                        for row in month_rows:
+                            out.write(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False).encode('utf-8'))
+                            out.write(b'\n')
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                files.add(path.name)
+            with transaction.atomic():
+                AuditLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+            archived += len(rows)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} audit entries into {len(files)} file(s) under {archive_dir}"))
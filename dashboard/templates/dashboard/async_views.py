@@ -0,0 +1,160 @@
+"""
+Async variants of the I/O-bound endpoints, used when running under ASGI.
+
+File-system work runs via ``asyncio.to_thread`` and database access uses the
+async ORM, so a slow disk, a OneDrive folder on a network share or a large
+upload no longer pins one of a fixed number of worker threads. The views
+also work under WSGI, where Django runs them in a per-request event loop.
+"""
+import asyncio
+import mimetypes
+import os
+from functools import wraps
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, HttpResponseNotAllowed, JsonResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .models import Program, Hall, Faculty, Training, ProgramDocument
+
+CHUNK_SIZE = 256 * 1024
+EXCEL_SUFFIXES = ('.xlsx', '.xls', '.xlsm')
+
+
+async def _is_authenticated(request):
+    if hasattr(request, 'auser'):
+        return (await request.auser()).is_authenticated
+    # request.user is lazy and hits the session store, so resolve it off the loop
+    return await sync_to_async(lambda: request.user.is_authenticated)()
+
+
+def async_api(*methods):
+    """login_required + require_http_methods for async views (Django 4.2's are sync-only)."""
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in methods:
+                return HttpResponseNotAllowed(methods)
+            if not await _is_authenticated(request):
+                return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
+            return await view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _list_excel_files(directory):
+    files = []
+    if not directory or not Path(directory).exists():
+        return files
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.lower().endswith(EXCEL_SUFFIXES):
+                stat = entry.stat()
+                files.append({'name': entry.name, 'size': stat.st_size, 'modified': stat.st_mtime})
+    return sorted(files, key=lambda f: f['modified'], reverse=True)
+
+
+@async_api('GET')
+async def async_uploaded_files(request):
+    files = await asyncio.to_thread(_list_excel_files, settings.EXCEL_FILES_PATH)
+    return JsonResponse({'success': True, 'files': files})
+
+
+def _compare_dirs(local_dir, remote_dir):
+    local = {f['name']: f for f in _list_excel_files(local_dir)}
+    remote = {f['name']: f for f in _list_excel_files(remote_dir)}
+    return {
+        'missing_locally': sorted(set(remote) - set(local)),
+        'missing_remote': sorted(set(local) - set(remote)),
+        'different': sorted(n for n in set(local) & set(remote) if local[n]['size'] != remote[n]['size']),
+    }
+
+
+@async_api('GET')
+async def async_verify_sync(request):
+    if not getattr(settings, 'ONEDRIVE_ENABLED', False):
+        return JsonResponse({'success': False, 'error': 'OneDrive sync is disabled'}, status=400)
+    if not await asyncio.to_thread(os.path.isdir, settings.ONEDRIVE_PATH):
+        return JsonResponse({'success': False, 'error': 'OneDrive folder not found'}, status=404)
+    diff = await asyncio.to_thread(_compare_dirs, settings.EXCEL_FILES_PATH, settings.ONEDRIVE_PATH)
+    in_sync = not any(diff.values())
+    return JsonResponse({'success': True, 'in_sync': in_sync, **diff})
+
+
+async def _read_chunks(path):
+    handle = await asyncio.to_thread(open, path, 'rb')
+    try:
+        while True:
+            chunk = await asyncio.to_thread(handle.read, CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        await asyncio.to_thread(handle.close)
+
+
+@async_api('GET')
+async def async_download_document(request, document_id):
+    try:
+        document = await ProgramDocument.objects.aget(id=document_id)
+    except ProgramDocument.DoesNotExist:
+        raise Http404('Document not found')
+    path = document.document.path
+    if not await asyncio.to_thread(os.path.exists, path):
+        raise Http404('Document file is missing')
+    size = await asyncio.to_thread(os.path.getsize, path)
+    content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    response = StreamingHttpResponse(_read_chunks(path), content_type=content_type)
+    response['Content-Length'] = str(size)
+    # The stored name, not the path: documents in the content-addressed store live under their hash
+    response['Content-Disposition'] = content_disposition_header(True, os.path.basename(document.document.name))
+    return response
+
+
+@async_api('POST')
+async def async_upload_program_document(request, program_id):
+    try:
+        program = await Program.objects.aget(id=program_id)
+    except Program.DoesNotExist:
+        raise Http404('Program not found')
+    # The body is already received, but parsing the multipart data and
+    # writing large parts to temporary files is blocking work; keep it off
+    # the event loop.
+    files = await sync_to_async(lambda: request.FILES)()
+    upload = files.get('document')
+    if not upload:
+        return JsonResponse({'success': False, 'error': 'No document uploaded'}, status=400)
+    document = await sync_to_async(ProgramDocument.objects.create)(program=program, document=upload)
+    return JsonResponse({'success': True, 'document_id': document.id, 'name': os.path.basename(document.document.name)})
+
+
+@async_api('GET')
+async def async_api_halls(request):
+    halls = [h async for h in Hall.objects.order_by('name').values('id', 'name', 'capacity', 'location')]
+    return JsonResponse({'halls': halls})
+
+
+@async_api('GET')
+async def async_api_programs(request):
+    programs = Program.objects.order_by('name').values('id', 'name', 'category', 'program_type', 'status')
+    if request.GET.get('program_type'):
+        programs = programs.filter(program_type=request.GET['program_type'])
+    return JsonResponse({'programs': [p async for p in programs]})
+
+
+@async_api('GET')
+async def async_api_faculty(request):
+    faculty = Faculty.objects.filter(is_active=True).order_by('name').values(
+        'id', 'name', 'faculty_dept', 'faculty_t_no', 'email', 'phone')
+    return JsonResponse({'faculty': [f async for f in faculty]})
+
+
+@async_api('GET')
+async def async_api_trainings(request):
+    trainings = Training.objects.order_by('training_name').values(
+        'id', 'training_name', 'program_type', 'start_date', 'end_date', 'hours', 'faculty_name')
+    if request.GET.get('program_id'):
+        trainings = trainings.filter(program_id=request.GET['program_id'])
+    return JsonResponse({'trainings': [t async for t in trainings]})
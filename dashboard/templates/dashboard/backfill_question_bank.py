@@ -0,0 +1,60 @@
+"""
+Fill the question bank from analyses that were stored before it existed.
+
+Stored item analyses are used where present. Schedules analysed only by the
+pre/post view get their difficulty from the stored IDI results (share of
+participants scoring 1), so no workbook is parsed again. Those rows are
+recorded with source ``idi`` since they are not comparable with item
+analysis difficulty.
+
+Run: python manage.py backfill_question_bank
+"""
+from django.core.management.base import BaseCommand
+
+from dashboard.models import ChartAnalysis
+from dashboard.question_bank_models import SOURCE_IDI, QuestionStat, record_batch_stats, record_item_analysis
+
+
+class Command(BaseCommand):
+    help = 'Record per-question difficulty history from stored item analysis and IDI results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Re-record batches that already have stats')
+
+    def handle(self, *args, **options):
+        done = set()
+        if not options['force']:
+            done = set(QuestionStat.objects.values_list('schedule_id', 'category').distinct())
+        analyses = (ChartAnalysis.objects
+                    .filter(schedule__isnull=False, analysis_type__in=('item_analysis_pre', 'item_analysis_post'))
+                    .select_related('schedule')
+                    .order_by('schedule_id', 'analysis_type', '-analysis_date'))
+        recorded = batches = 0
+        for analysis in analyses:
+            category = analysis.analysis_type.rsplit('_', 1)[1]
+            if (analysis.schedule_id, category) in done or not analysis.chart_data:
+                continue
+            recorded += record_item_analysis(analysis.schedule, category, analysis.chart_data)
+            batches += 1
+            done.add((analysis.schedule_id, category))
+
+        idi_analyses = (ChartAnalysis.objects
+                        .filter(schedule__isnull=False, analysis_type='idi')
+                        .select_related('schedule')
+                        .order_by('schedule_id', '-analysis_date'))
+        for analysis in idi_analyses:
+            for category in ('pre', 'post'):
+                if (analysis.schedule_id, category) in done or not analysis.chart_data:
+                    continue
+                recorded += record_batch_stats(analysis.schedule, category, [
+                    {
+                        'question': question,
+                        'participants': data.get(f'{category}_total'),
+                        'difficulty': data[f'{category}_idi'] / 100 if data.get(f'{category}_idi') is not None else None,
+                    }
+                    for question, data in analysis.chart_data.items()
+                ], source=SOURCE_IDI)
+                batches += 1
+                done.add((analysis.schedule_id, category))
+
+        self.stdout.write(self.style.SUCCESS(f'Recorded {recorded} question stats for {batches} batches'))
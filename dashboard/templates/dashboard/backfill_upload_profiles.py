@@ -0,0 +1,34 @@
+"""
+Compute the stored data-quality profile of uploads that do not have one.
+
+Uploads are profiled when they are saved; this covers files uploaded before
+the profile table existed (the analysis view would otherwise profile each
+one on its first view). ``--force`` recomputes every profile.
+
+Run: python manage.py backfill_upload_profiles [--force]
+"""
+from django.core.management.base import BaseCommand
+
+from dashboard.assessment_models import FeedbackExcelUpload
+from dashboard.upload_profile_models import profile_for, store_profile
+
+
+class Command(BaseCommand):
+    help = 'Store the data-quality profile of every uploaded workbook'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Recompute existing profiles too')
+
+    def handle(self, *args, **options):
+        uploads = FeedbackExcelUpload.objects.exclude(file='').order_by('id')
+        if not options['force']:
+            uploads = uploads.filter(data_profile__isnull=True)
+        profiled = failed = 0
+        for upload in uploads.iterator():
+            try:
+                (store_profile if options['force'] else profile_for)(upload)
+                profiled += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f'Upload {upload.id}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Profiled {profiled} uploads ({failed} failed)'))
@@ -0,0 +1,72 @@
+"""
+Change feed for the scheduling UI.
+
+Every save or delete of a Schedule, ProgramScheduleDate or DetailedSchedule
+appends a ScheduleChange row in the same transaction. Its auto-increment
+``seq`` is the feed position: a client that remembers the last ``seq`` it
+saw can ask for just the inserts, updates and tombstones after it (see
+changefeed_views). SQLite serialises writers, so a row with a higher seq is
+never committed before a lower one.
+
+QuerySet.update() and bulk_create() do not send signals; code using them on
+these models should call ``record_change`` for the affected rows.
+"""
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+TRACKED_MODELS = ('dashboard.Schedule', 'dashboard.ProgramScheduleDate', 'dashboard.DetailedSchedule')
+
+
+class ScheduleChange(models.Model):
+    OP_UPSERT = 'upsert'
+    OP_DELETE = 'delete'
+    OP_CHOICES = [(OP_UPSERT, 'Insert/update'), (OP_DELETE, 'Delete')]
+
+    seq = models.BigAutoField(primary_key=True)
+    model_name = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    op = models.CharField(max_length=10, choices=OP_CHOICES)
+    # Row values for upserts, null for tombstones
+    data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    changed_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['seq']
+        indexes = [models.Index(fields=['model_name', 'seq'], name='schedulechange_model_seq_idx')]
+
+    def __str__(self):
+        return f"#{self.seq} {self.op} {self.model_name}:{self.object_id}"
+
+
+def row_payload(instance):
+    data = {}
+    for field in instance._meta.concrete_fields:
+        value = field.value_from_object(instance)
+        data[field.attname] = (value.name or None) if isinstance(value, FieldFile) else value
+    return data
+
+
+def record_change(instance, deleted=False):
+    return ScheduleChange.objects.create(
+        model_name=instance._meta.model_name,
+        object_id=instance.pk,
+        op=ScheduleChange.OP_DELETE if deleted else ScheduleChange.OP_UPSERT,
+        data=None if deleted else row_payload(instance),
+    )
+
+
+def _on_save(sender, instance, raw=False, **kwargs):
+    if not raw:  # skip fixture loading
+        record_change(instance)
+
+
+def _on_delete(sender, instance, **kwargs):
+    record_change(instance, deleted=True)
+
+
+for _model in TRACKED_MODELS:
+    post_save.connect(_on_save, sender=_model, dispatch_uid=f'changefeed_save_{_model}')
+    post_delete.connect(_on_delete, sender=_model, dispatch_uid=f'changefeed_delete_{_model}')
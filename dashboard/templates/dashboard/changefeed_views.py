@@ -0,0 +1,88 @@
+"""
+Delta sync for the scheduling calendar.
+
+    GET api/changes/?since=<seq>&models=schedule,detailedschedule&wait=20
+
+returns the changes after ``since``, collapsed to the newest entry per
+object, plus the ``seq`` to send next time. With ``wait`` the request is
+held open (asynchronously) until something changes or the wait runs out.
+A request without ``since``, or with a position older than the retained
+feed, answers ``"reset": true`` so the client reloads the full list once.
+
+Long polling only happens under ASGI (training_mgmt.asgi), where a waiting
+request costs no thread. Under the WSGI server each waiting request would
+hold one of waitress's few worker threads, so a handful of open calendars
+would starve every other page; there ``wait`` is ignored and the response
+says ``"long_poll": false``, telling the client to sleep between polls.
+"""
+import asyncio
+import time
+
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Max, Min
+from django.http import JsonResponse
+
+from .async_views import async_api
+from .changefeed_models import ScheduleChange
+
+MAX_CHANGES = 500
+MAX_WAIT = 25
+POLL_INTERVAL = 0.5
+FEED_MODELS = {'schedule', 'programscheduledate', 'detailedschedule'}
+
+
+async def _latest_seq():
+    return (await ScheduleChange.objects.aaggregate(latest=Max('seq')))['latest'] or 0
+
+
+async def _fetch(since, model_names):
+    changes = ScheduleChange.objects.filter(seq__gt=since, model_name__in=model_names).order_by('seq')
+    rows = [c async for c in changes.values('seq', 'model_name', 'object_id', 'op', 'data')[:MAX_CHANGES + 1]]
+    has_more = len(rows) > MAX_CHANGES
+    rows = rows[:MAX_CHANGES]
+    # Several edits to one schedule since the last poll only need the final state
+    latest = {}
+    for row in rows:
+        latest[(row['model_name'], row['object_id'])] = row
+    return sorted(latest.values(), key=lambda r: r['seq']), has_more, (rows[-1]['seq'] if rows else None)
+
+
+@async_api('GET')
+async def api_schedule_changes(request):
+    try:
+        since = int(request.GET['since']) if 'since' in request.GET else None
+        wait = min(max(float(request.GET.get('wait', 0)), 0), MAX_WAIT)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'since and wait must be numbers'}, status=400)
+    requested = request.GET.get('models')
+    model_names = FEED_MODELS if not requested else {m.strip().lower() for m in requested.split(',')}
+    if not model_names <= FEED_MODELS:
+        return JsonResponse({'success': False, 'error': f"Unknown models: {', '.join(sorted(model_names - FEED_MODELS))}"}, status=400)
+
+    oldest = (await ScheduleChange.objects.aaggregate(oldest=Min('seq')))['oldest']
+    long_poll = isinstance(request, ASGIRequest)
+    if not long_poll:
+        wait = 0
+    if since is None or (oldest is not None and since < oldest - 1):
+        return JsonResponse({'success': True, 'reset': True, 'seq': await _latest_seq(), 'changes': [],
+                             'long_poll': long_poll})
+
+    deadline = time.monotonic() + wait
+    while True:
+        changes, has_more, last_seq = await _fetch(since, model_names)
+        if changes or time.monotonic() >= deadline:
+            break
+        await asyncio.sleep(POLL_INTERVAL)
+
+    return JsonResponse({
+        'success': True,
+        'reset': False,
+        # Only advance past what was actually read; later commits come next poll
+        'seq': last_seq or since,
+        'has_more': has_more,
+        'long_poll': long_poll,
+        'changes': [
+            {'seq': c['seq'], 'model': c['model_name'], 'id': c['object_id'], 'op': c['op'], 'data': c['data']}
+            for c in changes
+        ],
+    })
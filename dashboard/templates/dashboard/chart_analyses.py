@@ -0,0 +1,35 @@
+"""
+Latest stored ChartAnalysis per (training, schedule, analysis type).
+
+The views used to delete the previous row and create a new one; two
+requests doing that at once could both delete and both create, leaving
+duplicates. ``save_chart_analysis`` updates the row in place inside a
+transaction that holds the schedule row lock, and clears duplicates left
+by earlier races.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ChartAnalysis, Schedule
+
+
+def save_chart_analysis(training, schedule, analysis_type, chart_data, input_files=None, user=None, notes=None):
+    """Store ``chart_data`` as the latest ``analysis_type`` analysis of ``schedule``."""
+    lookup = {'training': training, 'schedule': schedule, 'analysis_type': analysis_type}
+    with transaction.atomic():
+        if schedule is not None:
+            # Serialises writers of one schedule where the database has row locks
+            list(Schedule.objects.select_for_update().filter(pk=schedule.pk).values_list('pk', flat=True))
+        rows = ChartAnalysis.objects.filter(**lookup)
+        latest = rows.order_by('-analysis_date', '-id').values_list('id', flat=True).first()
+        if latest is not None:
+            rows.exclude(id=latest).delete()
+        analysis, _ = ChartAnalysis.objects.update_or_create(**lookup, defaults={
+            'chart_data': chart_data,
+            'input_files': input_files,
+            'run_by': user if user is not None and user.is_authenticated else None,
+            'notes': notes,
+            # auto_now_add only fills it on insert
+            'analysis_date': timezone.now(),
+        })
+    return analysis
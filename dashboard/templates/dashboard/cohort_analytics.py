@@ -0,0 +1,240 @@
+"""
+Program-level cohort analytics across many schedules.
+
+All pre/post workbooks of the selected schedules are loaded in one
+``load_workbooks`` call (frame cache first, then the parse pool), stacked
+into one pre and one post frame tagged with ``schedule_id`` and merged once
+on (schedule, participant). Improvement, normalized gain and IDI are then
+computed with ``groupby`` for every schedule and for the pooled cohort in
+the same pass, using the same definitions as the single-schedule analysis
+view. If that combined load fails, the schedules are loaded one at a time
+and a schedule whose workbooks cannot be read is reported in ``skipped``.
+"""
+import logging
+
+from .analytics_helpers import detect_question_and_points_columns, extract_question_text, get_pandas
+from .assessment_models import FeedbackExcelUpload
+from .column_selectors import cohort_columns
+from .instrumentation import timed
+from .models import Schedule
+from .participant_keys import find_participant_column, participant_keys
+from .workbook_loader import WorkbookTooLarge, load_workbooks
+
+logger = logging.getLogger(__name__)
+
+MAX_COHORT_SCHEDULES = 200
+
+
+def cohort_schedules(program_id=None, date_from=None, date_to=None, faculty_id=None, department=None):
+    schedules = Schedule.objects.select_related('training', 'program', 'faculty')
+    if program_id:
+        schedules = schedules.filter(program_id=program_id)
+    if date_from:
+        schedules = schedules.filter(date__gte=date_from)
+    if date_to:
+        schedules = schedules.filter(date__lte=date_to)
+    if faculty_id:
+        schedules = schedules.filter(faculty_id=faculty_id)
+    if department:
+        schedules = schedules.filter(faculty__faculty_dept=department)
+    return schedules.order_by('date', 'id')
+
+
+def latest_uploads(schedule_ids):
+    """``{schedule_id: {'pre': path, 'post': path}}`` from the newest upload of each kind."""
+    uploads = {}
+    rows = (FeedbackExcelUpload.objects
+            .filter(schedule_id__in=schedule_ids, category__in=('pre', 'post'))
+            .exclude(file='')
+            .order_by('schedule_id', 'category', '-uploaded_at'))
+    for upload in rows:
+        uploads.setdefault(upload.schedule_id, {}).setdefault(upload.category, upload.file.path)
+    return {sid: paths for sid, paths in uploads.items() if 'pre' in paths and 'post' in paths}
+
+
+def _find_column(df, predicate):
+    for col in df.columns:
+        if predicate(str(col).strip().lower()):
+            return col
+    return None
+
+
+def _standardise(df, schedule_id):
+    """Reduce a workbook to schedule_id, integer pers_no, total and the 'Points -' columns."""
+    pd = get_pandas()
+    pers_no_col = find_participant_column(df.columns)
+    total_col = _find_column(df, lambda c: c == 'total points')
+    if pers_no_col is None or total_col is None:
+        return None
+    _, points_cols = detect_question_and_points_columns(df.columns)
+    out = pd.DataFrame({
+        'schedule_id': schedule_id,
+        'pers_no': participant_keys(df[pers_no_col]),
+        'total': pd.to_numeric(df[total_col], errors='coerce'),
+    })
+    for col in points_cols:
+        out[extract_question_text(col.replace('Points -', 'Que -'))] = pd.to_numeric(df[col], errors='coerce')
+    return out[out['pers_no'].notna()]
+
+
+def _normalized_gain(avg_pre, avg_post, pre_max, post_max):
+    pd = get_pandas()
+    norm_pre = (avg_pre / pre_max).where(pre_max > 0, 0)
+    norm_post = (avg_post / post_max).where(post_max > 0, 0)
+    denom = 1 - norm_pre
+    gain = ((norm_post - norm_pre) / denom).where((pre_max > 0) & (post_max > 0) & (denom != 0), 0)
+    return pd.DataFrame({'norm_pre': norm_pre, 'norm_post': norm_post, 'gain': gain})
+
+
+def _score_summary(merged, keys):
+    """Improvement rate and normalized gain per ``keys`` group (or pooled when keys is empty)."""
+    valid = merged[merged['total_pre'].notna() & merged['total_post'].notna()].copy()
+    valid['improved'] = valid['total_post'] > valid['total_pre']
+    grouped = valid.groupby(keys) if keys else valid.assign(_all=0).groupby('_all')
+    stats = grouped.agg(
+        valid_students=('improved', 'size'),
+        improved=('improved', 'sum'),
+        avg_pre=('total_pre', 'mean'),
+        avg_post=('total_post', 'mean'),
+        pre_max=('total_pre', 'max'),
+        post_max=('total_post', 'max'),
+    )
+    stats['improvement_rate'] = stats['improved'] / stats['valid_students'] * 100
+    return stats.join(_normalized_gain(stats['avg_pre'], stats['avg_post'], stats['pre_max'], stats['post_max']))
+
+
+def _idi(pre, post, questions):
+    """Pooled IDI per question: % scoring 1 among participants present in both files."""
+    pd = get_pandas()
+    if not questions:
+        return {}
+    pre_long = pre.melt(id_vars=['schedule_id', 'pers_no'], value_vars=questions, var_name='question', value_name='pre')
+    post_long = post.melt(id_vars=['schedule_id', 'pers_no'], value_vars=questions, var_name='question', value_name='post')
+    both = pre_long.merge(post_long, on=['schedule_id', 'pers_no', 'question'])
+    both['pre_is_correct'] = both['pre'] == 1
+    both['post_is_correct'] = both['post'] == 1
+    stats = both.groupby('question').agg(
+        pre_total=('pre', 'count'),
+        pre_correct=('pre_is_correct', 'sum'),
+        post_total=('post', 'count'),
+        post_correct=('post_is_correct', 'sum'),
+    )
+    stats['pre_idi'] = (stats['pre_correct'] / stats['pre_total'] * 100).where(stats['pre_total'] > 0, 0)
+    stats['post_idi'] = (stats['post_correct'] / stats['post_total'] * 100).where(stats['post_total'] > 0, 0)
+    result = {}
+    for question, row in stats.iterrows():
+        if pd.isna(row['pre_idi']):
+            continue
+        result[question] = {
+            'pre_idi': round(float(row['pre_idi']), 2),
+            'post_idi': round(float(row['post_idi']), 2),
+            'pre_correct': int(row['pre_correct']),
+            'pre_total': int(row['pre_total']),
+            'post_correct': int(row['post_correct']),
+            'post_total': int(row['post_total']),
+            'improvement': round(float(row['post_idi'] - row['pre_idi']), 2),
+        }
+    return result
+
+
+def _summary_dict(row):
+    return {
+        'valid_students': int(row['valid_students']),
+        'improvement_rate': round(float(row['improvement_rate']), 2),
+        'avg_pre_test': round(float(row['avg_pre']), 2),
+        'avg_post_test': round(float(row['avg_post']), 2),
+        'pre_max': float(row['pre_max']),
+        'post_max': float(row['post_max']),
+        'norm_pre': round(float(row['norm_pre']), 4),
+        'norm_post': round(float(row['norm_post']), 4),
+        'gain': round(float(row['gain']), 4),
+    }
+
+
+def _load_frames(uploads):
+    """``(frames keyed by (schedule_id, kind), {schedule_id: error})``."""
+    paths = {}
+    for schedule_id, kinds in uploads.items():
+        paths[(schedule_id, 'pre')] = kinds['pre']
+        paths[(schedule_id, 'post')] = kinds['post']
+    if not paths:
+        return {}, {}
+    try:
+        with timed('excel'):
+            return load_workbooks(paths, usecols=cohort_columns), {}
+    except WorkbookTooLarge:
+        # The cohort as a whole does not fit the memory budget; the view asks to narrow it
+        raise
+    except Exception:
+        logger.warning('Loading the cohort workbooks together failed; loading per schedule', exc_info=True)
+
+    frames, failed = {}, {}
+    for schedule_id in uploads:
+        own = {key: paths[key] for key in ((schedule_id, 'pre'), (schedule_id, 'post'))}
+        try:
+            with timed('excel'):
+                frames.update(load_workbooks(own, usecols=cohort_columns))
+        except Exception as e:
+            failed[schedule_id] = f'could not read the pre/post workbook: {e}'
+    return frames, failed
+
+
+def cohort_report(schedules):
+    """Pooled and per-schedule pre/post metrics for ``schedules``."""
+    pd = get_pandas()
+    schedules = list(schedules[:MAX_COHORT_SCHEDULES + 1])
+    truncated = len(schedules) > MAX_COHORT_SCHEDULES
+    schedules = schedules[:MAX_COHORT_SCHEDULES]
+    uploads = latest_uploads([s.id for s in schedules])
+    frames, failed = _load_frames(uploads)
+
+    pre_parts, post_parts, skipped = [], [], []
+    for schedule in schedules:
+        if schedule.id not in uploads:
+            skipped.append({'schedule_id': schedule.id, 'reason': 'missing pre or post upload'})
+            continue
+        if schedule.id in failed:
+            skipped.append({'schedule_id': schedule.id, 'reason': failed[schedule.id]})
+            continue
+        try:
+            pre = _standardise(frames[(schedule.id, 'pre')], schedule.id)
+            post = _standardise(frames[(schedule.id, 'post')], schedule.id)
+        except Exception as e:
+            logger.warning('Could not prepare the workbooks of schedule %s', schedule.id, exc_info=True)
+            skipped.append({'schedule_id': schedule.id, 'reason': f'unexpected workbook contents: {e}'})
+            continue
+        if pre is None or post is None:
+            skipped.append({'schedule_id': schedule.id, 'reason': 'Pers No. or Total Points column not found'})
+            continue
+        pre_parts.append(pre)
+        post_parts.append(post)
+
+    report = {'schedules': [], 'pooled': None, 'idi': {}, 'skipped': skipped, 'truncated': truncated}
+    if not pre_parts:
+        return report
+
+    pre = pd.concat(pre_parts, ignore_index=True)
+    post = pd.concat(post_parts, ignore_index=True)
+    # Participants listed twice in one file would multiply rows in the merge
+    pre = pre.drop_duplicates(['schedule_id', 'pers_no'], keep='last')
+    post = post.drop_duplicates(['schedule_id', 'pers_no'], keep='last')
+    merged = pre[['schedule_id', 'pers_no', 'total']].merge(
+        post[['schedule_id', 'pers_no', 'total']], on=['schedule_id', 'pers_no'], suffixes=('_pre', '_post'))
+
+    per_schedule = _score_summary(merged, ['schedule_id'])
+    pooled = _score_summary(merged, [])
+    by_id = {s.id: s for s in schedules}
+    for schedule_id, row in per_schedule.iterrows():
+        schedule = by_id[int(schedule_id)]
+        report['schedules'].append({
+            'schedule_id': schedule.id,
+            'date': schedule.date.isoformat() if schedule.date else None,
+            'training': schedule.training.training_name if schedule.training_id else None,
+            'faculty': schedule.faculty.name if schedule.faculty_id else None,
+            **_summary_dict(row),
+        })
+    if not pooled.empty:
+        report['pooled'] = _summary_dict(pooled.iloc[0])
+    questions = sorted((set(pre.columns) & set(post.columns)) - {'schedule_id', 'pers_no', 'total'})
+    report['idi'] = _idi(pre, post, questions)
+    return report
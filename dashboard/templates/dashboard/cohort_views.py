@@ -0,0 +1,53 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET
+
+from .cohort_analytics import cohort_report, cohort_schedules
+from .instrumentation import instrument_view, timed
+from .workbook_loader import WorkbookTooLarge
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_cohort_analytics(request):
+    """
+    Pooled pre/post analytics for every schedule matching the filters.
+
+    Query parameters: ``program_id``, ``date_from``, ``date_to`` (YYYY-MM-DD),
+    ``faculty_id`` and ``department``; at least one is required.
+    """
+    params = request.GET
+    try:
+        # parse_date returns None for a bad format and raises for an impossible date (2025-02-30)
+        dates = {key: parse_date(params[key]) if params.get(key) else None for key in ('date_from', 'date_to')}
+    except ValueError:
+        dates = {key: None for key in ('date_from', 'date_to')}
+    if any(params.get(key) and not dates[key] for key in dates):
+        return JsonResponse({'success': False, 'error': 'Dates must be valid YYYY-MM-DD dates'}, status=400)
+    filters = {
+        'program_id': params.get('program_id'),
+        **dates,
+        'faculty_id': params.get('faculty_id'),
+        'department': params.get('department'),
+    }
+    if not any(filters.values()):
+        return JsonResponse({'success': False, 'error': 'Give a program, date range, faculty or department'}, status=400)
+    for key in ('program_id', 'faculty_id'):
+        if filters[key] and not filters[key].isdigit():
+            return JsonResponse({'success': False, 'error': f'{key} must be a number'}, status=400)
+
+    try:
+        with timed('pandas'):
+            report = cohort_report(cohort_schedules(**filters))
+    except WorkbookTooLarge as e:
+        return JsonResponse({'success': False, 'error': f'{e}; narrow the filters'}, status=413)
+    except Exception as e:
+        logger.exception('Cohort analytics failed for %s', dict(params.items()))
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    return JsonResponse({'success': True, **report})
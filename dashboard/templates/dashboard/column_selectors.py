@@ -0,0 +1,34 @@
+"""
+``usecols`` predicates for ``load_workbooks``.
+
+read_excel calls them with each header and keeps the columns they accept.
+They are module-level and only import stdlib-light helpers, so they pickle
+by reference to the parse pool's worker processes (which may be spawned,
+not forked, and have no Django set up).
+"""
+import re
+
+from .analytics_helpers import POINTS_PREFIX, QUESTION_PREFIX
+from .participant_keys import is_participant_column
+
+_FEEDBACK = re.compile(r'^F[1-4](Que|$)')
+
+
+def _clean(name):
+    return str(name).replace('\xa0', ' ').replace('\u200c', '').strip()
+
+
+def assessment_columns(name):
+    """Question and points columns (item analysis)."""
+    return _clean(name).startswith((QUESTION_PREFIX, POINTS_PREFIX))
+
+
+def cohort_columns(name):
+    """Participant key, total and points columns (cohort analytics)."""
+    text = _clean(name)
+    return text.startswith(POINTS_PREFIX) or text.lower() == 'total points' or is_participant_column(name)
+
+
+def feedback_columns(name):
+    """The F1-F4 rating columns (faculty scores)."""
+    return bool(_FEEDBACK.match(_clean(name)))
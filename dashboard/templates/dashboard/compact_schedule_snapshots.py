@@ -0,0 +1,92 @@
+"""
+Merge old detailed-schedule snapshot deltas.
+
+Keyframes and everything newer than the cut-off are kept. Older deltas are
+thinned to the last revision of each day, with its diff rewritten against
+the previous revision that survives, so every remaining point in time still
+rebuilds to exactly what was recorded.
+
+Run: python manage.py compact_schedule_snapshots --older-than-days 90
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from dashboard import snapshot_delta
+from dashboard.snapshot_models import DetailedScheduleRevision
+
+
+def compact_schedule(detailed_schedule_id, cutoff, dry_run=False):
+    """Compact one schedule's history; returns ``(deleted, rewritten)`` counts."""
+    revisions = DetailedScheduleRevision.objects.filter(detailed_schedule_id=detailed_schedule_id).order_by('version')
+    to_delete, to_update = [], []
+    state = None
+    kept_state = None
+    pending = None  # (revision, state) of an old delta that may still be merged away
+
+    def keep(revision, revision_state):
+        nonlocal kept_state
+        if not revision.is_keyframe:
+            data = snapshot_delta.diff(kept_state, revision_state)
+            if data != revision.data:
+                revision.data = data
+                to_update.append(revision)
+        kept_state = snapshot_delta.rebuild(revision_state, [])
+
+    with transaction.atomic():
+        for revision in revisions.select_for_update():
+            if revision.is_keyframe:
+                state = snapshot_delta.rebuild(revision.data, [])
+            elif state is None:
+                to_delete.append(revision)  # orphaned delta, nothing to rebuild it from
+                continue
+            else:
+                state = snapshot_delta.apply(state, revision.data)
+            revision_state = snapshot_delta.rebuild(state, [])
+
+            is_old_delta = not revision.is_keyframe and revision.created_at < cutoff
+            if pending is not None:
+                pending_revision = pending[0]
+                if is_old_delta and timezone.localdate(pending_revision.created_at) == timezone.localdate(revision.created_at):
+                    to_delete.append(pending_revision)
+                else:
+                    keep(*pending)
+                pending = None
+            if is_old_delta:
+                pending = (revision, revision_state)
+            else:
+                keep(revision, revision_state)
+        if pending is not None:
+            keep(*pending)
+
+        if not dry_run:
+            DetailedScheduleRevision.objects.filter(pk__in=[r.pk for r in to_delete]).delete()
+            DetailedScheduleRevision.objects.bulk_update(to_update, ['data'])
+    return len(to_delete), len(to_update)
+
+
+class Command(BaseCommand):
+    help = 'Merge detailed-schedule snapshot deltas older than the given age'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=90)
+        parser.add_argument('--schedule', type=int, help='Only compact this DetailedSchedule id')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['older_than_days'])
+        candidates = DetailedScheduleRevision.objects.filter(created_at__lt=cutoff, is_keyframe=False)
+        if options['schedule']:
+            candidates = candidates.filter(detailed_schedule_id=options['schedule'])
+        schedule_ids = candidates.values_list('detailed_schedule_id', flat=True).distinct()
+
+        total_deleted = total_rewritten = 0
+        for schedule_id in list(schedule_ids):
+            deleted, rewritten = compact_schedule(schedule_id, cutoff, dry_run=options['dry_run'])
+            total_deleted += deleted
+            total_rewritten += rewritten
+        prefix = '[dry run] ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}Removed {total_deleted} deltas and rewrote {total_rewritten} across old snapshot history'))
@@ -0,0 +1,96 @@
+"""
+Move full DetailedScheduleSnapshot copies into the delta-encoded history.
+
+The snapshots of each detailed schedule are replayed oldest first through
+record_snapshot(), keeping their original timestamps, so identical copies
+collapse and the rest become keyframes and deltas. The snapshot table's
+layout is read from the model: its foreign key to DetailedSchedule, its
+first date/time field as the timestamp, and every other field named like a
+DetailedSchedule field as the state. Revisions already recorded for a
+schedule are replayed together with its snapshots in timestamp order, so
+the old copies end up before the edits made since.
+
+Run: python manage.py convert_schedule_snapshots [--delete] [--dry-run]
+"""
+from datetime import datetime, time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models, transaction
+from django.utils import timezone
+
+from dashboard.snapshot_models import DetailedScheduleRevision, iter_history, record_snapshot
+
+TIMESTAMP_NAMES = ('created_at', 'snapshot_date', 'snapshot_time', 'timestamp', 'created')
+
+
+def _snapshot_layout(snapshot_model, schedule_model):
+    fields = snapshot_model._meta.concrete_fields
+    link = next((f for f in fields if f.is_relation and f.related_model is schedule_model), None)
+    if link is None:
+        raise CommandError(f'{snapshot_model.__name__} has no foreign key to {schedule_model.__name__}')
+    dated = [f for f in fields if isinstance(f, (models.DateTimeField, models.DateField))]
+    stamp = next((f for name in TIMESTAMP_NAMES for f in dated if f.name == name), dated[0] if dated else None)
+    schedule_fields = {f.attname for f in schedule_model._meta.concrete_fields}
+    copied = [f for f in fields
+              if f.attname in schedule_fields and not f.primary_key and f is not link and f is not stamp]
+    return link, stamp, copied
+
+
+def _aware(value):
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    return timezone.make_aware(value) if timezone.is_naive(value) else value
+
+
+class Command(BaseCommand):
+    help = 'Convert DetailedScheduleSnapshot rows into delta-encoded revisions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete', action='store_true', help='Delete snapshots once converted')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be converted')
+
+    def handle(self, *args, **options):
+        try:
+            snapshot_model = apps.get_model('dashboard', 'DetailedScheduleSnapshot')
+        except LookupError:
+            raise CommandError('dashboard.DetailedScheduleSnapshot does not exist; nothing to convert')
+        schedule_model = apps.get_model('dashboard', 'DetailedSchedule')
+        link, stamp, copied = _snapshot_layout(snapshot_model, schedule_model)
+        order = ([stamp.name] if stamp else []) + ['pk']
+
+        schedule_ids = set(snapshot_model.objects.values_list(link.attname, flat=True).distinct()) - {None}
+        converted = recorded = snapshots = 0
+        for schedule in schedule_model.objects.filter(pk__in=schedule_ids).order_by('pk'):
+            rows = snapshot_model.objects.filter(**{link.attname: schedule.pk}).order_by(*order)
+            if options['dry_run']:
+                snapshots += rows.count()
+                converted += 1
+                continue
+            with transaction.atomic():
+                # (timestamp, order, state, user), replayed oldest first
+                entries, undated = [], []
+                for row in rows:
+                    state = {f.attname: f.value_to_string(row) for f in copied}
+                    state['id'] = str(schedule.pk)
+                    created_at = _aware(getattr(row, stamp.attname)) if stamp else None
+                    (entries if created_at else undated).append((created_at, len(entries) + len(undated), state, None))
+                    snapshots += 1
+                for revision, state in iter_history(schedule):
+                    entries.append((revision.created_at, len(entries) + len(undated), dict(state), revision.created_by))
+                # Timestamps must grow with the version, so undated snapshots take the earliest one
+                first = min((e[0] for e in entries), default=timezone.now())
+                entries += [(first, *rest) for _, *rest in undated]
+                DetailedScheduleRevision.objects.filter(detailed_schedule=schedule).delete()
+                for created_at, _, state, user in sorted(entries, key=lambda e: e[:2]):
+                    if record_snapshot(schedule, user=user, state=state, created_at=created_at):
+                        recorded += 1
+                if options['delete']:
+                    rows.delete()
+            converted += 1
+
+        verb = 'Would convert' if options['dry_run'] else 'Converted'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {snapshots} snapshots of {converted} detailed schedules; {recorded} revisions recorded'))
@@ -0,0 +1,81 @@
+"""
+Sorted, filtered pages of an uploaded sheet for the analysis data grid.
+
+The frame comes from ``load_workbooks`` (so from the frame cache after the
+first view) and only the requested slice is converted to JSON-able rows.
+Filters are case-insensitive substring matches; on categorical columns they
+are evaluated once per category instead of once per row.
+"""
+import numbers
+
+from .analytics_helpers import get_pandas
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+class GridError(ValueError):
+    pass
+
+
+def _contains(series, text):
+    pd = get_pandas()
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = series.cat.categories
+        matching = categories[categories.astype(str).str.contains(text, case=False, regex=False)]
+        return series.isin(matching)
+    return series.astype(str).str.contains(text, case=False, regex=False) & series.notna()
+
+
+def _column(df, name):
+    # Headers may be numbers in the sheet; the client only ever sends strings
+    by_label = {str(col): col for col in df.columns}
+    if name not in by_label:
+        raise GridError(f'Unknown column: {name}')
+    return by_label[name]
+
+
+def _sort_key(series):
+    # Object columns can mix numbers and text (a "N/A" in a marks column);
+    # numbers sort before text instead of raising TypeError
+    if series.dtype != object:
+        return series
+    return series.map(lambda v: (0, v, '') if isinstance(v, numbers.Number) else (1, 0, str(v)),
+                      na_action='ignore')
+
+
+def rows_for(df):
+    """JSON-able row lists (NaN/NaT become None, numpy scalars become Python ones)."""
+    return df.astype(object).where(df.notna(), None).values.tolist()
+
+
+def grid_page(df, offset=0, limit=PAGE_SIZE, sort=None, descending=False, filters=None, search=None):
+    """One page of ``df`` after column ``filters``, a free-text ``search`` and sorting."""
+    pd = get_pandas()
+    offset = max(int(offset), 0)
+    limit = min(max(int(limit), 1), MAX_PAGE_SIZE)
+    mask = pd.Series(True, index=df.index)
+    for name, text in (filters or {}).items():
+        if text not in (None, ''):
+            mask &= _contains(df[_column(df, name)], str(text))
+    if search:
+        any_match = pd.Series(False, index=df.index)
+        for col in df.columns:
+            any_match |= _contains(df[col], search)
+        mask &= any_match
+    view = df[mask] if not mask.all() else df
+    if sort:
+        try:
+            view = view.sort_values(_column(df, sort), ascending=not descending, kind='stable',
+                                    na_position='last', key=_sort_key)
+        except TypeError:
+            raise GridError(f'Column {sort} cannot be sorted')
+    page = view.iloc[offset:offset + limit]
+    return {
+        'columns': [str(col) for col in df.columns],
+        'rows': rows_for(page),
+        'offset': offset,
+        'limit': limit,
+        'total_rows': int(len(df)),
+        'filtered_rows': int(len(view)),
+    }
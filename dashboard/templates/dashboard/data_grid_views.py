@@ -0,0 +1,59 @@
+import json
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from .assessment_models import FeedbackExcelUpload
+from .data_grid import GridError, grid_page
+from .instrumentation import instrument_view, timed
+from .workbook_loader import WorkbookTooLarge, load_workbooks
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_upload_rows(request, upload_id):
+    """
+    One page of an uploaded sheet for the analysis data grid.
+
+    Query parameters: ``offset``, ``limit``, ``sort`` (column header),
+    ``order`` (``asc``/``desc``), ``q`` (text searched in every column) and
+    ``filters`` (JSON object of column header -> text).
+    """
+    upload = get_object_or_404(FeedbackExcelUpload, id=upload_id)
+    if not upload.file:
+        return JsonResponse({'success': False, 'error': 'This upload has no file'}, status=404)
+    params = request.GET
+    try:
+        filters = json.loads(params['filters']) if params.get('filters') else None
+        if filters is not None and not isinstance(filters, dict):
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'filters must be a JSON object'}, status=400)
+
+    try:
+        with timed('excel'):
+            df = load_workbooks({'current': upload.file.path})['current']
+        with timed('pandas'):
+            page = grid_page(
+                df,
+                offset=params.get('offset', 0),
+                limit=params.get('limit', 100),
+                sort=params.get('sort') or None,
+                descending=params.get('order') == 'desc',
+                filters=filters,
+                search=params.get('q', '').strip() or None,
+            )
+    except (GridError, ValueError) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except WorkbookTooLarge as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=413)
+    except FileNotFoundError:
+        return JsonResponse({'success': False, 'error': 'The uploaded file is missing'}, status=404)
+    return JsonResponse({'success': True, **page}, encoder=DjangoJSONEncoder)
@@ -0,0 +1,90 @@
+"""
+Move documents uploaded before the content-addressed store into it.
+
+Each plain file under MEDIA_ROOT referenced by one of the given FileFields
+is stored as a DocumentBlob (once per distinct content) and its name
+becomes a DocumentAlias, so existing links keep working. The plain file is
+deleted only after its alias is saved. Names already in the store are
+skipped, so the command can be re-run. Every field must already use
+DocumentStorage, or its documents could no longer be opened once moved.
+
+Run: python manage.py dedupe_documents [app.Model.field ...] [--dry-run]
+"""
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist, SuspiciousFileOperation
+from django.core.management.base import BaseCommand, CommandError
+
+from dashboard.document_store_models import (
+    HASH_CHUNK_SIZE, DocumentAlias, DocumentStorage, document_storage, store_document,
+)
+
+DEFAULT_FIELDS = (
+    'dashboard.ProgramDocument.document',
+    'dashboard.Schedule.document',
+    'dashboard.TrainingAttendanceFile.file',
+)
+
+
+def _chunks(path):
+    with open(path, 'rb') as f:
+        yield from iter(lambda: f.read(HASH_CHUNK_SIZE), b'')
+
+
+class Command(BaseCommand):
+    help = 'Store existing uploaded documents once per distinct content'
+
+    def add_arguments(self, parser):
+        parser.add_argument('fields', nargs='*', default=DEFAULT_FIELDS, help='app_label.Model.field')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how much would be saved')
+
+    def _names(self, label):
+        try:
+            app_model, field = label.rsplit('.', 1)
+            model = apps.get_model(app_model)
+            storage = model._meta.get_field(field).storage
+        except (ValueError, LookupError, FieldDoesNotExist, AttributeError):
+            raise CommandError(f'Unknown file field {label}')
+        if not isinstance(storage, DocumentStorage):
+            raise CommandError(f'{label} does not use DocumentStorage; set storage=get_document_storage '
+                               f'on the field and migrate before moving its files')
+        return set(model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True})
+                   .values_list(field, flat=True))
+
+    def handle(self, *args, **options):
+        names = set()
+        for label in options['fields']:
+            names |= self._names(label)
+        names -= set(DocumentAlias.objects.filter(name__in=names).values_list('name', flat=True))
+
+        seen, moved, missing, saved = set(), 0, 0, 0
+        for name in sorted(names):
+            try:
+                path = document_storage.path(name)
+            except SuspiciousFileOperation:
+                # Absolute or outside MEDIA_ROOT: not a stored upload
+                path = None
+            if path is None or not os.path.isfile(path):
+                missing += 1
+                continue
+            size = os.path.getsize(path)
+            if options['dry_run']:
+                digest = hashlib.sha256()
+                for chunk in _chunks(path):
+                    digest.update(chunk)
+                sha256 = digest.hexdigest()
+            else:
+                alias = store_document(_chunks(path), name)
+                os.unlink(path)
+                sha256 = alias.blob.sha256
+            if sha256 in seen:
+                saved += size
+            seen.add(sha256)
+            moved += 1
+
+        verb = 'Would store' if options['dry_run'] else 'Stored'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {moved} documents as {len(seen)} blobs, {saved / 2 ** 20:.1f} MB of duplicates '
+            f'({missing} missing files)'))
@@ -0,0 +1,168 @@
+"""
+Content-addressed store for uploaded documents.
+
+The same training deck or PDF is uploaded to several programs and
+schedules. ``DocumentStorage`` keeps one copy of each distinct file under
+DOCUMENT_STORE_PATH, named by its SHA-256 (DocumentBlob), and records every
+stored name as a DocumentAlias of that blob. FileFields keep their usual
+human-readable names (``program_documents/deck.pdf``); ``path()`` resolves
+a name to its blob, and a blob is removed when its last alias is deleted.
+Names saved before the store existed still resolve to their plain file
+under MEDIA_ROOT.
+
+Blobs are shared, so stored documents must be replaced by saving a new
+file, never rewritten in place.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, models, transaction
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Tries to alias an upload when the name or the blob row is taken concurrently
+SAVE_ATTEMPTS = 5
+
+
+def _store_dir():
+    return Path(getattr(settings, 'DOCUMENT_STORE_PATH', Path(settings.LOCAL_STORAGE_PATH) / 'document_store'))
+
+
+class DocumentBlob(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    size = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    @property
+    def path(self):
+        return _store_dir() / self.sha256[:2] / self.sha256[2:4] / self.sha256
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.size} bytes)"
+
+
+class DocumentAlias(models.Model):
+    name = models.CharField(max_length=255, unique=True)  # the FileField value
+    blob = models.ForeignKey(DocumentBlob, on_delete=models.PROTECT, related_name='aliases')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name} -> {self.blob.sha256[:12]}"
+
+
+def _spool(chunks, directory):
+    """Write ``chunks`` to a temporary file in ``directory``; return ``(tmp path, sha256, size)``."""
+    directory.mkdir(parents=True, exist_ok=True)
+    digest, size = hashlib.sha256(), 0
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode('utf-8')
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return tmp, digest.hexdigest(), size
+
+
+def _claim_blob(tmp, sha256, size):
+    """The blob row for ``sha256`` with its file in place; call inside the transaction that aliases it."""
+    # A write first: it takes SQLite's write lock (a row lock elsewhere), so
+    # release_alias() cannot remove this blob before the alias is committed
+    DocumentBlob.objects.filter(sha256=sha256).update(size=size)
+    blob = DocumentBlob.objects.select_for_update().filter(sha256=sha256).first()
+    if blob is None:
+        blob = DocumentBlob.objects.create(sha256=sha256, size=size)
+    if not blob.path.exists():
+        blob.path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, blob.path)
+    return blob
+
+
+def store_document(chunks, name, rename=None):
+    """
+    Store the bytes in ``chunks`` once and record ``name`` as an alias of
+    them; returns the DocumentAlias. A taken name is passed to ``rename``
+    for another, or raises IntegrityError when there is no ``rename``.
+    """
+    tmp, sha256, size = _spool(chunks, _store_dir())
+    try:
+        for attempt in range(SAVE_ATTEMPTS):
+            try:
+                with transaction.atomic():
+                    blob = _claim_blob(tmp, sha256, size)
+                    return DocumentAlias.objects.create(name=name, blob=blob)
+            except IntegrityError:
+                if attempt == SAVE_ATTEMPTS - 1:
+                    raise
+                if DocumentAlias.objects.filter(name=name).exists():
+                    if rename is None:
+                        raise
+                    # Taken by a concurrent upload between get_available_name() and here
+                    name = rename(name)
+                # Otherwise the blob row was created concurrently; claim it again
+    finally:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def release_alias(alias):
+    """Delete ``alias`` and, when it was the last one, its blob."""
+    with transaction.atomic():
+        # The delete comes first for the same lock ordering as _claim_blob()
+        alias.delete()
+        blob = DocumentBlob.objects.select_for_update().get(pk=alias.blob_id)
+        if blob.aliases.exists():
+            return False
+        blob.delete()
+        try:
+            blob.path.unlink(missing_ok=True)
+        except OSError:
+            logger.warning('Could not remove document blob %s', blob.path, exc_info=True)
+    return True
+
+
+@deconstructible
+class DocumentStorage(FileSystemStorage):
+    """FileSystemStorage that stores each distinct file once (see module docstring)."""
+
+    def alias_for(self, name):
+        """The DocumentAlias (with its blob) of a stored name, None for plain files."""
+        return DocumentAlias.objects.filter(name=name).select_related('blob').first()
+
+    def path(self, name):
+        alias = self.alias_for(name)
+        return str(alias.blob.path) if alias is not None else super().path(name)
+
+    def _save(self, name, content):
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        name = name.replace('\\', '/')
+        return store_document(content.chunks(HASH_CHUNK_SIZE), name, rename=self.get_available_name).name
+
+    def delete(self, name):
+        alias = self.alias_for(name)
+        if alias is None:
+            super().delete(name)
+        else:
+            release_alias(alias)
+
+
+document_storage = DocumentStorage()
+
+
+def get_document_storage():
+    """Callable for ``FileField(storage=...)``, so migrations do not depend on settings."""
+    return document_storage
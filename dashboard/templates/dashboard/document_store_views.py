@@ -0,0 +1,123 @@
+import logging
+import os
+import re
+
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+from .document_store_models import document_storage
+
+logger = logging.getLogger(__name__)
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _RangeFile:
+    """Reads at most ``length`` bytes of ``file`` (for ranges that stop before the end)."""
+
+    def __init__(self, file, length):
+        self.file, self.remaining = file, length
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        data = self.file.read(self.remaining if size < 0 else min(size, self.remaining))
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _byte_range(header, size):
+    """``(start, end)`` of a single ``Range`` header, None to send the whole file, or 'unsatisfiable'."""
+    match = RANGE_RE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        # Malformed and multi-range requests get the full body, as RFC 9110 allows
+        return None
+    first, last = match.groups()
+    if first == '':
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if size == 0 or start >= size or start > end:
+        return 'unsatisfiable'
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.headers.get('If-Range')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    date = parse_http_date_safe(value)
+    return date is not None and int(last_modified) <= date
+
+
+def file_response(request, path, etag, last_modified, filename=None, as_attachment=False):
+    """
+    Send ``path`` with ``ETag``/``Last-Modified`` validators and single
+    ``Range`` support. 304/412 come from Django's conditional handling, a
+    full body or an open-ended range (a resumed download) goes out as a
+    FileResponse, which the server can send with sendfile.
+    """
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return not_modified
+    size = os.path.getsize(path)
+    filename = filename or os.path.basename(path)
+    byte_range = None
+    if request.headers.get('Range') and _if_range_matches(request, etag, last_modified):
+        byte_range = _byte_range(request.headers['Range'], size)
+    if byte_range == 'unsatisfiable':
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+    else:
+        file = open(path, 'rb')
+        if byte_range is None:
+            response = FileResponse(file, as_attachment=as_attachment, filename=filename)
+        else:
+            start, end = byte_range
+            file.seek(start)
+            body = file if end == size - 1 else _RangeFile(file, end - start + 1)
+            response = FileResponse(body, status=206, as_attachment=as_attachment, filename=filename)
+            response['Content-Length'] = str(end - start + 1)
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    # Revalidate on every open; an unchanged document costs a 304
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+@login_required
+@require_safe
+def serve_media(request, name):
+    """
+    Uploaded files under MEDIA_URL, in place of ``django.views.static.serve``.
+
+    Documents in the content-addressed store are sent from their blob with
+    the SHA-256 as a strong ETag; older plain files use mtime and size.
+    """
+    try:
+        alias = document_storage.alias_for(name)
+        path = str(alias.blob.path) if alias is not None else document_storage.path(name)
+    except SuspiciousFileOperation:
+        raise Http404('File not found')
+    if not os.path.isfile(path):
+        raise Http404('File not found')
+    stat = os.stat(path)
+    if alias is not None:
+        etag = f'"{alias.blob.sha256}"'
+        last_modified = int(alias.created_at.timestamp())
+    else:
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        last_modified = int(stat.st_mtime)
+    return file_response(request, path, etag, last_modified, filename=os.path.basename(name))
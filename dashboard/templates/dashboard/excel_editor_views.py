@@ -0,0 +1,240 @@
+import datetime
+import json
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET, require_POST
+
+from .single_flight import LOCK_POLL_SECONDS, _try_lock, _unlock
+
+MAX_PAGE_SIZE = 500
+# How long a patch waits for another save of the same workbook to finish
+EDIT_LOCK_TIMEOUT = 10
+
+
+class CellValueError(ValueError):
+    pass
+
+
+def _excel_path(filename):
+    base = Path(settings.EXCEL_FILES_PATH).resolve()
+    path = (base / filename).resolve()
+    if path.parent != base or path.suffix.lower() not in ('.xlsx', '.xlsm') or not path.exists():
+        raise Http404('File not found')
+    return path
+
+
+def _file_version(path):
+    return str(path.stat().st_mtime_ns)
+
+
+@contextmanager
+def _edit_lock(path):
+    """Exclusive lock on saving ``path`` across processes; yields False when it timed out."""
+    lock_dir = Path(settings.LOCAL_STORAGE_PATH) / 'excel_locks'
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_dir / f'{path.name}.lock', os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = time.monotonic() + EDIT_LOCK_TIMEOUT
+        while not (locked := _try_lock(fd)):
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield locked
+        finally:
+            if locked:
+                _unlock(fd)
+    finally:
+        os.close(fd)
+
+
+def _column_sample(ws, column):
+    """First non-empty data value of a (1-based) column, used to type edits of empty cells."""
+    for (value,) in ws.iter_rows(min_row=2, min_col=column, max_col=column, values_only=True):
+        if value is not None:
+            return value
+    return None
+
+
+def _coerce(value, like):
+    """
+    Convert text typed into the grid to the type of ``like`` (the cell's
+    current value, or a sample from its column) so numbers and dates are
+    not written back as strings.
+    """
+    if not isinstance(value, str) or like is None or isinstance(like, str):
+        return value
+    text = value.strip()
+    if isinstance(like, bool):
+        if text.lower() not in ('true', 'false'):
+            raise CellValueError('expects TRUE or FALSE')
+        return text.lower() == 'true'
+    if isinstance(like, (int, float)):
+        try:
+            number = float(text.replace(',', ''))
+        except ValueError:
+            raise CellValueError('expects a number')
+        return int(number) if number.is_integer() and isinstance(like, int) else number
+    if isinstance(like, (datetime.datetime, datetime.date)):
+        parsed = parse_datetime(text) if isinstance(like, datetime.datetime) else None
+        if parsed is None:
+            try:
+                day = parse_date(text[:10])
+            except ValueError:
+                day = None
+            if day is None:
+                raise CellValueError('expects a date (YYYY-MM-DD)')
+            parsed = datetime.datetime.combine(day, datetime.time()) if isinstance(like, datetime.datetime) else day
+        return parsed
+    return value
+
+
+def _has_formulas(wb):
+    return any(cell.data_type == 'f' for ws in wb.worksheets for row in ws.iter_rows() for cell in row)
+
+
+@login_required
+@require_GET
+def api_excel_range(request, filename):
+    """Return one block of rows from a workbook sheet for the paginated editor."""
+    from openpyxl import load_workbook
+
+    path = _excel_path(filename)
+    try:
+        offset = max(int(request.GET.get('offset', 0)), 0)
+        limit = min(max(int(request.GET.get('limit', 100)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'offset and limit must be numbers'}, status=400)
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet_name = request.GET.get('sheet') or wb.sheetnames[0]
+        if sheet_name not in wb.sheetnames:
+            return JsonResponse({'success': False, 'error': f'Unknown sheet {sheet_name}'}, status=400)
+        ws = wb[sheet_name]
+        header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        # Row 1 is the header; data row N lives on sheet row N + 2
+        rows = [list(r) for r in ws.iter_rows(min_row=offset + 2, max_row=offset + 1 + limit, values_only=True)]
+        total_rows = max((ws.max_row or 1) - 1, 0)
+        sheets = wb.sheetnames
+    finally:
+        wb.close()
+
+    return JsonResponse({
+        'success': True,
+        'sheet': sheet_name,
+        'sheets': sheets,
+        'columns': [str(c) if c is not None else '' for c in header],
+        'offset': offset,
+        'limit': limit,
+        'total_rows': total_rows,
+        'rows': rows,
+        'version': _file_version(path),
+    }, encoder=DjangoJSONEncoder)
+
+
+@login_required
+@require_POST
+def api_excel_patch(request, filename):
+    """
+    Apply a JSON cell-diff patch to a workbook.
+
+    Body: ``{"sheet": "Sheet1", "version": "<from range API>",
+    "changes": [{"row": 0, "column": 3, "value": "new"}]}`` where ``row`` is
+    the 0-based data row and ``column`` the 0-based column index or header.
+    Text values are converted to the number/date type of the cell (or of
+    its column when the cell is empty). ``version`` is required: it is
+    checked again under a per-workbook lock just before the save, so a
+    patch never overwrites a change it has not seen (409). Macros of
+    ``.xlsm`` workbooks are kept.
+
+    Workbooks with formulas are refused: openpyxl keeps the formulas but
+    drops their cached results on save, so the grid (which reads cached
+    values) and pandas would see those cells as empty until Excel
+    recalculates the file.
+    """
+    from openpyxl import load_workbook
+
+    path = _excel_path(filename)
+    try:
+        payload = json.loads(request.body or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON body'}, status=400)
+    changes = payload.get('changes') or []
+    if not changes:
+        return JsonResponse({'success': True, 'applied': 0, 'version': _file_version(path)})
+    version = payload.get('version')
+    if not version:
+        return JsonResponse({'success': False, 'error': 'version is required; load the rows first'}, status=400)
+    modified = JsonResponse({'success': False, 'error': 'File was modified by someone else. Reload and retry.'},
+                            status=409)
+    if version != _file_version(path):
+        return modified
+
+    wb = load_workbook(path, keep_vba=path.suffix.lower() == '.xlsm')
+    sheet_name = payload.get('sheet') or wb.sheetnames[0]
+    if sheet_name not in wb.sheetnames:
+        return JsonResponse({'success': False, 'error': f'Unknown sheet {sheet_name}'}, status=400)
+    if _has_formulas(wb):
+        return JsonResponse({'success': False, 'error': 'This workbook contains formulas and cannot be edited '
+                                                        'here without losing their values. Edit it in Excel.'},
+                            status=400)
+    ws = wb[sheet_name]
+    header = [c.value for c in ws[1]]
+
+    samples = {}
+    for change in changes:
+        column = change.get('column')
+        if isinstance(column, str):
+            if column not in header:
+                return JsonResponse({'success': False, 'error': f'Unknown column {column}'}, status=400)
+            column = header.index(column)
+        try:
+            row = int(change.get('row', -1))
+        except (TypeError, ValueError):
+            row = -1
+        if row < 0 or not isinstance(column, int) or column < 0:
+            return JsonResponse({'success': False, 'error': f'Invalid cell reference {change}'}, status=400)
+        cell = ws.cell(row=row + 2, column=column + 1)
+        value = change.get('value')
+        if value == '':
+            value = None
+        else:
+            like = cell.value
+            if like is None:
+                if column not in samples:
+                    samples[column] = _column_sample(ws, column + 1)
+                like = samples[column]
+            try:
+                value = _coerce(value, like)
+            except CellValueError as e:
+                label = header[column] if column < len(header) and header[column] is not None else column + 1
+                return JsonResponse({'success': False, 'error': f'Row {row + 1}, column {label} {e}'}, status=400)
+        cell.value = value
+
+    with _edit_lock(path) as locked:
+        if not locked:
+            return JsonResponse({'success': False, 'error': 'File is being saved by someone else. Retry.'},
+                                status=409)
+        if version != _file_version(path):
+            return modified
+        # Write next to the original and swap, so readers never see a half-written file
+        fd, tmp_path = tempfile.mkstemp(suffix=path.suffix, dir=path.parent)
+        os.close(fd)
+        try:
+            wb.save(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        version = _file_version(path)
+    return JsonResponse({'success': True, 'applied': len(changes), 'version': version})
@@ -0,0 +1,93 @@
+"""
+Facet counts for the scheduling filter modal.
+
+All facets are counted from one ``GROUP BY`` over the facet columns. Facet
+conditions of the plain "is one of" kind (``equals``, scalar or list, alone
+or ORed on the same field) are applied in Python on the grouped rows, so a
+facet's counts ignore its own selection but respect every other one: ticking
+"Hall A" still shows how many schedules "Hall B" would add. Every other
+condition (date ranges, text search, mixed groups) goes into the SQL filter.
+"""
+from collections import Counter
+
+from django.db.models import Count
+
+from .filter_engine import SCHEDULE_FILTERS, coerce_value, compile_filters
+
+SCHEDULE_FACETS = ('program', 'faculty', 'department', 'hall', 'status')
+
+
+def _selection(group, facets, schema):
+    """Return ``(field, allowed values)`` if ``group`` is a plain facet selection."""
+    conditions = group.get('conditions', []) if isinstance(group, dict) else None
+    if not conditions or not all(isinstance(c, dict) for c in conditions):
+        return None
+    fields = {c.get('field') for c in conditions}
+    if len(fields) != 1 or len(conditions) > 1 and group.get('operator', 'AND') != 'OR':
+        return None
+    field = fields.pop()
+    if field not in facets or any(c.get('operator', 'equals') != 'equals' for c in conditions):
+        return None
+    field_type = schema.fields[field][1]
+    allowed = set()
+    for condition in conditions:
+        values = condition.get('value')
+        for value in values if isinstance(values, list) else [values]:
+            allowed.add(coerce_value(value, field_type, field))
+    return field, allowed
+
+
+def split_filters(state, facets, schema):
+    """Split a MultiFilterState into (SQL-side state, {facet: allowed values})."""
+    if not state or state.get('operator', 'AND') != 'AND':
+        return state, {}
+    sql_groups, selections = [], {}
+    for group in state.get('groups', []):
+        selection = _selection(group, facets, schema)
+        if selection is None:
+            sql_groups.append(group)
+            continue
+        field, allowed = selection
+        # Two selections on one facet are ANDed: only values in both survive
+        selections[field] = selections[field] & allowed if field in selections else allowed
+    return {'groups': sql_groups}, selections
+
+
+def count_rows(rows, paths, selections):
+    """
+    Facet counts and total from grouped ``rows`` (dicts of the ``paths``
+    values plus ``_count``) under the facet ``selections``. A row counts
+    toward a facet when every other facet's selection accepts it, and
+    toward the total when all of them do.
+    """
+    counters = {facet: Counter() for facet in paths}
+    total = 0
+    for row in rows:
+        values = {facet: row[path] for facet, path in paths.items()}
+        failing = [facet for facet, allowed in selections.items() if values[facet] not in allowed]
+        if len(failing) > 1:
+            continue
+        for facet in paths:
+            if not failing or failing == [facet]:
+                counters[facet][values[facet]] += row['_count']
+        if not failing:
+            total += row['_count']
+
+    result = {
+        facet: [{'value': value, 'count': count}
+                for value, count in sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+                if value is not None]
+        for facet, counter in counters.items()
+    }
+    return result, total
+
+
+def facet_counts(queryset, state, facets=SCHEDULE_FACETS, schema=SCHEDULE_FILTERS):
+    """Return ``({facet: [{'value', 'count'}, ...]}, total)`` for the filter state."""
+    sql_state, selections = split_filters(state, facets, schema)
+    paths = {facet: schema.fields[facet][0] for facet in facets}
+    rows = (queryset.filter(compile_filters(sql_state, schema))
+            .values(*paths.values())
+            .annotate(_count=Count('pk'))
+            .order_by())
+    return count_rows(rows, paths, selections)
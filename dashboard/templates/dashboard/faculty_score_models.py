@@ -0,0 +1,230 @@
+"""
+Running faculty feedback scores.
+
+Each processed feedback workbook is reduced once to sums (responses,
+weighted score, F1-F4) and stored as the FacultyScoreContribution of its
+schedule. The same sums are added to the FacultyScoreMonth row of the
+schedule's faculty and month, so a leaderboard or a monthly trend is a read
+of a few small rows, never a re-parse of workbooks. A newer feedback upload
+for a schedule replaces that schedule's contribution: the old sums are
+subtracted before the new ones are added. When a schedule's faculty or date
+changes, its contribution moves to the new faculty and month the same way
+(from a Schedule post_save receiver, and again whenever the feedback is
+re-applied, for updates that skip signals).
+"""
+import logging
+
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, pre_delete
+from django.utils import timezone
+
+from .analytics_helpers import get_pandas
+
+logger = logging.getLogger(__name__)
+
+# Weights of the F1-F4 feedback questions in a response's overall score
+FEEDBACK_WEIGHTS = {'f1': 0.30, 'f2': 0.25, 'f3': 0.25, 'f4': 0.20}
+SUM_FIELDS = ('responses', 'weighted_sum', 'f1_sum', 'f2_sum', 'f3_sum', 'f4_sum')
+
+
+class FacultyScoreMonth(models.Model):
+    faculty = models.ForeignKey('Faculty', on_delete=models.CASCADE, related_name='score_months')
+    month = models.DateField()  # first day of the month
+    trainings = models.PositiveIntegerField(default=0)
+    responses = models.PositiveIntegerField(default=0)
+    weighted_sum = models.FloatField(default=0)
+    f1_sum = models.FloatField(default=0)
+    f2_sum = models.FloatField(default=0)
+    f3_sum = models.FloatField(default=0)
+    f4_sum = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['faculty', 'month'], name='unique_faculty_score_month'),
+        ]
+        indexes = [models.Index(fields=['month'], name='facultyscoremonth_month_idx')]
+
+    @property
+    def weighted_average(self):
+        return round(self.weighted_sum / self.responses, 2) if self.responses else None
+
+    def __str__(self):
+        return f"{self.faculty_id} {self.month:%Y-%m}: {self.weighted_average}"
+
+
+class FacultyScoreContribution(models.Model):
+    schedule = models.OneToOneField('Schedule', on_delete=models.CASCADE, related_name='faculty_score')
+    upload = models.ForeignKey('FeedbackExcelUpload', null=True, blank=True, on_delete=models.SET_NULL, related_name='+')
+    file_name = models.CharField(max_length=255, blank=True)
+    faculty = models.ForeignKey('Faculty', on_delete=models.CASCADE, related_name='score_contributions')
+    month = models.DateField()
+    responses = models.PositiveIntegerField(default=0)
+    weighted_sum = models.FloatField(default=0)
+    f1_sum = models.FloatField(default=0)
+    f2_sum = models.FloatField(default=0)
+    f3_sum = models.FloatField(default=0)
+    f4_sum = models.FloatField(default=0)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [models.Index(fields=['faculty', 'month'], name='facultyscorecontrib_fac_idx')]
+
+    @property
+    def weighted_average(self):
+        return round(self.weighted_sum / self.responses, 2) if self.responses else None
+
+    def __str__(self):
+        return f"{self.schedule_id} -> {self.faculty_id}: {self.weighted_average}"
+
+
+def _clean_col(col):
+    return str(col).replace('\xa0', ' ').replace('\u200c', '').strip()
+
+
+def feedback_columns(columns):
+    """``{'f1': col, ...}`` for the F1-F4 columns ('F1Que...' headers, else plain 'F1')."""
+    found = {}
+    for key in FEEDBACK_WEIGHTS:
+        prefix = key.upper()
+        found[key] = (next((c for c in columns if _clean_col(c).startswith(f'{prefix}Que')), None)
+                      or next((c for c in columns if _clean_col(c) == prefix), None))
+    return found
+
+
+def feedback_sums(df):
+    """Response count, weighted-score sum and F1-F4 sums over rows that answered all four."""
+    pd = get_pandas()
+    columns = feedback_columns(df.columns)
+    sums = dict.fromkeys(SUM_FIELDS, 0)
+    if not all(columns.values()):
+        return columns, sums
+    scores = pd.DataFrame({key: pd.to_numeric(df[col], errors='coerce') for key, col in columns.items()}).dropna()
+    sums['responses'] = len(scores)
+    if len(scores):
+        sums['weighted_sum'] = float(sum(scores[key] * weight for key, weight in FEEDBACK_WEIGHTS.items()).sum())
+        for key in FEEDBACK_WEIGHTS:
+            sums[f'{key}_sum'] = float(scores[key].sum())
+    return columns, sums
+
+
+def _month_sums(sums, sign):
+    return {field: F(field) + sign * sums[field] for field in SUM_FIELDS}
+
+
+def _add_to_month(faculty_id, month, sums):
+    FacultyScoreMonth.objects.get_or_create(faculty_id=faculty_id, month=month)
+    FacultyScoreMonth.objects.filter(faculty_id=faculty_id, month=month).update(
+        trainings=F('trainings') + 1, **_month_sums(sums, 1))
+
+
+def _retract(sender, instance, **kwargs):
+    # Cascades can reach a contribution that an upload's pre_delete already removed
+    if not FacultyScoreContribution.objects.filter(pk=instance.pk).exists():
+        return
+    sums = {field: getattr(instance, field) for field in SUM_FIELDS}
+    FacultyScoreMonth.objects.filter(faculty_id=instance.faculty_id, month=instance.month).update(
+        trainings=F('trainings') - 1, **_month_sums(sums, -1))
+
+
+def apply_feedback_upload(upload, df=None):
+    """
+    Make ``upload`` the scored feedback of its schedule.
+
+    Re-applying the upload that is already counted only checks that it is
+    attributed to the schedule's current faculty and month, so the analysis
+    view can call this on every request. ``df`` saves a parse when the
+    caller already has the workbook loaded.
+    """
+    schedule = upload.schedule
+    if upload.category != 'feedback' or not upload.file or schedule is None:
+        return None
+    existing = FacultyScoreContribution.objects.filter(schedule=schedule).first()
+    if existing is not None and existing.upload_id == upload.pk and existing.file_name == upload.file.name:
+        return reattribute_schedule(schedule.pk)
+    if df is None:
+        from .column_selectors import feedback_columns as usecols
+        from .workbook_loader import load_workbooks
+        df = load_workbooks({'feedback': upload.file.path}, usecols=usecols)['feedback']
+    _, sums = feedback_sums(df)
+
+    with transaction.atomic():
+        existing = FacultyScoreContribution.objects.select_for_update().filter(schedule=schedule).first()
+        if existing is not None:
+            existing.delete()
+        if not schedule.faculty_id or not schedule.date or not sums['responses']:
+            return None
+        month = schedule.date.replace(day=1)
+        contribution = FacultyScoreContribution.objects.create(
+            schedule=schedule, upload=upload, file_name=upload.file.name,
+            faculty_id=schedule.faculty_id, month=month, **sums,
+        )
+        _add_to_month(schedule.faculty_id, month, sums)
+    return contribution
+
+
+def reattribute_schedule(schedule_id):
+    """Move a schedule's contribution to its current faculty and month; returns the contribution."""
+    from .models import Schedule
+
+    with transaction.atomic():
+        contribution = FacultyScoreContribution.objects.select_for_update().filter(schedule_id=schedule_id).first()
+        if contribution is None:
+            return None
+        schedule = Schedule.objects.filter(pk=schedule_id).values('faculty_id', 'date').first()
+        if schedule is None or not schedule['faculty_id'] or not schedule['date']:
+            contribution.delete()
+            return None
+        month = schedule['date'].replace(day=1)
+        if (contribution.faculty_id, contribution.month) == (schedule['faculty_id'], month):
+            return contribution
+        _retract(None, contribution)
+        contribution.faculty_id, contribution.month = schedule['faculty_id'], month
+        contribution.save(update_fields=['faculty', 'month'])
+        _add_to_month(contribution.faculty_id, month, {field: getattr(contribution, field) for field in SUM_FIELDS})
+    return contribution
+
+
+def _apply_latest(upload_model, schedule_id, only_pk=None):
+    try:
+        latest = (upload_model.objects
+                  .filter(schedule_id=schedule_id, category='feedback')
+                  .exclude(file='')
+                  .order_by('-uploaded_at')
+                  .first())
+        # Re-saving an older upload must not replace the newer one's scores
+        if latest is not None and only_pk in (None, latest.pk):
+            apply_feedback_upload(latest)
+    except Exception:
+        # The analysis view applies it again the next time the feedback is opened
+        logger.exception('Could not update faculty scores for schedule %s', schedule_id)
+
+
+def _on_upload_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw or instance.category != 'feedback' or not instance.file:
+        return
+    transaction.on_commit(lambda: _apply_latest(sender, instance.schedule_id, only_pk=instance.pk))
+
+
+def _on_schedule_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Only schedules with scored feedback can need their contribution moved
+    if FacultyScoreContribution.objects.filter(schedule_id=instance.pk).exists():
+        transaction.on_commit(lambda: reattribute_schedule(instance.pk))
+
+
+def _on_upload_deleted(sender, instance, **kwargs):
+    if instance.category != 'feedback':
+        return
+    deleted, _ = FacultyScoreContribution.objects.filter(upload=instance).delete()
+    if deleted:
+        # Fall back to the schedule's previous feedback upload, if any
+        transaction.on_commit(lambda: _apply_latest(sender, instance.schedule_id))
+
+
+post_save.connect(_on_upload_saved, sender='dashboard.FeedbackExcelUpload', dispatch_uid='faculty_scores_upload_saved')
+post_save.connect(_on_schedule_saved, sender='dashboard.Schedule', dispatch_uid='faculty_scores_schedule_saved')
+pre_delete.connect(_retract, sender=FacultyScoreContribution, dispatch_uid='faculty_scores_retract')
+pre_delete.connect(_on_upload_deleted, sender='dashboard.FeedbackExcelUpload', dispatch_uid='faculty_scores_upload_deleted')
@@ -0,0 +1,121 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import F, FloatField, Sum
+from django.db.models.functions import Cast
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_date
+from django.views.decorators.http import require_GET
+
+from .faculty_score_models import FEEDBACK_WEIGHTS, FacultyScoreContribution, FacultyScoreMonth
+from .instrumentation import instrument_view
+from .models import Faculty
+
+logger = logging.getLogger(__name__)
+
+MAX_LEADERBOARD = 200
+
+
+def _month(value):
+    """Parse ``YYYY-MM`` or ``YYYY-MM-DD`` into the first day of that month."""
+    if not value:
+        return None
+    parsed = parse_date(value if value.count('-') == 2 else f'{value}-01')
+    if parsed is None:
+        raise ValueError(f'Invalid month: {value}')
+    return parsed.replace(day=1)
+
+
+def _averages(row):
+    responses = row['responses']
+    return {
+        'weighted_average': round(row['weighted_sum'] / responses, 2) if responses else None,
+        **{f'{key}_average': round(row[f'{key}_sum'] / responses, 2) if responses else None for key in FEEDBACK_WEIGHTS},
+    }
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_faculty_leaderboard(request):
+    """
+    Faculty ranked by weighted F1-F4 feedback average over all trainings.
+
+    Query parameters: ``from`` / ``to`` (YYYY-MM), ``department``,
+    ``min_responses`` (default 1) and ``limit`` (default 50).
+    """
+    try:
+        month_from = _month(request.GET.get('from'))
+        month_to = _month(request.GET.get('to'))
+        min_responses = int(request.GET.get('min_responses', 1))
+        limit = min(int(request.GET.get('limit', 50)), MAX_LEADERBOARD)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    months = FacultyScoreMonth.objects.all()
+    if month_from:
+        months = months.filter(month__gte=month_from)
+    if month_to:
+        months = months.filter(month__lte=month_to)
+    if request.GET.get('department'):
+        months = months.filter(faculty__faculty_dept=request.GET['department'])
+    sums = {field: Sum(field) for field in ('weighted_sum', 'f1_sum', 'f2_sum', 'f3_sum', 'f4_sum')}
+    rows = (months
+            .values('faculty_id', 'faculty__name', 'faculty__faculty_dept')
+            .annotate(responses=Sum('responses'), trainings=Sum('trainings'), **sums)
+            .filter(responses__gte=max(min_responses, 1))
+            .annotate(average=F('weighted_sum') / Cast('responses', FloatField()))
+            .order_by('-average', '-responses')[:limit])
+    return JsonResponse({'success': True, 'leaderboard': [
+        {
+            'rank': rank,
+            'faculty_id': row['faculty_id'],
+            'name': row['faculty__name'],
+            'department': row['faculty__faculty_dept'],
+            'trainings': row['trainings'],
+            'responses': row['responses'],
+            **_averages(row),
+        }
+        for rank, row in enumerate(rows, start=1)
+    ]})
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_faculty_scores(request, faculty_id):
+    """Monthly feedback trend and per-training scores of one faculty member."""
+    faculty = get_object_or_404(Faculty, id=faculty_id)
+    months = (FacultyScoreMonth.objects
+              .filter(faculty=faculty, responses__gt=0)
+              .order_by('month')
+              .values('month', 'trainings', 'responses', 'weighted_sum', 'f1_sum', 'f2_sum', 'f3_sum', 'f4_sum'))
+    trainings = (FacultyScoreContribution.objects
+                 .filter(faculty=faculty)
+                 .order_by('-schedule__date')
+                 .values('schedule_id', 'schedule__date', 'schedule__training__training_name',
+                         'responses', 'weighted_sum', 'f1_sum', 'f2_sum', 'f3_sum', 'f4_sum'))
+    total = {'responses': 0, 'weighted_sum': 0, 'f1_sum': 0, 'f2_sum': 0, 'f3_sum': 0, 'f4_sum': 0}
+    trend = []
+    for row in months:
+        for field in total:
+            total[field] += row[field]
+        trend.append({'month': row['month'].strftime('%Y-%m'), 'trainings': row['trainings'],
+                      'responses': row['responses'], **_averages(row)})
+    return JsonResponse({
+        'success': True,
+        'faculty': {'id': faculty.id, 'name': faculty.name},
+        'overall': {'responses': total['responses'], **_averages(total)},
+        'trend': trend,
+        'trainings': [
+            {
+                'schedule_id': row['schedule_id'],
+                'date': row['schedule__date'],
+                'training': row['schedule__training__training_name'],
+                'responses': row['responses'],
+                **_averages(row),
+            }
+            for row in trainings
+        ],
+    })
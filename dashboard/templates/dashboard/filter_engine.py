@@ -0,0 +1,184 @@
+"""
+Compile FilterBar / FilterModal filter documents into ORM queries.
+
+The document follows ``MultiFilterState`` from ``src/types/filters.ts``::
+
+    {"groups": [{"operator": "OR", "conditions": [
+        {"field": "hall", "operator": "equals", "value": "Hall A"},
+        {"field": "date", "operator": "between", "value": "2025-06-01", "value2": "2025-06-30"}]}]}
+
+Conditions inside a group are joined with the group's operator and groups
+are ANDed together (or ORed with a top-level ``"operator": "OR"``), giving
+one ``Q`` for a single query. Only fields listed in a ``FilterSchema`` can
+be filtered on, and each maps to a fixed ORM lookup, so a request can never
+reach arbitrary relations or columns.
+"""
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+from django.utils.dateparse import parse_date
+
+MAX_GROUPS = 20
+MAX_CONDITIONS = 100
+MAX_IN_VALUES = 500
+
+# FilterOperator -> (ORM lookup, field types it applies to)
+OPERATORS = {
+    'equals': ('exact', {'text', 'number', 'date'}),
+    'contains': ('icontains', {'text'}),
+    'startsWith': ('istartswith', {'text'}),
+    'endsWith': ('iendswith', {'text'}),
+    'greaterThan': ('gt', {'number', 'date'}),
+    'lessThan': ('lt', {'number', 'date'}),
+    'between': ('range', {'number', 'date'}),
+}
+
+
+class FilterError(ValueError):
+    """Raised for documents that reference unknown fields or carry bad values."""
+
+
+class FilterSchema:
+    """Whitelist of filterable fields: public name -> (ORM path, type)."""
+
+    def __init__(self, fields, orderings=(), default_ordering=()):
+        self.fields = fields
+        self.orderings = set(orderings)
+        self.default_ordering = list(default_ordering)
+
+    def ordering(self, requested):
+        if not requested:
+            return self.default_ordering
+        names = requested if isinstance(requested, list) else [requested]
+        invalid = [name for name in names if name.lstrip('-') not in self.orderings]
+        if invalid:
+            raise FilterError(f"Cannot order by: {', '.join(invalid)}")
+        return [('-' if name.startswith('-') else '') + self.fields[name.lstrip('-')][0] for name in names]
+
+
+SCHEDULE_FILTERS = FilterSchema(
+    fields={
+        'program': ('program__name', 'text'),
+        'program_id': ('program_id', 'number'),
+        'program_category': ('program__category', 'text'),
+        'program_type': ('program__program_type', 'text'),
+        'training_name': ('training__training_name', 'text'),
+        'training_id': ('training_id', 'number'),
+        'faculty': ('faculty__name', 'text'),
+        'faculty_id': ('faculty_id', 'number'),
+        'department': ('faculty__faculty_dept', 'text'),
+        'hall': ('hall__name', 'text'),
+        'hall_id': ('hall_id', 'number'),
+        'date': ('date', 'date'),
+        'status': ('status', 'text'),
+        'students': ('students', 'number'),
+    },
+    orderings=('date', 'program', 'training_name', 'faculty', 'hall', 'status'),
+    default_ordering=('date', 'start_time'),
+)
+
+TRAINING_FILTERS = FilterSchema(
+    fields={
+        'training_name': ('training_name', 'text'),
+        'program': ('program__name', 'text'),
+        'program_id': ('program_id', 'number'),
+        'program_category': ('program__category', 'text'),
+        'program_type': ('program_type', 'text'),
+        'faculty': ('faculty_name', 'text'),
+        'hours': ('hours', 'number'),
+        'start_date': ('start_date', 'date'),
+        'end_date': ('end_date', 'date'),
+    },
+    orderings=('training_name', 'program', 'start_date', 'end_date', 'hours'),
+    default_ordering=('training_name',),
+)
+
+
+def coerce_value(value, field_type, field):
+    if value is None or value == '':
+        raise FilterError(f"Missing value for '{field}'")
+    if field_type == 'date':
+        if isinstance(value, date):
+            return value
+        try:
+            parsed = parse_date(str(value)[:10])
+        except ValueError:  # well formed but impossible, e.g. 2025-02-30
+            parsed = None
+        if parsed is None:
+            raise FilterError(f"Invalid date for '{field}': {value!r}")
+        return parsed
+    if field_type == 'number':
+        try:
+            number = Decimal(str(value))
+        except InvalidOperation:
+            number = None
+        if number is None or not number.is_finite():
+            raise FilterError(f"Invalid number for '{field}': {value!r}")
+        return int(number) if number == number.to_integral_value() else number
+    return str(value).strip()
+
+
+def compile_condition(condition, schema):
+    if not isinstance(condition, dict):
+        raise FilterError('Each condition must be an object')
+    field = condition.get('field')
+    if field not in schema.fields:
+        raise FilterError(f"Unknown filter field: {field!r}")
+    path, field_type = schema.fields[field]
+    operator = condition.get('operator', 'equals')
+    if operator not in OPERATORS:
+        raise FilterError(f"Unknown operator: {operator!r}")
+    lookup, types = OPERATORS[operator]
+    if field_type not in types:
+        raise FilterError(f"'{operator}' cannot be used on {field_type} field '{field}'")
+
+    value = condition.get('value')
+    if operator == 'between':
+        low, high = coerce_value(value, field_type, field), coerce_value(condition.get('value2'), field_type, field)
+        return Q(**{f'{path}__range': (min(low, high), max(low, high))})
+    if operator == 'equals' and isinstance(value, list):
+        # Multi-select dropdowns send a list; one IN keeps it a single indexed predicate
+        if len(value) > MAX_IN_VALUES:
+            raise FilterError(f"Too many values for '{field}'")
+        return Q(**{f'{path}__in': [coerce_value(v, field_type, field) for v in value]})
+    return Q(**{f'{path}__{lookup}': coerce_value(value, field_type, field)})
+
+
+def _combine(parts, operator):
+    if operator not in ('AND', 'OR'):
+        raise FilterError(f"Group operator must be AND or OR, not {operator!r}")
+    combined = Q()
+    for part in parts:
+        combined = (combined | part) if operator == 'OR' and combined else (combined & part)
+    return combined
+
+
+def compile_filters(state, schema):
+    """Turn a MultiFilterState document into a single ``Q`` (empty ``Q`` for no filters)."""
+    if not state:
+        return Q()
+    if not isinstance(state, dict) or not isinstance(state.get('groups', []), list):
+        raise FilterError('Filters must be an object with a "groups" list')
+    groups = state.get('groups', [])
+    if len(groups) > MAX_GROUPS or sum(len(g.get('conditions', [])) for g in groups if isinstance(g, dict)) > MAX_CONDITIONS:
+        raise FilterError('Too many filter conditions')
+
+    compiled = []
+    for group in groups:
+        if not isinstance(group, dict):
+            raise FilterError('Each group must be an object')
+        conditions = [compile_condition(c, schema) for c in group.get('conditions', [])]
+        if conditions:
+            compiled.append(_combine(conditions, group.get('operator', 'AND')))
+    return _combine(compiled, state.get('operator', 'AND'))
+
+
+def from_flat_filters(filters):
+    """Convert the ``{field: value}`` dict FilterBar currently emits into a MultiFilterState."""
+    conditions = [
+        {'field': field, 'operator': 'equals', 'value': value}
+        for field, value in (filters or {}).items()
+        if value not in (None, '', [])
+    ]
+    return {'groups': [{'operator': 'AND', 'conditions': conditions}]} if conditions else {'groups': []}
@@ -0,0 +1,99 @@
+import json
+
+from django.contrib.auth.decorators import login_required
+from django.core.paginator import EmptyPage, Paginator
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from .facets import facet_counts
+from .filter_engine import (
+    SCHEDULE_FILTERS, TRAINING_FILTERS, FilterError, compile_filters, from_flat_filters,
+)
+from .models import Schedule, Training
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+SCHEDULE_COLUMNS = (
+    'id', 'date', 'end_date', 'start_time', 'end_time', 'duration', 'students', 'status',
+    'program_id', 'program__name', 'training_id', 'training__training_name',
+    'faculty_id', 'faculty__name', 'hall_id', 'hall__name',
+)
+TRAINING_COLUMNS = (
+    'id', 'training_name', 'program_id', 'program__name', 'program_type', 'hours',
+    'faculty_name', 'faculty_t_no', 'start_date', 'end_date',
+)
+
+
+def _filtered_page(request, queryset, schema, columns):
+    try:
+        payload = json.loads(request.body or '{}')
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+
+    try:
+        filters = payload.get('filters')
+        if filters is not None and 'groups' not in filters:
+            filters = from_flat_filters(filters)
+        queryset = queryset.filter(compile_filters(filters, schema)).order_by(*schema.ordering(payload.get('ordering')), 'id')
+        page_size = min(max(int(payload.get('page_size', DEFAULT_PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        page_number = max(int(payload.get('page', 1)), 1)
+    except FilterError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except (TypeError, ValueError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Invalid filter document or paging parameters'}, status=400)
+
+    paginator = Paginator(queryset.values(*columns), page_size)
+    try:
+        page = paginator.page(page_number)
+    except EmptyPage:
+        page = paginator.page(paginator.num_pages)
+    return JsonResponse({
+        'success': True,
+        'results': list(page.object_list),
+        'page': page.number,
+        'page_size': page_size,
+        'total': paginator.count,
+        'num_pages': paginator.num_pages,
+    })
+
+
+@login_required
+@require_POST
+def api_filter_schedules(request):
+    """
+    Filter schedules on the server.
+
+    Body: ``{"filters": MultiFilterState, "page": 1, "page_size": 25, "ordering": "-date"}``.
+    ``filters`` may also be the flat ``{field: value}`` dict FilterBar emits.
+    """
+    return _filtered_page(request, Schedule.objects.all(), SCHEDULE_FILTERS, SCHEDULE_COLUMNS)
+
+
+@login_required
+@require_POST
+def api_filter_trainings(request):
+    """Filter trainings on the server; same body as ``api_filter_schedules``."""
+    return _filtered_page(request, Training.objects.all(), TRAINING_FILTERS, TRAINING_COLUMNS)
+
+
+@login_required
+@require_POST
+def api_schedule_facets(request):
+    """
+    Live counts for the filter modal: ``{"filters": MultiFilterState}`` in,
+    ``{"facets": {"hall": [{"value": "A", "count": 12}, ...], ...}, "total": n}`` out.
+    """
+    try:
+        payload = json.loads(request.body or '{}')
+        filters = payload.get('filters')
+        if filters is not None and 'groups' not in filters:
+            filters = from_flat_filters(filters)
+        facets, total = facet_counts(Schedule.objects.all(), filters)
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    except FilterError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    except (TypeError, AttributeError):
+        return JsonResponse({'success': False, 'error': 'Invalid filter document'}, status=400)
+    return JsonResponse({'success': True, 'facets': facets, 'total': total})
@@ -0,0 +1,100 @@
+"""
+On-disk cache of parsed workbooks.
+
+Parsing an .xlsx with openpyxl is by far the slowest step of every analysis
+request. A parsed frame is stored under FRAME_CACHE_PATH as Parquet (or a
+pickle when pyarrow is missing or a column has mixed types), keyed by the
+workbook's path and read options (a ``usecols`` subset is its own entry)
+and versioned by mtime and size. Re-uploading or editing a workbook changes
+its mtime, so stale entries are never served; the entry it replaces is
+deleted when the new one is written.
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+from .analytics_helpers import get_pandas
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored frames change shape (2: dtype-optimised frames)
+FORMAT_VERSION = 2
+
+
+def _cache_dir():
+    if not getattr(settings, 'FRAME_CACHE_ENABLED', True):
+        return None
+    path = Path(getattr(settings, 'FRAME_CACHE_PATH', Path(settings.LOCAL_STORAGE_PATH) / 'frame_cache'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _option_repr(value):
+    # usecols predicates are keyed by name, not by their per-process repr
+    if callable(value):
+        return f'{value.__module__}.{value.__qualname__}'
+    return str(value)
+
+
+def _keys(path, read_kwargs):
+    """``(entry key, version key)``: one entry per path and read options, versioned by mtime and size."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    entry = json.dumps([path, FORMAT_VERSION, sorted(read_kwargs.items())], default=_option_repr)
+    version = f'{stat.st_mtime_ns}:{stat.st_size}'
+    return (hashlib.sha1(entry.encode('utf-8')).hexdigest()[:16],
+            hashlib.sha1(version.encode('utf-8')).hexdigest()[:16])
+
+
+def get(path, read_kwargs=None):
+    """Return the cached frame for ``path`` or None."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return None
+    try:
+        path_key, version_key = _keys(path, read_kwargs or {})
+    except OSError:
+        return None
+    pd = get_pandas()
+    for suffix, reader in (('.parquet', pd.read_parquet), ('.pkl', pd.read_pickle)):
+        entry = cache_dir / f'{path_key}-{version_key}{suffix}'
+        if entry.exists():
+            try:
+                return reader(entry)
+            except Exception:
+                logger.warning('Discarding unreadable frame cache entry %s', entry, exc_info=True)
+                entry.unlink(missing_ok=True)
+    return None
+
+
+def put(path, df, read_kwargs=None):
+    """Store ``df`` as the parsed form of ``path``; errors only log a warning."""
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return
+    tmp = None
+    try:
+        path_key, version_key = _keys(path, read_kwargs or {})
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            df.to_parquet(tmp, index=False)
+            suffix = '.parquet'
+        except Exception:
+            # No pyarrow, non-string headers or mixed-type object columns
+            df.to_pickle(tmp, protocol=5)
+            suffix = '.pkl'
+        target = cache_dir / f'{path_key}-{version_key}{suffix}'
+        os.replace(tmp, target)
+        for stale in cache_dir.glob(f'{path_key}-*'):
+            if stale != target and not stale.name.endswith('.tmp'):
+                stale.unlink(missing_ok=True)
+    except Exception:
+        logger.warning('Could not cache parsed frame for %s', path, exc_info=True)
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
@@ -0,0 +1,63 @@
+"""
+Compact dtypes for parsed workbooks.
+
+read_excel leaves text as object/string columns (one Python str per cell) and
+numbers as int64/float64. Text columns whose values repeat (names,
+departments, faculty, options) become categoricals, and whole-number
+columns become int32. Fractional and gappy float columns stay float64:
+float32 means lose precision and their numpy scalars are not JSON
+serialisable, which the analysis views rely on.
+
+Unordered categoricals only support equality: code that compares text
+values with ``<``/``>`` or fills in new values takes ``plain_dtypes(df)``.
+"""
+from .analytics_helpers import get_pandas
+
+# Text columns with at most this share of distinct values become categoricals
+CATEGORY_MAX_RATIO = 0.5
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def _compact(series, categories):
+    pd = get_pandas()
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return series
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        if not categories or pd.api.types.infer_dtype(series, skipna=True) != 'string':
+            return series
+        non_null = series.count()
+        if non_null and series.nunique() <= non_null * CATEGORY_MAX_RATIO:
+            return series.astype('category')
+        return series
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+        return series
+    if pd.api.types.is_float_dtype(dtype):
+        if series.isna().any() or not (series % 1 == 0).all():
+            return series
+    if len(series) and INT32_MIN <= series.min() and series.max() <= INT32_MAX:
+        return series.astype('int32')
+    return series
+
+
+def optimise_dtypes(df, categories=True):
+    """Return ``df`` with compact dtypes; ``categories=False`` leaves text columns alone."""
+    out = df.copy(deep=False)
+    for i in range(len(df.columns)):
+        out.isetitem(i, _compact(df.iloc[:, i], categories))
+    return out
+
+
+def plain_dtypes(df):
+    """Return ``df`` with categorical columns turned back into plain object columns."""
+    pd = get_pandas()
+    out = df.copy(deep=False)
+    for i in range(len(df.columns)):
+        series = df.iloc[:, i]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            out.isetitem(i, series.astype(object))
+    return out
@@ -0,0 +1,200 @@
+"""
+Opt-in per-request instrumentation.
+
+Enable with DJANGO_PERF_INSTRUMENTATION=true. Each request records wall time,
+SQL query count/time, Excel parse time, pandas compute time and peak traced
+memory, emits a ``Server-Timing`` header and feeds a rolling per-URL-name
+histogram that staff can inspect at ``perf/``.
+
+Code paths mark their own work with ``timed('excel')`` / ``timed('pandas')``;
+nested sections are exclusive, so time spent parsing Excel inside a pandas
+block is not counted twice.
+
+The middleware is sync-only (SQL wrappers are per-thread connections), so
+under ASGI enabling it makes Django run each request in a worker thread.
+"""
+import contextvars
+import cProfile
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from contextlib import ContextDecorator, ExitStack
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+HISTOGRAM_SIZE = getattr(settings, 'PERF_HISTOGRAM_SIZE', 500)
+PROFILE_PARAM = '_profile'
+
+_current = contextvars.ContextVar('request_metrics', default=None)
+_histograms = defaultdict(lambda: deque(maxlen=HISTOGRAM_SIZE))
+_histograms_lock = threading.Lock()
+# Only one cProfile profiler can be enabled at a time (Python 3.12+ raises
+# otherwise), so concurrent ?_profile=1 requests take turns
+_profile_lock = threading.Lock()
+
+
+def profile_dir():
+    path = Path(getattr(settings, 'PERF_PROFILE_PATH', settings.LOCAL_STORAGE_PATH / 'profiles'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sections = defaultdict(float)
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.peak_memory = None
+        self._stack = []
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_count += 1
+            self.sql_time += time.perf_counter() - started
+
+    def server_timing(self, total):
+        parts = [f'total;dur={total * 1000:.1f}',
+                 f'db;dur={self.sql_time * 1000:.1f};desc="{self.sql_count} queries"']
+        for name, seconds in self.sections.items():
+            parts.append(f'{name};dur={seconds * 1000:.1f}')
+        if self.peak_memory is not None:
+            parts.append(f'mem;desc="peak {self.peak_memory / (1024 * 1024):.1f} MB"')
+        return ', '.join(parts)
+
+
+class timed(ContextDecorator):
+    """Attribute the enclosed block to a named section of the current request."""
+
+    def __init__(self, section):
+        self.section = section
+
+    def __enter__(self):
+        self.metrics = _current.get()
+        if self.metrics is not None:
+            self.started = time.perf_counter()
+            self.children = 0.0
+            self.metrics._stack.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        if self.metrics is not None:
+            elapsed = time.perf_counter() - self.started
+            self.metrics._stack.pop()
+            self.metrics.sections[self.section] += elapsed - self.children
+            if self.metrics._stack:
+                self.metrics._stack[-1].children += elapsed
+        return False
+
+
+def record(url_name, total, metrics):
+    with _histograms_lock:
+        _histograms[url_name].append({
+            'total': total,
+            'sql_count': metrics.sql_count,
+            'sql_time': metrics.sql_time,
+            'sections': dict(metrics.sections),
+            'peak_memory': metrics.peak_memory,
+        })
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def route_summary():
+    with _histograms_lock:
+        snapshot = {name: list(samples) for name, samples in _histograms.items()}
+    summary = []
+    for name, samples in snapshot.items():
+        totals = [s['total'] for s in samples]
+        summary.append({
+            'url_name': name,
+            'count': len(samples),
+            'p50_ms': round(_percentile(totals, 50) * 1000, 1),
+            'p95_ms': round(_percentile(totals, 95) * 1000, 1),
+            'max_ms': round(max(totals) * 1000, 1),
+            'avg_queries': round(sum(s['sql_count'] for s in samples) / len(samples), 1),
+            'avg_sql_ms': round(sum(s['sql_time'] for s in samples) / len(samples) * 1000, 1),
+        })
+    return sorted(summary, key=lambda row: row['p95_ms'], reverse=True)
+
+
+def _url_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return request.path
+    return match.view_name or match._func_path
+
+
+def _wants_profile(request):
+    user = getattr(request, 'user', None)
+    return PROFILE_PARAM in request.GET and user is not None and user.is_staff
+
+
+def _instrumented_call(request, call):
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    track_memory = getattr(settings, 'PERF_TRACK_MEMORY', True)
+    if track_memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # The tracemalloc peak is process-wide, so under concurrent requests
+        # it is an upper bound rather than an exact per-request figure.
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile() if _wants_profile(request) else None
+    try:
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(metrics.sql_wrapper))
+            if profiler:
+                stack.enter_context(_profile_lock)
+                profiler.enable()
+            try:
+                response = call(request)
+            finally:
+                if profiler:
+                    profiler.disable()
+    finally:
+        _current.reset(token)
+    total = time.perf_counter() - metrics.started
+    if track_memory:
+        metrics.peak_memory = tracemalloc.get_traced_memory()[1]
+    url_name = _url_name(request)
+    record(url_name, total, metrics)
+    response['Server-Timing'] = metrics.server_timing(total)
+    if profiler:
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        filename = f"{stamp}_{url_name.replace(':', '_').replace('/', '_')}.prof"
+        profiler.dump_stats(str(profile_dir() / filename))
+        response['X-Profile-Id'] = filename
+    return response
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if _current.get() is not None:
+            return self.get_response(request)
+        return _instrumented_call(request, self.get_response)
+
+
+def instrument_view(view_func):
+    """Instrument one view when PERF_INSTRUMENTATION is on but the middleware is not installed."""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if not getattr(settings, 'PERF_INSTRUMENTATION', False) or _current.get() is not None:
+            return view_func(request, *args, **kwargs)
+        return _instrumented_call(request, lambda req: view_func(req, *args, **kwargs))
+    return wrapper
@@ -0,0 +1,63 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from .assessment_models import FeedbackExcelUpload
+from .column_selectors import assessment_columns
+from .instrumentation import instrument_view, timed
+from .models import ChartAnalysis, Schedule
+from .workbook_loader import WorkbookTooLarge, load_workbooks
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_item_analysis(request, category, schedule_id):
+    """
+    Item analysis (difficulty, discrimination, point-biserial, KR-20,
+    distractors) for the latest pre or post upload of a schedule.
+
+    The stored ChartAnalysis result is returned when there is one;
+    ``?refresh=1`` recomputes it from the workbook.
+    """
+    if category not in ('pre', 'post'):
+        return JsonResponse({'success': False, 'error': 'Item analysis is available for pre and post assessments'}, status=400)
+    schedule = get_object_or_404(Schedule, id=schedule_id)
+    analysis_type = f'item_analysis_{category}'
+
+    if request.GET.get('refresh') != '1':
+        stored = (ChartAnalysis.objects
+                  .filter(schedule=schedule, analysis_type=analysis_type)
+                  .order_by('-analysis_date')
+                  .values('chart_data', 'analysis_date')
+                  .first())
+        if stored:
+            return JsonResponse({'success': True, 'analysis_date': stored['analysis_date'], **stored['chart_data']})
+
+    upload = (FeedbackExcelUpload.objects
+              .filter(schedule=schedule, category=category)
+              .exclude(file='')
+              .order_by('-uploaded_at')
+              .first())
+    if upload is None:
+        return JsonResponse({'success': False, 'error': f'No {category} assessment uploaded for this schedule'}, status=404)
+
+    from .item_analysis import store_item_analysis
+    try:
+        with timed('excel'):
+            df = load_workbooks({'current': upload.file.path}, usecols=assessment_columns)['current']
+        with timed('pandas'):
+            report = store_item_analysis(schedule.training, schedule, category, df, upload=upload, user=request.user)
+    except WorkbookTooLarge as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=413)
+    except Exception as e:
+        logger.exception('Item analysis failed for schedule %s (%s)', schedule_id, category)
+        return JsonResponse({'success': False, 'error': str(e)}, status=500)
+    if report is None:
+        return JsonResponse({'success': False, 'error': "No 'Points -' columns found in the workbook"}, status=400)
+    return JsonResponse({'success': True, **report})
@@ -0,0 +1,78 @@
+"""
+Canonical participant keys for joining workbooks.
+
+Pers No. / T. No. values arrive as ints, floats (``12345.0``), strings with
+leading zeros or stray whitespace, under English or bilingual headers such
+as ``पदनाम क्रमांक (Pers No.)``. Joining on ``astype(str)`` silently fails
+for ``'12345'`` vs ``'12345.0'`` and makes every missing value match every
+other one as ``'nan'``. ``participant_keys`` turns any such column into a
+nullable Int64 series once, and every merge runs on that integer column;
+values that are not a participant number become <NA> and never match.
+"""
+import logging
+import re
+
+from .analytics_helpers import extract_english, get_pandas
+
+logger = logging.getLogger(__name__)
+
+PARTICIPANT_KEY = 'participant_key'
+# Header spellings once the English part is taken and spaces and dots are removed
+KEY_HEADERS = ('persno', 'personnelno', 'personalno', 'tno', 'tnumber')
+MAX_KEY_DIGITS = 18  # fits in int64
+
+
+def _header_key(col):
+    text = str(col).replace('\xa0', ' ').strip()
+    text = extract_english(text) or text
+    return re.sub(r'[\s.]+', '', text).lower()
+
+
+def is_participant_column(col):
+    key = _header_key(col)
+    # 'persno' also matches headers with extra words, e.g. 'Pers No. of Employee'
+    return key in KEY_HEADERS or 'persno' in key
+
+
+def find_participant_column(columns):
+    """The first Pers No. / T. No. column in ``columns``, or None."""
+    for preferred in KEY_HEADERS:
+        for col in columns:
+            if _header_key(col) == preferred:
+                return col
+    return next((col for col in columns if is_participant_column(col)), None)
+
+
+def participant_keys(values):
+    """Canonical Int64 keys for a series of Pers No. values (<NA> where not a number)."""
+    pd = get_pandas()
+    if pd.api.types.is_bool_dtype(values):
+        return pd.Series(pd.NA, index=values.index, dtype='Int64')
+    if pd.api.types.is_numeric_dtype(values):
+        numbers = pd.to_numeric(values, errors='coerce')
+        whole = numbers.notna() & (numbers % 1 == 0) & (numbers.abs() < 10 ** MAX_KEY_DIGITS)
+        return numbers.where(whole).astype('Int64')
+    text = (values.astype('string')
+            .str.replace(r'\s+', '', regex=True)
+            .str.replace(r'\.0*$', '', regex=True))
+    digits = text.where(text.str.fullmatch(rf'\d{{1,{MAX_KEY_DIGITS}}}').fillna(False))
+    keys = pd.to_numeric(digits, errors='coerce').astype('Int64')
+    invalid = int((keys.isna() & values.notna() & (text != '')).sum())
+    if invalid:
+        logger.warning('%s participant numbers are not numeric and will not be matched', invalid)
+    return keys
+
+
+def add_participant_key(df, column=None):
+    """
+    Return ``(df with a PARTICIPANT_KEY column, source column)``.
+
+    Rows without a valid key are dropped: they cannot be matched with any
+    other sheet. ``df`` is returned unchanged with ``None`` when it has no
+    Pers No. / T. No. column.
+    """
+    column = column or find_participant_column(df.columns)
+    if column is None:
+        return df, None
+    keyed = df.assign(**{PARTICIPANT_KEY: participant_keys(df[column])})
+    return keyed[keyed[PARTICIPANT_KEY].notna()], column
@@ -0,0 +1,28 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404, JsonResponse
+
+from .instrumentation import profile_dir, route_summary, PROFILE_PARAM
+
+MAX_ROUTES = 200
+
+
+@staff_member_required
+def performance_report(request):
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), MAX_ROUTES)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'limit must be a number'}, status=400)
+    profiles = sorted(profile_dir().glob('*.prof'), reverse=True)[:50]
+    return JsonResponse({
+        'slowest_routes': route_summary()[:limit],
+        'profiles': [{'id': p.name, 'size': p.stat().st_size} for p in profiles],
+        'profile_hint': f'Append ?{PROFILE_PARAM}=1 to any URL to capture a cProfile dump of that request.',
+    })
+
+
+@staff_member_required
+def download_profile(request, profile_id):
+    path = profile_dir() / profile_id
+    if path.suffix != '.prof' or path.parent != profile_dir() or not path.exists():
+        raise Http404('Profile not found')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=profile_id)
@@ -0,0 +1,33 @@
+"""
+Drop change-feed entries older than CHANGE_FEED_RETENTION_DAYS.
+
+Clients whose last seen position was pruned get ``reset: true`` on their
+next poll and reload once. The newest entry is always kept so the feed
+position never goes backwards.
+
+Run: python manage.py prune_change_feed --days 30
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from django.utils import timezone
+
+from dashboard.changefeed_models import ScheduleChange
+
+
+class Command(BaseCommand):
+    help = 'Delete schedule change-feed entries older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=getattr(settings, 'CHANGE_FEED_RETENTION_DAYS', 30))
+
+    def handle(self, *args, **options):
+        latest = ScheduleChange.objects.aggregate(latest=Max('seq'))['latest']
+        if latest is None:
+            self.stdout.write('Change feed is empty')
+            return
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = ScheduleChange.objects.filter(changed_at__lt=cutoff, seq__lt=latest).delete()
+        self.stdout.write(self.style.SUCCESS(f'Pruned {deleted} change-feed entries older than {cutoff:%Y-%m-%d}'))
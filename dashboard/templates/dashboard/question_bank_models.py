@@ -0,0 +1,141 @@
+"""
+Question bank: stable identities for assessment questions across batches.
+
+A question's identity is a hash of its normalised text: the ``Que -`` /
+``Points -`` prefix is removed, the English part of a bilingual header is
+preferred, and case, spacing and trailing punctuation are ignored. Every
+item analysis appends one QuestionStat row per question, so a question's
+difficulty over time is a single indexed query on (question, batch_date).
+
+Difficulty comes from two sources that measure slightly different things,
+so each row records its ``source`` and trends never mix them:
+
+- ``item_analysis``: mean score over all participants as a share of the
+  item's maximum, unanswered counted as 0 (item_analysis.analyse_items);
+- ``idi``: share of participants scoring 1, among those present in both the
+  pre and post files (stored IDI results, backfill_question_bank only).
+"""
+import hashlib
+import re
+import unicodedata
+
+from django.db import models, transaction
+from django.utils import timezone
+
+from .analytics_helpers import extract_english, extract_question_text
+
+_SPACES = re.compile(r'\s+')
+# Punctuation that never changes which question it is; is_english_only would reject it
+_IGNORED = re.compile(r'[?!:;"\'“”‘’]')
+
+SOURCE_ITEM_ANALYSIS = 'item_analysis'
+SOURCE_IDI = 'idi'
+SOURCE_CHOICES = [
+    (SOURCE_ITEM_ANALYSIS, 'Item analysis'),
+    (SOURCE_IDI, 'IDI results'),
+]
+
+
+def normalise_question(text):
+    text = extract_question_text(str(text).replace('Points -', 'Que -', 1))
+    text = _IGNORED.sub('', unicodedata.normalize('NFKC', text))
+    text = extract_english(text) or text
+    return _SPACES.sub(' ', text).strip(' .-').lower()
+
+
+def question_key(text):
+    return hashlib.sha1(normalise_question(text).encode('utf-8')).hexdigest()[:20]
+
+
+class Question(models.Model):
+    key = models.CharField(max_length=20, unique=True)
+    text = models.TextField()
+    normalised_text = models.TextField()
+    first_seen = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.text
+
+
+class QuestionStat(models.Model):
+    question = models.ForeignKey(Question, on_delete=models.CASCADE, related_name='stats')
+    schedule = models.ForeignKey('Schedule', on_delete=models.CASCADE, related_name='question_stats')
+    category = models.CharField(max_length=10)  # 'pre' or 'post'
+    batch_date = models.DateField(null=True, blank=True)
+    participants = models.PositiveIntegerField(default=0)
+    difficulty = models.FloatField()  # 0-1, as defined by ``source`` (see module docstring)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default=SOURCE_ITEM_ANALYSIS)
+    discrimination = models.FloatField(null=True, blank=True)
+    point_biserial = models.FloatField(null=True, blank=True)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['question', 'schedule', 'category'], name='unique_question_stat_per_batch'),
+        ]
+        indexes = [
+            models.Index(fields=['question', 'batch_date'], name='questionstat_trend_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.question_id} @ {self.schedule_id} ({self.category}): {self.difficulty:.2f}"
+
+
+def _questions_for(texts):
+    """``{text: Question}``, creating bank entries for texts seen for the first time."""
+    keys = {text: question_key(text) for text in texts}
+    Question.objects.bulk_create(
+        [Question(key=key, text=extract_question_text(text), normalised_text=normalise_question(text))
+         for text, key in keys.items()],
+        ignore_conflicts=True,
+    )
+    by_key = Question.objects.in_bulk(set(keys.values()), field_name='key')
+    return {text: by_key[key] for text, key in keys.items()}
+
+
+def record_batch_stats(schedule, category, rows, source=SOURCE_ITEM_ANALYSIS):
+    """
+    Replace the stats of one batch (schedule + category) with ``rows``
+    measured by ``source``.
+
+    ``rows`` is a list of dicts with ``question``, ``difficulty`` and
+    optionally ``participants``, ``discrimination`` and ``point_biserial``.
+    """
+    rows = [row for row in rows if row.get('difficulty') is not None]
+    if not rows:
+        return 0
+    with transaction.atomic():
+        questions = _questions_for({row['question'] for row in rows})
+        QuestionStat.objects.filter(schedule=schedule, category=category).delete()
+        stats = {}
+        for row in rows:
+            question = questions[row['question']]
+            # Two headers that normalise to the same question keep the last one
+            stats[question.pk] = QuestionStat(
+                question=question,
+                schedule=schedule,
+                category=category,
+                batch_date=schedule.date,
+                participants=row.get('participants') or 0,
+                difficulty=row['difficulty'],
+                source=source,
+                discrimination=row.get('discrimination'),
+                point_biserial=row.get('point_biserial'),
+            )
+        QuestionStat.objects.bulk_create(stats.values())
+    return len(stats)
+
+
+def record_item_analysis(schedule, category, report):
+    """Feed an ``item_analysis.analyse_items`` report into the question bank."""
+    participants = report['test']['participants']
+    return record_batch_stats(schedule, category, [
+        {
+            'question': item['question'],
+            'participants': participants,
+            'difficulty': item['difficulty'],
+            'discrimination': item['discrimination'],
+            'point_biserial': item['corrected_point_biserial'],
+        }
+        for item in report['items']
+    ])
@@ -0,0 +1,100 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.db.models import Avg, Count, Max, Min, Q
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from .instrumentation import instrument_view
+from .question_bank_models import SOURCE_CHOICES, SOURCE_ITEM_ANALYSIS, Question, QuestionStat, normalise_question
+
+logger = logging.getLogger(__name__)
+
+MAX_QUESTIONS = 100
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_question_bank(request):
+    """
+    Questions in the bank with how many batches used them.
+
+    ``?q=`` filters on the normalised question text; ``?program_id=`` keeps
+    questions asked in that program's schedules. ``avg_difficulty`` only
+    averages stats of one ``?source=`` (default ``item_analysis``).
+    """
+    source = request.GET.get('source') or SOURCE_ITEM_ANALYSIS
+    if source not in dict(SOURCE_CHOICES):
+        return JsonResponse({'success': False, 'error': f'Unknown source: {source}'}, status=400)
+    questions = Question.objects.all()
+    query = request.GET.get('q', '').strip()
+    if query:
+        questions = questions.filter(normalised_text__contains=normalise_question(query))
+    if request.GET.get('program_id'):
+        questions = questions.filter(stats__schedule__program_id=request.GET['program_id'])
+    rows = (questions
+            .annotate(batches=Count('stats__schedule', distinct=True),
+                      avg_difficulty=Avg('stats__difficulty', filter=Q(stats__source=source)),
+                      last_seen=Max('stats__batch_date'))
+            .order_by('-batches', 'id')
+            .values('key', 'text', 'batches', 'avg_difficulty', 'last_seen')[:MAX_QUESTIONS])
+    return JsonResponse({'success': True, 'source': source, 'questions': [
+        {**row, 'avg_difficulty': round(row['avg_difficulty'], 4) if row['avg_difficulty'] is not None else None}
+        for row in rows
+    ]})
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_question_trend(request, key):
+    """
+    Difficulty of one question in every batch that used it, oldest first.
+
+    ``?category=pre|post`` restricts the trend to one assessment kind.
+    Difficulties of different sources are not comparable, so the trend uses
+    one ``?source=``; by default item analysis, or the IDI results when the
+    question has no item analysis.
+    """
+    question = get_object_or_404(Question, key=key)
+    stats = QuestionStat.objects.filter(question=question)
+    category = request.GET.get('category')
+    if category:
+        stats = stats.filter(category=category)
+    sources = sorted(set(stats.values_list('source', flat=True)))
+    source = request.GET.get('source')
+    if source is None:
+        source = SOURCE_ITEM_ANALYSIS if SOURCE_ITEM_ANALYSIS in sources or not sources else sources[0]
+    elif source not in dict(SOURCE_CHOICES):
+        return JsonResponse({'success': False, 'error': f'Unknown source: {source}'}, status=400)
+    stats = stats.filter(source=source)
+    points = list(stats
+                  .order_by('batch_date', 'schedule_id', 'category')
+                  .values('schedule_id', 'category', 'batch_date', 'participants', 'difficulty',
+                          'discrimination', 'point_biserial', 'schedule__training__training_name',
+                          'schedule__program__name'))
+    summary = stats.aggregate(batches=Count('schedule', distinct=True), min_difficulty=Min('difficulty'),
+                              max_difficulty=Max('difficulty'), avg_difficulty=Avg('difficulty'))
+    return JsonResponse({
+        'success': True,
+        'question': {'key': question.key, 'text': question.text, 'first_seen': question.first_seen},
+        'source': source,
+        'sources': sources,
+        'summary': summary,
+        'trend': [
+            {
+                'schedule_id': p['schedule_id'],
+                'category': p['category'],
+                'date': p['batch_date'],
+                'training': p['schedule__training__training_name'],
+                'program': p['schedule__program__name'],
+                'participants': p['participants'],
+                'difficulty': p['difficulty'],
+                'discrimination': p['discrimination'],
+                'point_biserial': p['point_biserial'],
+            }
+            for p in points
+        ],
+    })
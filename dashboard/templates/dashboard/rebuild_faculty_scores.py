@@ -0,0 +1,43 @@
+"""
+Recompute the running faculty feedback scores from the feedback workbooks.
+
+Needed once after deploying the faculty score tables, and after bulk edits
+that bypass signals (e.g. reassigning schedules to another faculty with
+QuerySet.update). Uses the latest feedback upload of each schedule, like
+the analysis view.
+
+Run: python manage.py rebuild_faculty_scores
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from dashboard.assessment_models import FeedbackExcelUpload
+from dashboard.faculty_score_models import FacultyScoreContribution, FacultyScoreMonth, apply_feedback_upload
+
+
+class Command(BaseCommand):
+    help = 'Rebuild faculty score aggregates from the latest feedback upload of every schedule'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            FacultyScoreContribution.objects.all().delete()
+            FacultyScoreMonth.objects.all().delete()
+
+        latest = {}
+        uploads = (FeedbackExcelUpload.objects
+                   .filter(category='feedback', schedule__isnull=False)
+                   .exclude(file='')
+                   .select_related('schedule')
+                   .order_by('schedule_id', '-uploaded_at'))
+        for upload in uploads:
+            latest.setdefault(upload.schedule_id, upload)
+
+        scored = failed = 0
+        for upload in latest.values():
+            try:
+                if apply_feedback_upload(upload) is not None:
+                    scored += 1
+            except Exception as e:
+                failed += 1
+                self.stderr.write(f'Schedule {upload.schedule_id}: {e}')
+        self.stdout.write(self.style.SUCCESS(f'Scored {scored} of {len(latest)} schedules ({failed} failed)'))
@@ -0,0 +1,250 @@
+"""
+Single-flight coordination for expensive computations.
+
+When a shared analysis link is opened by a room full of people, identical
+requests arrive together and each would parse the same workbooks and
+rewrite the same ChartAnalysis rows. ``run(key, compute)`` lets one caller
+compute while the others wait and get its result:
+
+* threads of one process share a Future per key;
+* processes (several runserver/gunicorn workers) take an exclusive file
+  lock per key under SINGLE_FLIGHT_PATH, and the leader pickles its result
+  there for SINGLE_FLIGHT_RESULT_TTL seconds so the waiting processes read
+  it instead of computing again.
+
+Keys should include everything the result depends on, e.g. the schedule,
+the category and ``input_hash`` of the input files. A failing computation
+raises in every caller that waited for it; nothing is stored. Results are
+shared objects: callers must not modify them.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+LOCK_POLL_SECONDS = 0.05
+# Lock files are left in place after use; ones unused this long are removed,
+# unless someone holds them
+STALE_LOCK_SECONDS = 3600
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def input_hash(paths):
+    """Digest of the path, mtime and size of every input file (missing files included)."""
+    parts = []
+    for path in sorted(str(p) for p in paths if p):
+        try:
+            stat = os.stat(path)
+            parts.append(f'{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}')
+        except OSError:
+            parts.append(f'{os.path.abspath(path)}:missing')
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _digest(key):
+    return hashlib.sha1(json.dumps(key, default=str).encode('utf-8')).hexdigest()[:24]
+
+
+def _timeout():
+    return 2 * getattr(settings, 'EXCEL_PARSE_TIMEOUT', 120)
+
+
+def _result_ttl():
+    return getattr(settings, 'SINGLE_FLIGHT_RESULT_TTL', 60)
+
+
+def _flight_dir():
+    path = Path(getattr(settings, 'SINGLE_FLIGHT_PATH', Path(settings.LOCAL_STORAGE_PATH) / 'single_flight'))
+    try:
+        path.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        logger.warning('Single-flight directory %s is unavailable', path, exc_info=True)
+        return None
+    return path
+
+
+def _try_lock(fd):
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+
+def _is_current(fd, path):
+    """Whether ``fd`` is still the file at ``path`` (not unlinked by _prune meanwhile)."""
+    try:
+        opened, current = os.fstat(fd), os.stat(path)
+    except OSError:
+        return False
+    return (opened.st_dev, opened.st_ino) == (current.st_dev, current.st_ino)
+
+
+@contextmanager
+def _file_lock(path, timeout):
+    """Hold an exclusive lock on ``path``; after ``timeout`` seconds carry on without it."""
+    deadline = time.monotonic() + timeout
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        while not (locked := _try_lock(fd)):
+            if time.monotonic() >= deadline:
+                logger.warning('Waited %ss for %s; computing without the lock', timeout, path)
+                break
+            time.sleep(LOCK_POLL_SECONDS)
+        if not locked or _is_current(fd, path):
+            break
+        # The file was pruned while we waited; lock the one now at ``path``
+        _unlock(fd)
+        os.close(fd)
+    try:
+        if locked:
+            # Marks the lock as in use, so _prune leaves it alone
+            os.utime(path)
+        yield
+    finally:
+        if locked:
+            _unlock(fd)
+        os.close(fd)
+
+
+def _read_result(path, ttl):
+    """``(True, result)`` for a stored result younger than ``ttl`` seconds, else ``(False, None)``."""
+    try:
+        if time.time() - path.stat().st_mtime < ttl:
+            with open(path, 'rb') as f:
+                return True, pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.warning('Discarding unreadable single-flight result %s', path, exc_info=True)
+        path.unlink(missing_ok=True)
+    return False, None
+
+
+def _write_result(directory, path, result):
+    tmp = None
+    try:
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except Exception:
+        logger.warning('Could not store single-flight result %s', path, exc_info=True)
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
+
+
+def _remove_unused_lock(path):
+    try:
+        fd = os.open(path, os.O_RDWR)
+    except OSError:
+        return
+    try:
+        # Only a lock nobody holds may go; a waiter that opened it first
+        # notices the unlink in _file_lock and retries on a new file
+        if _try_lock(fd):
+            try:
+                path.unlink()
+            finally:
+                _unlock(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _prune(directory, ttl):
+    now = time.time()
+    for entry in directory.iterdir():
+        is_lock = entry.suffix == '.lock'
+        try:
+            if now - entry.stat().st_mtime <= (STALE_LOCK_SECONDS if is_lock else ttl):
+                continue
+            if is_lock:
+                _remove_unused_lock(entry)
+            else:
+                entry.unlink()
+        except OSError:
+            pass
+
+
+def _run_across_processes(digest, compute):
+    directory = _flight_dir()
+    if directory is None:
+        return compute()
+    ttl = _result_ttl()
+    result_path = directory / f'{digest}.pkl'
+    if ttl:
+        found, result = _read_result(result_path, ttl)
+        if found:
+            return result
+    with _file_lock(directory / f'{digest}.lock', _timeout()):
+        if ttl:
+            # Another process may have finished it while we waited for the lock
+            found, result = _read_result(result_path, ttl)
+            if found:
+                return result
+        result = compute()
+        if ttl:
+            _write_result(directory, result_path, result)
+    _prune(directory, max(ttl, 1))
+    return result
+
+
+def run(key, compute):
+    """
+    Return ``compute()``, computed once for all concurrent callers with the same ``key``.
+
+    ``key`` is any JSON-able value; ``compute`` takes no arguments and its
+    result must be picklable to be shared between processes.
+    """
+    digest = _digest(key)
+    with _inflight_lock:
+        future = _inflight.get(digest)
+        leader = future is None
+        if leader:
+            future = _inflight[digest] = Future()
+    if not leader:
+        logger.debug('Waiting for in-flight computation %s', key)
+        return future.result(timeout=_timeout())
+    try:
+        result = _run_across_processes(digest, compute)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _inflight_lock:
+            _inflight.pop(digest, None)
@@ -0,0 +1,56 @@
+"""
+JSON diffs between detailed-schedule snapshots.
+
+A delta describes how to turn one JSON object into another:
+
+    {"set": {"hall": "B-2"}, "unset": ["notes"], "nested": {"extra": {...}}}
+
+``set`` replaces values (lists and scalars are replaced whole), ``unset``
+removes keys and ``nested`` holds a delta for a dict-valued key that exists
+on both sides. Only the standard library is used so the history reader and
+the compaction command stay cheap to import.
+"""
+import copy
+
+
+def diff(old, new):
+    """Return the delta that turns ``old`` into ``new`` (``{}`` when equal)."""
+    delta = {}
+    changed = {}
+    nested = {}
+    for key, value in new.items():
+        if key not in old:
+            changed[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            sub = diff(old[key], value)
+            if sub:
+                nested[key] = sub
+        elif old[key] != value:
+            changed[key] = value
+    removed = [key for key in old if key not in new]
+    if changed:
+        delta['set'] = changed
+    if removed:
+        delta['unset'] = removed
+    if nested:
+        delta['nested'] = nested
+    return delta
+
+
+def apply(state, delta):
+    """Apply ``delta`` to ``state`` in place and return it."""
+    for key in delta.get('unset', ()):
+        state.pop(key, None)
+    for key, value in delta.get('set', {}).items():
+        state[key] = copy.deepcopy(value)
+    for key, sub in delta.get('nested', {}).items():
+        apply(state.setdefault(key, {}), sub)
+    return state
+
+
+def rebuild(keyframe, deltas):
+    """Rebuild a state from a keyframe and the deltas recorded after it, in order."""
+    state = copy.deepcopy(keyframe)
+    for delta in deltas:
+        apply(state, delta)
+    return state
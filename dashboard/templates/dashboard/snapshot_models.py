@@ -0,0 +1,158 @@
+"""
+Delta-encoded history for detailed schedules.
+
+Every SNAPSHOT_KEYFRAME_INTERVAL revisions a full copy (keyframe) is stored;
+revisions in between only store the JSON diff from the previous one. Any
+point in time is rebuilt from the nearest keyframe at or before it plus at
+most one interval of deltas, so reads cost the same however long the
+history gets. ``compact_schedule_snapshots`` merges old deltas.
+
+A revision is recorded after every committed DetailedSchedule save
+(post_save receiver below); ``convert_schedule_snapshots`` moves the full
+copies kept by the older DetailedScheduleSnapshot table into this history.
+"""
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from . import snapshot_delta
+
+logger = logging.getLogger(__name__)
+
+# Attempts when a concurrent writer takes the same version number first
+RECORD_ATTEMPTS = 3
+
+
+def keyframe_interval():
+    return int(getattr(settings, 'SNAPSHOT_KEYFRAME_INTERVAL', 20))
+
+
+def serialize_detailed_schedule(detailed_schedule):
+    """JSON-safe copy of every concrete field of a DetailedSchedule."""
+    return {
+        field.attname: field.value_to_string(detailed_schedule)
+        for field in detailed_schedule._meta.concrete_fields
+    }
+
+
+class DetailedScheduleRevision(models.Model):
+    detailed_schedule = models.ForeignKey('DetailedSchedule', on_delete=models.CASCADE, related_name='revisions')
+    version = models.PositiveIntegerField()
+    is_keyframe = models.BooleanField(default=False)
+    # Full state for keyframes, a snapshot_delta diff otherwise
+    data = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
+
+    class Meta:
+        ordering = ['detailed_schedule', 'version']
+        constraints = [
+            models.UniqueConstraint(fields=['detailed_schedule', 'version'], name='unique_schedule_revision'),
+        ]
+        indexes = [
+            models.Index(fields=['detailed_schedule', 'is_keyframe', 'version'], name='schedule_rev_keyframe_idx'),
+            models.Index(fields=['detailed_schedule', 'created_at'], name='schedule_rev_created_idx'),
+        ]
+
+    def __str__(self):
+        kind = 'keyframe' if self.is_keyframe else 'delta'
+        return f"{self.detailed_schedule_id} v{self.version} ({kind})"
+
+
+def _revisions_up_to(detailed_schedule, at=None, version=None):
+    revisions = DetailedScheduleRevision.objects.filter(detailed_schedule=detailed_schedule)
+    if at is not None:
+        revisions = revisions.filter(created_at__lte=at)
+    if version is not None:
+        revisions = revisions.filter(version__lte=version)
+    return revisions
+
+
+def state_at(detailed_schedule, at=None, version=None):
+    """Rebuild the snapshot as it was at ``at`` (or ``version``); latest by default.
+
+    Returns ``(version, state)`` or ``(None, None)`` if nothing was recorded yet.
+    """
+    revisions = _revisions_up_to(detailed_schedule, at, version)
+    keyframe = revisions.filter(is_keyframe=True).order_by('-version').values('version', 'data').first()
+    if keyframe is None:
+        return None, None
+    deltas = list(revisions.filter(version__gt=keyframe['version']).order_by('version').values_list('version', 'data'))
+    state = snapshot_delta.rebuild(keyframe['data'], [data for _, data in deltas])
+    return (deltas[-1][0] if deltas else keyframe['version']), state
+
+
+def iter_history(detailed_schedule):
+    """Yield ``(revision, state)`` oldest first, applying deltas as it goes."""
+    state = None
+    for revision in DetailedScheduleRevision.objects.filter(detailed_schedule=detailed_schedule).order_by('version').iterator():
+        if revision.is_keyframe:
+            state = snapshot_delta.rebuild(revision.data, [])
+        elif state is None:
+            continue  # deltas without a preceding keyframe cannot be rebuilt
+        else:
+            snapshot_delta.apply(state, revision.data)
+        yield revision, state
+
+
+def _record(detailed_schedule, state, user, created_at):
+    with transaction.atomic():
+        # Serialise writers per schedule so versions stay gap-free and ordered
+        type(detailed_schedule).objects.select_for_update().filter(pk=detailed_schedule.pk).exists()
+        latest_version, latest_state = state_at(detailed_schedule)
+        if latest_state == state:
+            return None
+        last_keyframe = (DetailedScheduleRevision.objects
+                         .filter(detailed_schedule=detailed_schedule, is_keyframe=True)
+                         .order_by('-version').values_list('version', flat=True).first())
+        deltas_since = 0
+        if last_keyframe is not None:
+            deltas_since = DetailedScheduleRevision.objects.filter(
+                detailed_schedule=detailed_schedule, version__gt=last_keyframe).count()
+        is_keyframe = latest_state is None or deltas_since + 1 >= keyframe_interval()
+        return DetailedScheduleRevision.objects.create(
+            detailed_schedule=detailed_schedule,
+            version=(latest_version or 0) + 1,
+            is_keyframe=is_keyframe,
+            data=state if is_keyframe else snapshot_delta.diff(latest_state, state),
+            created_at=created_at or timezone.now(),
+            created_by=user,
+        )
+
+
+def record_snapshot(detailed_schedule, user=None, state=None, created_at=None):
+    """Store the current state of ``detailed_schedule`` if it changed.
+
+    Returns the new revision, or None when the state equals the latest one.
+    """
+    if state is None:
+        state = serialize_detailed_schedule(detailed_schedule)
+    for attempt in range(RECORD_ATTEMPTS):
+        try:
+            return _record(detailed_schedule, state, user, created_at)
+        except IntegrityError:
+            # SQLite ignores select_for_update, so two writers can pick the
+            # same version; the loser re-reads the history and diffs again
+            if attempt == RECORD_ATTEMPTS - 1:
+                raise
+
+
+def _on_detailed_schedule_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    def record():
+        try:
+            record_snapshot(instance)
+        except Exception:
+            # History is best effort; the save itself already committed
+            logger.exception('Could not record a revision of detailed schedule %s', instance.pk)
+
+    transaction.on_commit(record)
+
+
+post_save.connect(_on_detailed_schedule_saved, sender='dashboard.DetailedSchedule',
+                  dispatch_uid='detailed_schedule_revision')
@@ -0,0 +1,440 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from . import snapshot_delta
+from .analytics_helpers import (
+    detect_question_and_points_columns, extract_english, extract_points_text, extract_question_text,
+)
+
+
+class AnalyticsHelpersTests(SimpleTestCase):
+    def test_detects_question_and_points_columns(self):
+        columns = ['Employee Name', 'Que - Safety rules', 'Points - Safety rules', 'Total points']
+        questions, points = detect_question_and_points_columns(columns)
+        self.assertEqual(questions, ['Que - Safety rules'])
+        self.assertEqual(points, ['Points - Safety rules'])
+        self.assertEqual(extract_question_text(questions[0]), 'Safety rules')
+        self.assertEqual(extract_points_text(points[0]), 'Safety rules')
+
+    def test_extract_english_from_bilingual_header(self):
+        self.assertEqual(extract_english('पदनाम क्रमांक (Pers No.)'), 'Pers No.')
+        self.assertIsNone(extract_english('पदनाम क्रमांक'))
+
+
+class ImportTimeTests(SimpleTestCase):
+    IMPORT_BUDGET_US = 150_000
+
+    def _import_times(self, module):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c',
+             f'import {module}, sys; print(",".join(sorted(sys.modules)))'],
+            cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+        )
+        cumulative = 0
+        for line in proc.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() == module:
+                cumulative = int(fields[1])
+        return cumulative, set(proc.stdout.strip().split(','))
+
+    def test_helpers_import_without_pandas(self):
+        cumulative_us, loaded = self._import_times('dashboard.analytics_helpers')
+        self.assertNotIn('pandas', loaded)
+        self.assertNotIn('dashboard.views', loaded)
+        self.assertLess(cumulative_us, self.IMPORT_BUDGET_US)
+
+
+class TimetableSolverTests(SimpleTestCase):
+    def test_solve_places_cohort_sessions_without_overlap(self):
+        import datetime
+
+        from .timetable_solver import TimetableSolver
+
+        day = datetime.date(2025, 1, 6)
+        sessions = [{'id': i, 'duration': 60, 'students': 10, 'faculty_ids': [i], 'cohort': 1} for i in range(3)]
+        halls = [{'id': 1, 'capacity': 20}, {'id': 2, 'capacity': 20}]
+        # Hall 1 is taken from 09:00 to 10:00 and the cohort from 11:00 to 12:00
+        busy = [('hall', 1, day, 540, 600), ('cohort', 1, day, 660, 720)]
+        result = TimetableSolver(sessions, halls, [day], busy=busy, day_start='09:00', day_end='13:00',
+                                 seed=1).solve()
+        self.assertEqual(result['unplaced'], [])
+        starts = sorted(start for _, start, _, _ in result['placed'].values())
+        self.assertEqual(starts, [540, 600, 720])
+        self.assertEqual(result['placed'][0][3], 2)
+
+        result = TimetableSolver(sessions, halls, [day], day_start='09:00', day_end='11:00', seed=1,
+                                 time_budget=0.2).solve()
+        self.assertEqual(len(result['placed']), 2)
+        self.assertEqual(len(result['unplaced']), 1)
+        with self.assertRaises(ValueError):
+            TimetableSolver(sessions, halls, [day], day_start='9am')
+
+
+class ExcelEditorTests(SimpleTestCase):
+    def test_coerce_keeps_cell_types(self):
+        import datetime
+
+        from .excel_editor_views import CellValueError, _coerce
+
+        self.assertEqual(_coerce('7', 5), 7)
+        self.assertEqual(_coerce('1,250.5', 3.0), 1250.5)
+        self.assertEqual(_coerce('2025-03-04', datetime.datetime(2025, 1, 2)), datetime.datetime(2025, 3, 4))
+        self.assertEqual(_coerce('12', 'text'), '12')
+        self.assertEqual(_coerce('12', None), '12')
+        with self.assertRaises(CellValueError):
+            _coerce('absent', 5)
+
+
+class SnapshotDeltaTests(SimpleTestCase):
+    def test_diff_then_apply_round_trips(self):
+        old = {'hall': 'A-1', 'notes': 'x', 'extra': {'slots': [1, 2], 'room': {'floor': 1}}}
+        new = {'hall': 'B-2', 'extra': {'slots': [1, 2, 3], 'room': {'floor': 1}}, 'status': 'done'}
+        delta = snapshot_delta.diff(old, new)
+        self.assertEqual(delta['unset'], ['notes'])
+        self.assertNotIn('room', delta['nested']['extra'].get('set', {}))
+        self.assertEqual(snapshot_delta.rebuild(old, [delta]), new)
+        self.assertEqual(snapshot_delta.diff(new, new), {})
+
+
+class FilterEngineTests(SimpleTestCase):
+    def test_rejects_fields_operators_and_values_outside_the_schema(self):
+        from .filter_engine import SCHEDULE_FILTERS, FilterError, compile_filters
+
+        bad = [
+            {'field': 'program__name', 'value': 'x'},
+            {'field': 'faculty__user__password', 'value': 'x'},
+            {'field': 'hall', 'operator': 'regex', 'value': '.*'},
+            {'field': 'students', 'operator': 'contains', 'value': '3'},
+            {'field': 'hall', 'operator': 'greaterThan', 'value': 'A'},
+            {'field': 'date', 'value': '2025-13-40'},
+            {'field': 'students', 'value': 'NaN'},
+            {'field': 'hall', 'value': ''},
+            'hall',
+        ]
+        for condition in bad:
+            with self.subTest(condition=condition), self.assertRaises(FilterError):
+                compile_filters({'groups': [{'conditions': [condition]}]}, SCHEDULE_FILTERS)
+        for state in ('hall', {'groups': 'hall'}, {'groups': ['hall']},
+                      {'groups': [{'operator': 'XOR', 'conditions': [{'field': 'hall', 'value': 'A'}] * 2}]}):
+            with self.subTest(state=state), self.assertRaises(FilterError):
+                compile_filters(state, SCHEDULE_FILTERS)
+
+    def test_groups_are_joined_by_their_operator_and_anded(self):
+        import datetime
+
+        from django.db.models import Q
+
+        from .filter_engine import SCHEDULE_FILTERS, compile_filters
+
+        halls = {'operator': 'OR', 'conditions': [
+            {'field': 'hall', 'operator': 'equals', 'value': 'Hall A'},
+            {'field': 'hall', 'operator': 'startsWith', 'value': ' Annexe '},
+        ]}
+        dates = {'conditions': [
+            {'field': 'date', 'operator': 'between', 'value': '2025-06-30', 'value2': '2025-06-01T00:00:00'},
+            {'field': 'students', 'operator': 'greaterThan', 'value': '10.0'},
+        ]}
+        june = (datetime.date(2025, 6, 1), datetime.date(2025, 6, 30))
+        self.assertEqual(
+            compile_filters({'groups': [halls, dates]}, SCHEDULE_FILTERS),
+            (Q(hall__name__exact='Hall A') | Q(hall__name__istartswith='Annexe'))
+            & (Q(date__range=june) & Q(students__gt=10)))
+        self.assertEqual(
+            compile_filters({'operator': 'OR', 'groups': [halls, {'conditions': [dates['conditions'][1]]}]},
+                            SCHEDULE_FILTERS),
+            (Q(hall__name__exact='Hall A') | Q(hall__name__istartswith='Annexe')) | Q(students__gt=10))
+        self.assertEqual(compile_filters({'groups': [{'conditions': []}]}, SCHEDULE_FILTERS), Q())
+        self.assertEqual(compile_filters(None, SCHEDULE_FILTERS), Q())
+
+    def test_limits(self):
+        from django.db.models import Q
+
+        from .filter_engine import (
+            MAX_CONDITIONS, MAX_GROUPS, MAX_IN_VALUES, SCHEDULE_FILTERS, FilterError, compile_filters,
+        )
+
+        def state(value, conditions=1, groups=1):
+            group = {'conditions': [{'field': 'faculty_id', 'value': value}] * conditions}
+            return {'groups': [group] * groups}
+
+        ids = list(range(MAX_IN_VALUES))
+        self.assertEqual(compile_filters(state(ids), SCHEDULE_FILTERS), Q(faculty_id__in=ids))
+        for too_many in (state(ids + [0]), state(1, conditions=MAX_CONDITIONS + 1),
+                         state(1, groups=MAX_GROUPS + 1)):
+            with self.assertRaises(FilterError):
+                compile_filters(too_many, SCHEDULE_FILTERS)
+        compile_filters(state(1, conditions=MAX_CONDITIONS), SCHEDULE_FILTERS)
+
+    def test_flat_filters_become_one_and_group(self):
+        from django.db.models import Q
+
+        from .filter_engine import SCHEDULE_FILTERS, compile_filters, from_flat_filters
+
+        state = from_flat_filters({'hall': 'Hall A', 'status': '', 'faculty_id': ['3', 4], 'program': None})
+        self.assertEqual(state, {'groups': [{'operator': 'AND', 'conditions': [
+            {'field': 'hall', 'operator': 'equals', 'value': 'Hall A'},
+            {'field': 'faculty_id', 'operator': 'equals', 'value': ['3', 4]},
+        ]}]})
+        self.assertEqual(compile_filters(state, SCHEDULE_FILTERS),
+                         Q(hall__name__exact='Hall A') & Q(faculty_id__in=[3, 4]))
+        self.assertEqual(from_flat_filters({'hall': []}), {'groups': []})
+
+    def test_ordering_is_whitelisted(self):
+        from .filter_engine import SCHEDULE_FILTERS, FilterError
+
+        self.assertEqual(SCHEDULE_FILTERS.ordering(None), ['date', 'start_time'])
+        self.assertEqual(SCHEDULE_FILTERS.ordering(['-date', 'program']), ['-date', 'program__name'])
+        self.assertEqual(SCHEDULE_FILTERS.ordering('faculty'), ['faculty__name'])
+        for requested in ('students', 'program__name', ['date', '-faculty__user__password']):
+            with self.subTest(requested=requested), self.assertRaises(FilterError):
+                SCHEDULE_FILTERS.ordering(requested)
+
+
+class FacetCountTests(SimpleTestCase):
+    def test_split_filters_keeps_plain_selections_out_of_sql(self):
+        from .facets import SCHEDULE_FACETS, split_filters
+        from .filter_engine import SCHEDULE_FILTERS
+
+        dates = {'conditions': [{'field': 'date', 'operator': 'between', 'value': '2025-06-01',
+                                 'value2': '2025-06-30'}]}
+        mixed = {'operator': 'OR', 'conditions': [{'field': 'hall', 'value': 'Hall B'},
+                                                  {'field': 'status', 'value': 'done'}]}
+        state = {'groups': [
+            {'operator': 'OR', 'conditions': [{'field': 'hall', 'value': 'Hall A'},
+                                              {'field': 'hall', 'value': 'Hall B'}]},
+            {'conditions': [{'field': 'status', 'value': ['scheduled']}]},
+            dates,
+            mixed,
+            # A second selection on the same facet is ANDed with the first
+            {'conditions': [{'field': 'hall', 'value': ['Hall A', 'Hall C']}]},
+        ]}
+        sql_state, selections = split_filters(state, SCHEDULE_FACETS, SCHEDULE_FILTERS)
+        self.assertEqual(sql_state, {'groups': [dates, mixed]})
+        self.assertEqual(selections, {'hall': {'Hall A'}, 'status': {'scheduled'}})
+        self.assertEqual(split_filters({**state, 'operator': 'OR'}, SCHEDULE_FACETS, SCHEDULE_FILTERS),
+                         ({**state, 'operator': 'OR'}, {}))
+
+    def test_each_facet_ignores_only_its_own_selection(self):
+        from .facets import count_rows
+
+        paths = {'hall': 'hall__name', 'status': 'status'}
+        rows = [
+            {'hall__name': 'Hall A', 'status': 'scheduled', '_count': 3},
+            {'hall__name': 'Hall A', 'status': 'done', '_count': 2},
+            {'hall__name': 'Hall B', 'status': 'scheduled', '_count': 4},
+            {'hall__name': 'Hall B', 'status': 'done', '_count': 1},
+            {'hall__name': 'Hall C', 'status': 'done', '_count': 5},
+            {'hall__name': None, 'status': 'scheduled', '_count': 7},
+        ]
+        counts, total = count_rows(rows, paths, {'hall': {'Hall A'}, 'status': {'scheduled'}})
+        # Rows failing both selections (Hall B/C done) count nowhere; a null hall is not listed
+        self.assertEqual(counts, {
+            'hall': [{'value': 'Hall B', 'count': 4}, {'value': 'Hall A', 'count': 3}],
+            'status': [{'value': 'scheduled', 'count': 3}, {'value': 'done', 'count': 2}],
+        })
+        self.assertEqual(total, 3)
+
+        counts, total = count_rows(rows, paths, {})
+        # Ties are listed by value
+        self.assertEqual([(c['value'], c['count']) for c in counts['hall']],
+                         [('Hall A', 5), ('Hall B', 5), ('Hall C', 5)])
+        self.assertEqual(total, 22)
+
+
+class ItemAnalysisTests(SimpleTestCase):
+    def test_statistics_match_textbook_formulas(self):
+        import numpy as np
+        from .item_analysis import item_statistics
+
+        scores = np.array([[1, 1, 1], [1, 1, 0], [1, 0, 0], [0, 0, 0], [1, 1, 1], [0, 1, 0]], dtype=float)
+        stats = item_statistics(scores)
+        np.testing.assert_allclose(stats['difficulty'], scores.mean(axis=0))
+        totals = scores.sum(axis=1)
+        expected = np.corrcoef(scores[:, 0], totals - scores[:, 0])[0, 1]
+        self.assertAlmostEqual(stats['corrected_point_biserial'][0], expected)
+        # KR-20 is Cronbach's alpha specialised to 0/1 items
+        self.assertAlmostEqual(stats['test']['kr20'], 0.681818, places=5)
+        self.assertAlmostEqual(stats['test']['kr20'], stats['test']['cronbach_alpha'])
+
+
+class QuestionBankTests(SimpleTestCase):
+    def test_question_key_ignores_prefix_case_spacing_and_language(self):
+        from .question_bank_models import question_key
+
+        key = question_key('Que - What is GST?')
+        self.assertEqual(question_key('Points - what  is GST'), key)
+        self.assertEqual(question_key('Que - जीएसटी क्या है (What is GST?)'), key)
+        self.assertNotEqual(question_key('Que - What is VAT?'), key)
+
+
+class FacultyScoreTests(SimpleTestCase):
+    def test_feedback_sums_skip_incomplete_rows(self):
+        from .analytics_helpers import get_pandas
+        from .faculty_score_models import feedback_sums
+
+        pd = get_pandas()
+        df = pd.DataFrame({
+            'F1Que - Content': [5, 4, None],
+            'F2Que - Delivery': [5, 2, 3],
+            'F3 ': [4, 'n/a', 3],
+            'F3Que - Material': [4, 4, 3],
+            'F4Que - Overall': [3, 3, 3],
+        })
+        columns, sums = feedback_sums(df)
+        self.assertEqual(columns['f3'], 'F3Que - Material')
+        self.assertEqual(sums['responses'], 2)
+        self.assertAlmostEqual(sums['weighted_sum'], (5 * .3 + 5 * .25 + 4 * .25 + 3 * .2) + (4 * .3 + 2 * .25 + 4 * .25 + 3 * .2))
+
+
+class ParticipantKeyTests(SimpleTestCase):
+    def test_keys_match_across_representations(self):
+        from .analytics_helpers import get_pandas
+        from .participant_keys import participant_keys
+
+        pd = get_pandas()
+        as_text = participant_keys(pd.Series([' 012345', '12345.0', '12 345', 'abc', None, '']))
+        self.assertEqual(as_text.tolist()[:3], [12345, 12345, 12345])
+        self.assertTrue(as_text.iloc[3:].isna().all())
+        as_float = participant_keys(pd.Series([12345.0, 12345.5, float('nan')]))
+        self.assertEqual(str(as_float.dtype), 'Int64')
+        self.assertEqual(as_float.iloc[0], 12345)
+        self.assertTrue(as_float.iloc[1:].isna().all())
+
+    def test_finds_bilingual_and_t_no_headers(self):
+        from .participant_keys import find_participant_column
+
+        self.assertEqual(find_participant_column(['Name', 'पदनाम क्रमांक (Pers No.)']), 'पदनाम क्रमांक (Pers No.)')
+        self.assertEqual(find_participant_column(['Name', 'T. No.']), 'T. No.')
+        self.assertIsNone(find_participant_column(['Name', 'Total Points']))
+
+
+class FrameDtypeTests(SimpleTestCase):
+    def test_optimise_dtypes_keeps_values(self):
+        from .analytics_helpers import get_pandas
+        from .frame_dtypes import optimise_dtypes, plain_dtypes
+
+        pd = get_pandas()
+        df = pd.DataFrame({
+            'Faculty Name': ['Patil', 'Verma', 'Patil', 'Patil'],
+            'Employee Name': ['A', 'B', 'C', 'D'],
+            'Total Points': [7, 9, 8, 10],
+            'Points - Q1': [1.0, 0.0, None, 1.0],
+            'Average': [0.5, 0.25, 1.0, 0.75],
+        })
+        optimised = optimise_dtypes(df)
+        self.assertEqual(str(optimised['Faculty Name'].dtype), 'category')
+        self.assertNotEqual(str(optimised['Employee Name'].dtype), 'category')
+        self.assertEqual(str(optimised['Total Points'].dtype), 'int32')
+        # Gappy and fractional floats stay float64
+        self.assertEqual(str(optimised['Points - Q1'].dtype), 'float64')
+        self.assertEqual(str(optimised['Average'].dtype), 'float64')
+        self.assertEqual(optimised.astype(object).where(optimised.notna(), None).values.tolist(),
+                         df.astype(object).where(df.notna(), None).values.tolist())
+        # Ordering comparisons need the plain values back
+        plain = plain_dtypes(optimised)
+        self.assertEqual(plain['Faculty Name'].dtype, object)
+        self.assertEqual((plain['Faculty Name'] > 'Q').tolist(), [False, True, False, False])
+
+
+class DataGridTests(SimpleTestCase):
+    def test_grid_page_filters_sorts_and_pages(self):
+        from .analytics_helpers import get_pandas
+        from .data_grid import GridError, grid_page
+        from .frame_dtypes import optimise_dtypes
+
+        pd = get_pandas()
+        df = optimise_dtypes(pd.DataFrame({
+            'Faculty Name': ['Patil', 'Verma', 'Patil', 'Patil'],
+            'Employee Name': ['Asha', 'Bala', 'Chetan', 'Deepa'],
+            'Total Points': [7, 9, None, 10],
+        }))
+        page = grid_page(df, offset=1, limit=1, sort='Total Points', descending=True,
+                         filters={'Faculty Name': 'pat'})
+        self.assertEqual((page['total_rows'], page['filtered_rows']), (4, 3))
+        self.assertEqual(page['rows'], [['Patil', 'Asha', 7.0]])
+        # Missing values sort last and serialise as None
+        self.assertEqual(grid_page(df, sort='Total Points')['rows'][-1], ['Patil', 'Chetan', None])
+        self.assertEqual(grid_page(df, search='DEEP')['filtered_rows'], 1)
+        with self.assertRaises(GridError):
+            grid_page(df, sort='Missing')
+
+    def test_grid_page_sorts_mixed_type_columns(self):
+        from .analytics_helpers import get_pandas
+        from .data_grid import grid_page
+
+        pd = get_pandas()
+        df = pd.DataFrame({'Marks': pd.Series([10, 'N/A', 9, None, 'Absent'], dtype=object)})
+        page = grid_page(df, sort='Marks')
+        self.assertEqual([row[0] for row in page['rows']], [9, 10, 'Absent', 'N/A', None])
+        self.assertEqual(grid_page(df, sort='Marks', descending=True)['rows'][0], ['N/A'])
+
+
+class UploadProfileTests(SimpleTestCase):
+    def test_profile_frame_counts_and_histograms(self):
+        from .analytics_helpers import get_pandas
+        from .frame_dtypes import optimise_dtypes
+        from .upload_profile_models import profile_frame
+
+        pd = get_pandas()
+        df = optimise_dtypes(pd.DataFrame({
+            'Faculty Name': ['Patil', 'Verma', 'Patil', None],
+            'Total Points': [7, 9, None, 10],
+            'Marks': list(range(0, 40, 10)),
+        }))
+        profile = profile_frame(df)
+        self.assertEqual((profile['total_rows'], profile['total_columns'], profile['null_cells']), (4, 3, 2))
+        self.assertAlmostEqual(profile['completeness_rate'], 10 / 12 * 100)
+        faculty, points, _ = profile['columns']
+        self.assertEqual((faculty['null_count'], faculty['unique_values']), (1, 2))
+        self.assertEqual(faculty['histogram']['values'][0], {'value': 'Patil', 'count': 2})
+        self.assertEqual(points['non_null_count'], 3)
+        self.assertEqual(sum(v['count'] for v in points['histogram']['values']), 3)
+
+
+class SingleFlightTests(SimpleTestCase):
+    def test_concurrent_callers_share_one_computation(self):
+        import tempfile
+        import threading
+        import time
+
+        from django.test import override_settings
+
+        from . import single_flight
+
+        calls, results = [], []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'rate': 75.0}
+
+        def call():
+            results.append(single_flight.run(['test', 1, 'post'], compute))
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(SINGLE_FLIGHT_PATH=tmp):
+            threads = [threading.Thread(target=call) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            # A later identical request reuses the stored result
+            call()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'rate': 75.0}] * 6)
+
+
+class DocumentRangeTests(SimpleTestCase):
+    def test_byte_range(self):
+        from .document_store_views import _byte_range
+
+        self.assertEqual(_byte_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(_byte_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(_byte_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(_byte_range('bytes=900-5000', 1000), (900, 999))
+        self.assertEqual(_byte_range('bytes=1000-', 1000), 'unsatisfiable')
+        # Multiple or malformed ranges fall back to the whole file
+        self.assertIsNone(_byte_range('bytes=0-1,5-6', 1000))
+        self.assertIsNone(_byte_range('items=0-1', 1000))
@@ -0,0 +1,187 @@
+"""
+Constraint-based timetable solver for non-calendar programs.
+
+The solver works on plain Python data so it can be used from views,
+management commands or tests without touching the database:
+
+    sessions  - trainings to place (id, duration in minutes, students,
+                candidate faculty ids and an optional cohort id)
+    halls     - available halls (id, capacity)
+    days      - dates allowed by the program's ProgramScheduleDate windows
+    busy      - already booked intervals per faculty / hall / cohort
+
+Sessions sharing a cohort (the trainings of one program, attended by the
+same participants) never overlap each other.
+
+A greedy most-constrained-first construction is followed by a min-conflicts
+local search that keeps running until every session is placed or the time
+budget runs out. The result never contains a faculty, hall or cohort double
+booking. ``day_start``/``day_end`` must be ``HH:MM`` strings; anything else
+raises ValueError.
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+SLOT_MINUTES = 30
+
+
+def _to_minutes(value):
+    return value.hour * 60 + value.minute
+
+
+def _overlaps(a_start, a_end, b_start, b_end):
+    return a_start < b_end and b_start < a_end
+
+
+class TimetableSolver:
+    def __init__(self, sessions, halls, days, busy=None, day_start='09:00',
+                 day_end='17:30', time_budget=2.0, seed=None):
+        self.sessions = list(sessions)
+        self.halls = sorted(halls, key=lambda h: h['capacity'] or 0)
+        self.days = sorted(days)
+        self.day_index = {day: i for i, day in enumerate(self.days)}
+        self.day_start = _to_minutes(datetime.strptime(day_start, '%H:%M'))
+        self.day_end = _to_minutes(datetime.strptime(day_end, '%H:%M'))
+        if self.day_start >= self.day_end:
+            raise ValueError('day_start must be before day_end')
+        self.time_budget = time_budget
+        self.random = random.Random(seed)
+        # (kind, resource_id, day) -> list of (start, end, session_id or None)
+        self.bookings = {}
+        for kind, resource_id, day, start, end in (busy or []):
+            self.bookings.setdefault((kind, resource_id, day), []).append((start, end, None))
+        self.by_id = {s['id']: s for s in self.sessions}
+        self.assignment = {}
+
+    # Candidate generation ------------------------------------------------
+
+    def _halls_for(self, session):
+        students = session.get('students') or 0
+        return [h['id'] for h in self.halls if (h['capacity'] or 0) >= students]
+
+    def _starts_for(self, session):
+        last_start = self.day_end - session['duration']
+        return range(self.day_start, last_start + 1, SLOT_MINUTES)
+
+    def _domain_size(self, session):
+        return (len(self.days) * len(self._starts_for(session))
+                * len(session['faculty_ids']) * len(self._halls_for(session)))
+
+    @staticmethod
+    def _resources(session, day, faculty_id, hall_id):
+        keys = [('faculty', faculty_id, day), ('hall', hall_id, day)]
+        if session.get('cohort') is not None:
+            keys.append(('cohort', session['cohort'], day))
+        return keys
+
+    def _conflicts(self, session, day, start, faculty_id, hall_id):
+        end = start + session['duration']
+        clashes = set()
+        for key in self._resources(session, day, faculty_id, hall_id):
+            for b_start, b_end, owner in self.bookings.get(key, ()):
+                if owner != session['id'] and _overlaps(start, end, b_start, b_end):
+                    # Pre-existing bookings (owner None) can never be moved.
+                    clashes.add(owner)
+        return clashes
+
+    # Booking bookkeeping --------------------------------------------------
+
+    def _book(self, session, placement):
+        day, start, faculty_id, hall_id = placement
+        end = start + session['duration']
+        for key in self._resources(session, day, faculty_id, hall_id):
+            self.bookings.setdefault(key, []).append((start, end, session['id']))
+        self.assignment[session['id']] = placement
+
+    def _unbook(self, session_id):
+        day, _, faculty_id, hall_id = self.assignment.pop(session_id)
+        for key in self._resources(self.by_id[session_id], day, faculty_id, hall_id):
+            self.bookings[key] = [b for b in self.bookings[key] if b[2] != session_id]
+
+    def _placements(self, session):
+        halls = self._halls_for(session)
+        for day in self.days:
+            for start in self._starts_for(session):
+                for faculty_id in session['faculty_ids']:
+                    for hall_id in halls:
+                        yield day, start, faculty_id, hall_id
+
+    def _cost(self, placement):
+        # Prefer early days and early starts so programs stay compact.
+        day, start, _, _ = placement
+        return self.day_index[day] * 24 * 60 + start
+
+    # Search -----------------------------------------------------------------
+
+    def solve(self):
+        deadline = time.monotonic() + self.time_budget
+        by_id = self.by_id
+        order = sorted(self.sessions, key=lambda s: (self._domain_size(s), -s['duration']))
+
+        pending = []
+        for i, session in enumerate(order):
+            if time.monotonic() >= deadline:
+                # Out of time while still constructing: the rest stay unplaced
+                pending.extend(s['id'] for s in order[i:])
+                break
+            free = [p for p in self._placements(session) if not self._conflicts(session, *p)]
+            if free:
+                self._book(session, min(free, key=self._cost))
+            else:
+                pending.append(session['id'])
+
+        # Min-conflicts repair: place a pending session where it displaces the
+        # fewest movable sessions, then queue the displaced ones.
+        iterations = 0
+        infeasible = []
+        while pending and time.monotonic() < deadline:
+            iterations += 1
+            session = by_id[pending.pop(self.random.randrange(len(pending)))]
+            best, best_clashes = None, None
+            for placement in self._placements(session):
+                clashes = self._conflicts(session, *placement)
+                if None in clashes:
+                    continue
+                if best_clashes is None or len(clashes) < len(best_clashes) or (
+                        len(clashes) == len(best_clashes) and self.random.random() < 0.3):
+                    best, best_clashes = placement, clashes
+                    if not clashes:
+                        break
+            if best is None:
+                # Every placement collides with a fixed booking.
+                infeasible.append(session['id'])
+                continue
+            for displaced in best_clashes:
+                self._unbook(displaced)
+                pending.append(displaced)
+            self._book(session, best)
+
+        return {
+            'placed': dict(self.assignment),
+            'unplaced': sorted(pending + infeasible),
+            'iterations': iterations,
+            'timed_out': bool(pending) and time.monotonic() >= deadline,
+        }
+
+
+def format_proposals(result, sessions):
+    """Turn solver output into rows accepted by the batch schedule endpoint."""
+    by_id = {s['id']: s for s in sessions}
+    proposals = []
+    for session_id, (day, start, faculty_id, hall_id) in sorted(
+            result['placed'].items(), key=lambda item: (item[1][0], item[1][1])):
+        session = by_id[session_id]
+        start_dt = datetime.combine(day, datetime.min.time()) + timedelta(minutes=start)
+        end_dt = start_dt + timedelta(minutes=session['duration'])
+        proposals.append({
+            'training_id': session_id,
+            'date': day.isoformat(),
+            'start_time': start_dt.strftime('%H:%M'),
+            'end_time': end_dt.strftime('%H:%M'),
+            'duration': round(session['duration'] / 60, 2),
+            'faculty_id': faculty_id,
+            'hall_id': hall_id,
+            'students': session.get('students') or 0,
+        })
+    return proposals
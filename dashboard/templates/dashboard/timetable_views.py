@@ -0,0 +1,167 @@
+import json
+import logging
+from datetime import timedelta
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_POST
+
+from .models import Program, Training, Schedule, Hall, Faculty, ProgramScheduleDate
+from .timetable_solver import TimetableSolver, format_proposals
+from training_mgmt.log_config import debug_enabled
+
+logger = logging.getLogger(__name__)
+MAX_TIME_BUDGET = 10.0
+
+
+def _program_days(program, date_from=None, date_to=None):
+    days = set()
+    for window in ProgramScheduleDate.objects.filter(program=program):
+        end = window.end_date or window.start_date
+        day = window.start_date
+        while day and day <= end:
+            days.add(day)
+            day += timedelta(days=1)
+    if date_from:
+        days = {d for d in days if d >= date_from}
+    if date_to:
+        days = {d for d in days if d <= date_to}
+    # Sundays are never scheduled
+    return sorted(d for d in days if d.weekday() != 6)
+
+
+def _existing_bookings(days, exclude_training_ids):
+    busy = []
+    schedules = (Schedule.objects
+                 .filter(date__in=days)
+                 .exclude(status='Cancelled')
+                 .exclude(training_id__in=exclude_training_ids)
+                 .values('date', 'start_time', 'end_time', 'faculty_id', 'alt_faculty_id', 'hall_id',
+                         'training__program_id'))
+    for s in schedules:
+        if not (s['start_time'] and s['end_time']):
+            continue
+        start = s['start_time'].hour * 60 + s['start_time'].minute
+        end = s['end_time'].hour * 60 + s['end_time'].minute
+        for faculty_id in (s['faculty_id'], s['alt_faculty_id']):
+            if faculty_id:
+                busy.append(('faculty', faculty_id, s['date'], start, end))
+        if s['hall_id']:
+            busy.append(('hall', s['hall_id'], s['date'], start, end))
+        if s['training__program_id']:
+            # The program's participants are already in this session
+            busy.append(('cohort', s['training__program_id'], s['date'], start, end))
+    return busy
+
+
+def _parse_options(payload):
+    """Validated ``(training ids, students, faculty overrides, time budget)``; ValueError on bad input."""
+    try:
+        training_ids = [int(t) for t in payload.get('training_ids') or []]
+    except (TypeError, ValueError):
+        raise ValueError('training_ids must be a list of training ids')
+    try:
+        students = int(payload.get('students') or 0)
+    except (TypeError, ValueError):
+        raise ValueError('students must be a whole number')
+    if students < 0:
+        raise ValueError('students must not be negative')
+    overrides = payload.get('faculty_ids') or {}
+    if not isinstance(overrides, dict):
+        raise ValueError('faculty_ids must map training ids to lists of faculty ids')
+    try:
+        overrides = {str(k): [int(f) for f in v] for k, v in overrides.items()}
+    except (TypeError, ValueError):
+        raise ValueError('faculty_ids must map training ids to lists of faculty ids')
+    try:
+        time_budget = float(payload.get('time_budget') or 2.0)
+    except (TypeError, ValueError):
+        raise ValueError('time_budget must be a number of seconds')
+    if not 0 < time_budget:
+        raise ValueError('time_budget must be positive')
+    return training_ids, students, overrides, min(time_budget, MAX_TIME_BUDGET)
+
+
+@login_required
+@require_POST
+def api_timetable_propose(request, program_id):
+    """
+    Propose a conflict-free timetable for a non-calendar program.
+
+    The returned ``schedules`` list uses the same shape as the batch schedule
+    endpoint, so the client can review it and post it back unchanged.
+    """
+    program = get_object_or_404(Program, id=program_id)
+    try:
+        payload = json.loads(request.body or '{}')
+        if not isinstance(payload, dict):
+            raise ValueError
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON body'}, status=400)
+    try:
+        training_ids, default_students, faculty_overrides, time_budget = _parse_options(payload)
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    trainings = Training.objects.filter(program=program)
+    if training_ids:
+        trainings = trainings.filter(id__in=training_ids)
+    trainings = list(trainings)
+    if not trainings:
+        return JsonResponse({'success': False, 'error': 'Program has no trainings to schedule'}, status=400)
+
+    days = _program_days(program)
+    if not days:
+        return JsonResponse({'success': False, 'error': 'Program has no schedule date windows'}, status=400)
+
+    active_faculty = list(Faculty.objects.filter(is_active=True).values_list('id', 'faculty_t_no'))
+    faculty_by_t_no = {t_no: fid for fid, t_no in active_faculty if t_no}
+
+    sessions = []
+    for training in trainings:
+        if str(training.id) in faculty_overrides:
+            faculty_ids = faculty_overrides[str(training.id)]
+        elif training.faculty_t_no in faculty_by_t_no:
+            faculty_ids = [faculty_by_t_no[training.faculty_t_no]]
+        else:
+            faculty_ids = [fid for fid, _ in active_faculty]
+        sessions.append({
+            'id': training.id,
+            'duration': int((training.hours or 1) * 60),
+            'students': default_students,
+            'faculty_ids': faculty_ids,
+            'cohort': program.id,
+        })
+
+    halls = list(Hall.objects.values('id', 'capacity'))
+    try:
+        solver = TimetableSolver(
+            sessions, halls, days,
+            busy=_existing_bookings(days, [t.id for t in trainings]),
+            day_start=str(payload.get('day_start', '09:00')),
+            day_end=str(payload.get('day_end', '17:30')),
+            time_budget=time_budget,
+        )
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': f'Invalid day_start/day_end: {e}'}, status=400)
+    result = solver.solve()
+    logger.info(
+        'Timetable proposal for program %s: %s placed, %s unscheduled, %s iterations',
+        program.id, len(result['placed']), len(result['unplaced']), result['iterations'],
+        extra={'program_id': program.id, 'timed_out': result['timed_out']},
+    )
+    if debug_enabled(logger):
+        logger.debug('Timetable sessions for program %s: %s', program.id, sessions)
+    names = {t.id: t.training_name for t in trainings}
+    return JsonResponse({
+        'success': True,
+        'program_id': program.id,
+        'schedules': format_proposals(result, sessions),
+        'unscheduled': [{'training_id': tid, 'training_name': names.get(tid)} for tid in result['unplaced']],
+        'stats': {
+            'iterations': result['iterations'],
+            'timed_out': result['timed_out'],
+            'days_considered': len(days),
+        },
+    })
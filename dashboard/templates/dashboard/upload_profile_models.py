@@ -0,0 +1,151 @@
+"""
+Data-quality profile of an uploaded workbook, computed once at ingest.
+
+The analysis page used to recount nulls and distinct values of every column
+(and the whole frame's nulls twice) on every view. The profile is computed
+when a FeedbackExcelUpload is saved and stored next to it: per-column type,
+null and distinct counts, completeness and a value histogram, plus the
+sheet totals. Pages read the stored row; ``profile_for`` computes it on
+first use for uploads that predate the table or whose file was replaced.
+"""
+import logging
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models.signals import post_save
+
+from .analytics_helpers import get_pandas
+
+logger = logging.getLogger(__name__)
+
+HISTOGRAM_BINS = 10
+TOP_VALUES = 10
+
+
+class UploadDataProfile(models.Model):
+    upload = models.OneToOneField('FeedbackExcelUpload', on_delete=models.CASCADE, related_name='data_profile')
+    file_name = models.CharField(max_length=255, blank=True)  # file the profile was computed from
+    total_rows = models.PositiveIntegerField(default=0)
+    total_columns = models.PositiveIntegerField(default=0)
+    null_cells = models.PositiveIntegerField(default=0)
+    completeness_rate = models.FloatField(default=0)
+    columns = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    computed_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def total_cells(self):
+        return self.total_rows * self.total_columns
+
+    @property
+    def data_quality(self):
+        return {
+            'total_cells': self.total_cells,
+            'null_cells': self.null_cells,
+            'completeness_rate': self.completeness_rate,
+        }
+
+    def summary(self):
+        return {
+            'total_rows': self.total_rows,
+            'total_columns': self.total_columns,
+            **self.data_quality,
+            'computed_at': self.computed_at,
+        }
+
+    def __str__(self):
+        return f"{self.file_name}: {self.total_rows}x{self.total_columns}, {self.completeness_rate:.1f}% complete"
+
+
+def _histogram(series, pd):
+    """Value histogram of the non-null ``series``: bins for numbers, top values otherwise."""
+    if series.empty:
+        return {'kind': 'empty'}
+    dtype = series.dtype
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return {'kind': 'datetime', 'min': series.min().isoformat(), 'max': series.max().isoformat()}
+    counts = series.value_counts(sort=True)
+    numeric = pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    if numeric and len(counts) > HISTOGRAM_BINS:
+        import numpy as np
+        values, edges = np.histogram(series.to_numpy(dtype='float64'), bins=HISTOGRAM_BINS)
+        return {
+            'kind': 'numeric',
+            'min': float(edges[0]),
+            'max': float(edges[-1]),
+            'bins': [{'start': float(start), 'end': float(end), 'count': int(count)}
+                     for start, end, count in zip(edges[:-1], edges[1:], values)],
+        }
+    top = counts.iloc[:TOP_VALUES]
+    return {
+        'kind': 'values',
+        'values': [{'value': str(value), 'count': int(count)} for value, count in top.items()],
+        'other': int(counts.iloc[TOP_VALUES:].sum()),
+    }
+
+
+def profile_frame(df):
+    """Sheet totals and per-column profile of ``df`` (one null pass over the frame)."""
+    pd = get_pandas()
+    total_rows, total_columns = int(len(df)), int(len(df.columns))
+    nulls = df.isna().sum().to_numpy()
+    columns = []
+    for i, col in enumerate(df.columns):
+        series = df.iloc[:, i].dropna()
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            series = series.cat.remove_unused_categories()
+        columns.append({
+            'name': str(col),
+            'type': str(series.dtype),
+            'non_null_count': int(len(series)),
+            'null_count': int(nulls[i]),
+            'unique_values': int(series.nunique()),
+            'completeness_rate': float(len(series) / total_rows * 100) if total_rows else 0.0,
+            'histogram': _histogram(series, pd),
+        })
+    total_cells = total_rows * total_columns
+    null_cells = int(nulls.sum())
+    return {
+        'total_rows': total_rows,
+        'total_columns': total_columns,
+        'null_cells': null_cells,
+        'completeness_rate': float((total_cells - null_cells) / total_cells * 100) if total_cells else 0.0,
+        'columns': columns,
+    }
+
+
+def store_profile(upload, df=None):
+    """Compute and save the profile of ``upload``'s file; ``df`` saves a parse."""
+    if not upload.file:
+        return None
+    if df is None:
+        from .workbook_loader import load_workbooks
+        df = load_workbooks({'current': upload.file.path})['current']
+    profile, _ = UploadDataProfile.objects.update_or_create(
+        upload=upload, defaults={'file_name': upload.file.name, **profile_frame(df)})
+    return profile
+
+
+def profile_for(upload, df=None):
+    """The stored profile of ``upload``, computed now if missing or stale."""
+    profile = UploadDataProfile.objects.filter(upload=upload).first()
+    if profile is not None and profile.file_name == upload.file.name:
+        return profile
+    return store_profile(upload, df)
+
+
+def _profile_upload(upload_model, pk):
+    try:
+        upload = upload_model.objects.filter(pk=pk).first()
+        if upload is not None:
+            profile_for(upload)
+    except Exception:
+        # The analysis view computes it on first use instead
+        logger.exception('Could not profile upload %s', pk)
+
+
+def _on_upload_saved(sender, instance, **kwargs):
+    if instance.file:
+        transaction.on_commit(lambda: _profile_upload(sender, instance.pk))
+
+
+post_save.connect(_on_upload_saved, sender='dashboard.FeedbackExcelUpload', dispatch_uid='upload_profile_upload_saved')
@@ -0,0 +1,68 @@
+import logging
+
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
+
+from .assessment_models import FeedbackExcelUpload
+from .instrumentation import instrument_view
+from .upload_profile_models import UploadDataProfile, profile_for
+from .workbook_loader import WorkbookTooLarge
+
+logger = logging.getLogger(__name__)
+
+MAX_UPLOADS = 200
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_uploads(request):
+    """
+    Uploaded workbooks with their stored data-quality summary.
+
+    Query parameters: ``schedule_id``, ``training_id``, ``category`` and
+    ``limit`` (default 50). Uploads not profiled yet have ``profile: null``;
+    nothing is parsed here.
+    """
+    try:
+        limit = min(int(request.GET.get('limit', 50)), MAX_UPLOADS)
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'limit must be a number'}, status=400)
+    uploads = FeedbackExcelUpload.objects.exclude(file='')
+    for param in ('schedule_id', 'training_id', 'category'):
+        if request.GET.get(param):
+            uploads = uploads.filter(**{param: request.GET[param]})
+    uploads = list(uploads.order_by('-uploaded_at')[:limit])
+    profiles = {profile.upload_id: profile
+                for profile in UploadDataProfile.objects.filter(upload__in=[u.id for u in uploads]).defer('columns')}
+    return JsonResponse({'success': True, 'uploads': [
+        {
+            'id': upload.id,
+            'schedule_id': upload.schedule_id,
+            'category': upload.category,
+            'original_name': upload.original_name,
+            'uploaded_at': upload.uploaded_at,
+            'profile': (profiles[upload.id].summary()
+                        if upload.id in profiles and profiles[upload.id].file_name == upload.file.name else None),
+        }
+        for upload in uploads
+    ]})
+
+
+@login_required
+@require_GET
+@instrument_view
+def api_upload_profile(request, upload_id):
+    """Full data-quality profile (per-column counts and histograms) of one upload."""
+    upload = get_object_or_404(FeedbackExcelUpload, id=upload_id)
+    if not upload.file:
+        return JsonResponse({'success': False, 'error': 'This upload has no file'}, status=404)
+    try:
+        profile = profile_for(upload)
+    except WorkbookTooLarge as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=413)
+    except FileNotFoundError:
+        return JsonResponse({'success': False, 'error': 'The uploaded file is missing'}, status=404)
+    return JsonResponse({'success': True, **profile.summary(), 'columns': profile.columns})
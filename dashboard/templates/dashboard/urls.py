@@ -7,6 +7,18 @@ from .idi_views import idi_analysis
 from .analysis_view import analysis
 from .auth_views import custom_login, custom_register
 from .attendance_views import upload_and_save_attendance
+from .timetable_views import api_timetable_propose
+from .perf_views import performance_report, download_profile
+from .excel_editor_views import api_excel_range, api_excel_patch
+from .filter_views import api_filter_schedules, api_filter_trainings, api_schedule_facets
+from . import async_views
+from .changefeed_views import api_schedule_changes
+from .cohort_views import api_cohort_analytics
+from .item_analysis_views import api_item_analysis
+from .question_bank_views import api_question_bank, api_question_trend
+from .faculty_score_views import api_faculty_leaderboard, api_faculty_scores
+from .data_grid_views import api_upload_rows
+from .upload_profile_views import api_upload_profile, api_uploads
 
 app_name = 'dashboard'
 
@@ -19,6 +31,8 @@ urlpatterns = [
     path('uploaded-files/', new_views.uploaded_files, name='uploaded-files'),
     path('delete-file/<str:filename>/', new_views.delete_uploaded_file, name='delete-uploaded-file'),
     path('edit-file/<str:filename>/', new_views.edit_excel, name='edit-excel'),
+    path('api/excel/<str:filename>/range/', api_excel_range, name='api_excel_range'),
+    path('api/excel/<str:filename>/patch/', api_excel_patch, name='api_excel_patch'),
     path('programs/calendar/', new_views.calendar_programs, name='calendar_programs'),
     path('programs/non-calendar/', new_views.non_calendar_programs, name='non_calendar_programs'),
     path('programs/<int:program_id>/', new_views.program_details, name='program_details'),
@@ -46,8 +60,11 @@ urlpatterns = [
     path('api/faculty/', new_views.api_faculty, name='api_faculty'),
     path('api/faculty/<int:faculty_id>/', new_views.api_faculty_detail, name='api_faculty_detail'),
     path('api/faculty/<int:faculty_id>/trainings/', new_views.api_faculty_trainings, name='api_faculty_trainings'),
+    path('api/faculty/<int:faculty_id>/scores/', api_faculty_scores, name='api_faculty_scores'),
+    path('api/faculty/leaderboard/', api_faculty_leaderboard, name='api_faculty_leaderboard'),
     path('api/trainings/', new_views.api_trainings, name='api_trainings'),
     path('dashboard/schedule_program/<int:program_id>/', new_views.schedule_program_view, name='schedule_program'),
+    path('api/programs/<int:program_id>/timetable/propose/', api_timetable_propose, name='api_timetable_propose'),
     path('dashboard/update_program_type/<int:program_id>/', new_views.update_program_type, name='update_program_type'),
     path('mor/upload/', new_views.mor_upload, name='mor_upload'),
     path('mor/list/', new_views.mor_list, name='mor_list'),
@@ -97,6 +114,13 @@ urlpatterns = [
     path('api/schedule-table/', schedule_table_api, name='schedule_table_api'),
     path('api/schedules/<int:schedule_id>/delete-excel/', new_views.api_schedule_delete_excel, name='api_schedule_delete_excel'),
     path('analysis/<str:category>/<int:schedule_id>/', analysis, name='analysis'),
+    path('api/analysis/<str:category>/<int:schedule_id>/items/', api_item_analysis, name='api_item_analysis'),
+    path('api/uploads/', api_uploads, name='api_uploads'),
+    path('api/uploads/<int:upload_id>/rows/', api_upload_rows, name='api_upload_rows'),
+    path('api/uploads/<int:upload_id>/profile/', api_upload_profile, name='api_upload_profile'),
+    path('api/analytics/cohort/', api_cohort_analytics, name='api_cohort_analytics'),
+    path('api/questions/', api_question_bank, name='api_question_bank'),
+    path('api/questions/<str:key>/trend/', api_question_trend, name='api_question_trend'),
     path('analysis/pre-improvement/<int:schedule_id>/', new_views.pre_post_improvement_analysis, name='pre_post_improvement_analysis'),
     # New utility URLs
     path('dashboard-data/', new_views.dashboard_data, name='dashboard_data'),
@@ -105,4 +129,20 @@ urlpatterns = [
     path('api/scheduled-trainings-for-trainings/', new_views.api_scheduled_trainings_for_trainings, name='api_scheduled_trainings_for_trainings'),
     path('api/upload_attendance/', upload_and_save_attendance, name='upload_and_save_attendance'),
     path('api/employee_lookup/', employee_lookup, name='employee_lookup'),
+    path('api/schedules/filter/', api_filter_schedules, name='api_filter_schedules'),
+    path('api/changes/', api_schedule_changes, name='api_schedule_changes'),
+    path('api/schedules/facets/', api_schedule_facets, name='api_schedule_facets'),
+    path('api/trainings/filter/', api_filter_trainings, name='api_filter_trainings'),
+    # Async (ASGI) variants of the I/O-bound endpoints
+    path('api/async/uploaded-files/', async_views.async_uploaded_files, name='async_uploaded_files'),
+    path('api/async/verify-sync/', async_views.async_verify_sync, name='async_verify_sync'),
+    path('api/async/documents/<int:document_id>/download/', async_views.async_download_document, name='async_download_document'),
+    path('api/async/programs/<int:program_id>/upload_document/', async_views.async_upload_program_document, name='async_upload_program_document'),
+    path('api/async/halls/', async_views.async_api_halls, name='async_api_halls'),
+    path('api/async/programs/', async_views.async_api_programs, name='async_api_programs'),
+    path('api/async/faculty/', async_views.async_api_faculty, name='async_api_faculty'),
+    path('api/async/trainings/', async_views.async_api_trainings, name='async_api_trainings'),
+    # Performance instrumentation (staff only)
+    path('perf/', performance_report, name='performance_report'),
+    path('perf/profiles/<str:profile_id>/', download_profile, name='download_profile'),
 ] 
\ No newline at end of file
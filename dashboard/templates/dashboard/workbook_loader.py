@@ -0,0 +1,283 @@
+"""
+Parallel workbook loading.
+
+openpyxl parsing is CPU-bound and holds the GIL, so the workbooks a request
+needs (pre, post and the category file) are parsed side by side on a shared
+ProcessPoolExecutor. Workers send frames back as Arrow IPC buffers when
+pyarrow is installed, otherwise as protocol-5 pickles. If the pool is
+unavailable, breaks, or a parse exceeds EXCEL_PARSE_TIMEOUT the file is
+parsed in-process instead, so callers always get a DataFrame back.
+Frames already in the on-disk frame cache are not parsed at all.
+
+Every parsed frame goes through ``frame_dtypes.optimise_dtypes`` before it
+is cached or returned, and callers that need only some columns pass
+``usecols``. One ``load_workbooks`` call (one request) may hold at most
+EXCEL_MEMORY_BUDGET_MB of freshly parsed data: the sheet dimensions are
+read first, workbooks that would overflow the budget are streamed row by
+row in-process instead of parsed whole, and a workbook too large even when
+streamed is refused with WorkbookTooLarge.
+"""
+import atexit
+import io
+import logging
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from . import frame_cache
+from .analytics_helpers import get_pandas
+from .frame_dtypes import memory_bytes, optimise_dtypes
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = threading.Lock()
+
+# Rough in-memory size of one cell: openpyxl cell objects plus an object-dtype
+# DataFrame while read_excel runs, and after dtype optimisation
+PARSE_BYTES_PER_CELL = 160
+OPTIMISED_BYTES_PER_CELL = 16
+FILE_SIZE_FACTOR = 40
+STREAM_CHUNK_ROWS = 5000
+
+
+class WorkbookTooLarge(Exception):
+    def __init__(self, path, estimate, budget):
+        self.path, self.estimate, self.budget = path, estimate, budget
+        super().__init__(
+            f'{os.path.basename(path)} needs about {estimate / 2 ** 20:.1f} MB in memory, '
+            f'over the {budget / 2 ** 20:.1f} MB limit for one request'
+        )
+
+
+def _memory_budget():
+    budget_mb = getattr(settings, 'EXCEL_MEMORY_BUDGET_MB', 512)
+    return int(budget_mb * 2 ** 20) if budget_mb else None
+
+
+def _max_workers():
+    default = min(4, os.cpu_count() or 1)
+    return int(getattr(settings, 'EXCEL_PARSE_WORKERS', default))
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None and _max_workers() > 1:
+            _pool = ProcessPoolExecutor(max_workers=_max_workers())
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _encode(df):
+    try:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return 'arrow', sink.getvalue()
+    except Exception:
+        # pyarrow missing, or mixed-type object columns it cannot convert
+        return 'pickle', pickle.dumps(df, protocol=5)
+
+
+def _decode(kind, payload):
+    if kind == 'arrow':
+        import pyarrow as pa
+        return pa.ipc.open_stream(payload).read_all().to_pandas()
+    return pickle.loads(payload)
+
+
+def _column_names(header):
+    """Column labels the way read_excel makes them: 'Unnamed: i' for blanks, '.1' suffixes for repeats."""
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f'Unnamed: {i}' if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            name = f'{name}.{seen[name]}'
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _selected(names, usecols):
+    if usecols is None:
+        return list(range(len(names)))
+    if callable(usecols):
+        return [i for i, name in enumerate(names) if usecols(name)]
+    wanted = set(usecols)
+    return [i for i, name in enumerate(names) if name in wanted or i in wanted]
+
+
+def estimate_memory(path, usecols=None):
+    """
+    ``(parse bytes, optimised bytes)`` expected for the first sheet of
+    ``path``, or None when openpyxl cannot read its dimensions (e.g. .xls).
+    """
+    from openpyxl import load_workbook
+
+    try:
+        wb = load_workbook(path, read_only=True, data_only=True)
+    except Exception:
+        return None
+    try:
+        ws = wb.worksheets[0]
+        header = next(ws.iter_rows(max_row=1, values_only=True), ())
+        rows, columns = ws.max_row, ws.max_column
+    finally:
+        wb.close()
+    if not rows or not columns:
+        return None
+    used = len(_selected(_column_names(header), usecols))
+    return rows * columns * PARSE_BYTES_PER_CELL, rows * used * OPTIMISED_BYTES_PER_CELL
+
+
+def _log_memory(path, before, df):
+    after = memory_bytes(df)
+    logger.info('Loaded %s: %d rows x %d columns, %.1f MB -> %.1f MB after dtype optimisation',
+                os.path.basename(path), len(df), len(df.columns), before / 2 ** 20, after / 2 ** 20)
+    df.attrs['memory'] = {'before': before, 'after': after}
+
+
+def read_workbook(path, **read_kwargs):
+    df = get_pandas().read_excel(path, **read_kwargs)
+    before = memory_bytes(df)
+    df = optimise_dtypes(df)
+    _log_memory(path, before, df)
+    return df
+
+
+def stream_workbook(path, usecols=None):
+    """
+    Read the first sheet row by row with openpyxl in read-only mode.
+
+    Only the selected columns are kept and every STREAM_CHUNK_ROWS rows are
+    turned into a compact frame, so the whole sheet never exists as Python
+    objects at once. Entirely empty rows are skipped.
+    """
+    from openpyxl import load_workbook
+
+    pd = get_pandas()
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        names = _column_names(next(rows, ()))
+        selected = _selected(names, usecols)
+        columns = [names[i] for i in selected]
+        chunks, buffer, before = [], [], 0
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in selected]
+            if any(value is not None for value in values):
+                buffer.append(values)
+            if len(buffer) >= STREAM_CHUNK_ROWS:
+                chunk = pd.DataFrame(buffer, columns=columns)
+                before += memory_bytes(chunk)
+                chunks.append(optimise_dtypes(chunk, categories=False))
+                buffer = []
+        chunk = pd.DataFrame(buffer, columns=columns)
+        before += memory_bytes(chunk)
+        chunks.append(chunk)
+    finally:
+        wb.close()
+    df = optimise_dtypes(pd.concat(chunks, ignore_index=True))
+    _log_memory(path, before, df)
+    return df
+
+
+def _parse_in_worker(path, read_kwargs):
+    return _encode(read_workbook(path, **read_kwargs))
+
+
+def _plan(paths, read_kwargs):
+    """Split ``paths`` into ``(parse whole, stream)`` so the parses fit the memory budget."""
+    budget = _memory_budget()
+    if budget is None or not paths:
+        return paths, []
+    # Streaming supports the first sheet with a header row, i.e. only usecols
+    streamable = set(read_kwargs) <= {'usecols'}
+    estimates = {}
+    for path in paths:
+        estimate = estimate_memory(path, read_kwargs.get('usecols'))
+        # Unknown dimensions: assume the parse takes FILE_SIZE_FACTOR x the file and cannot stream
+        estimates[path] = estimate or (os.path.getsize(path) * FILE_SIZE_FACTOR, None)
+    to_parse, to_stream, used = [], [], 0
+    for path in sorted(paths, key=lambda p: estimates[p][0]):
+        parse_bytes, optimised_bytes = estimates[path]
+        if used + parse_bytes <= budget:
+            to_parse.append(path)
+            used += parse_bytes
+        elif streamable and optimised_bytes is not None and used + optimised_bytes <= budget:
+            to_stream.append(path)
+            used += optimised_bytes
+        else:
+            raise WorkbookTooLarge(path, optimised_bytes if streamable and optimised_bytes else parse_bytes, budget)
+    return to_parse, to_stream
+
+
+def load_workbooks(paths, timeout=None, **read_kwargs):
+    """
+    Parse several workbooks in parallel.
+
+    ``paths`` maps caller keys (e.g. ``'pre'``, ``'post'``) to file paths;
+    the same path listed under several keys is parsed once and the frame is
+    shared. Returns a dict with the same keys. ``read_kwargs`` go to
+    read_excel; pass ``usecols`` (a list or a module-level predicate, so it
+    can be sent to the pool) to load only the columns the caller uses.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'EXCEL_PARSE_TIMEOUT', 120)
+    unique_paths = sorted({str(p) for p in paths.values() if p})
+    frames = {}
+    for path in unique_paths:
+        cached = frame_cache.get(path, read_kwargs)
+        if cached is not None:
+            frames[path] = cached
+    to_parse, to_stream = _plan(
+        [path for path in unique_paths if path not in frames], read_kwargs)
+
+    pool = get_pool() if len(to_parse) > 1 else None
+    if pool is not None:
+        try:
+            futures = {pool.submit(_parse_in_worker, path, read_kwargs): path for path in to_parse}
+        except (BrokenProcessPool, RuntimeError):
+            logger.warning('Workbook pool unavailable, parsing in-process', exc_info=True)
+            _reset_pool()
+            futures = {}
+        done, not_done = wait(futures, timeout=timeout)
+        for future in not_done:
+            future.cancel()
+            logger.warning('Parsing %s timed out after %ss in the pool; retrying in-process',
+                           futures[future], timeout)
+        for future in done:
+            path = futures[future]
+            try:
+                frames[path] = _decode(*future.result())
+            except BrokenProcessPool:
+                logger.warning('Workbook pool broke while parsing %s', path, exc_info=True)
+                _reset_pool()
+            except Exception:
+                logger.warning('Pool parse of %s failed; retrying in-process', path, exc_info=True)
+
+    for path in to_parse:
+        if path not in frames:
+            frames[path] = read_workbook(path, **read_kwargs)
+        frame_cache.put(path, frames[path], read_kwargs)
+    for path in to_stream:
+        frames[path] = stream_workbook(path, read_kwargs.get('usecols'))
+        frame_cache.put(path, frames[path], read_kwargs)
+    return {key: frames[str(path)] if path else None for key, path in paths.items()}
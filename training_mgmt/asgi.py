@@ -3,6 +3,12 @@ ASGI config for training_mgmt project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Production ASGI mode (the async views under /api/async/ then run on the
+event loop instead of tying up a worker thread, and /api/changes/ long
+polls; under the WSGI server it answers immediately):
+
+    uvicorn training_mgmt.asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
@@ -0,0 +1,14 @@
+from django.db import connection
+from django.http import JsonResponse
+from django.views.decorators.cache import never_cache
+
+
+@never_cache
+def health_check(request):
+    """Readiness probe used by SkillEdge.py: the app is loaded and the database answers."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+    except Exception as e:
+        return JsonResponse({'status': 'error', 'database': str(e)}, status=503)
+    return JsonResponse({'status': 'ok'})
@@ -0,0 +1,161 @@
+"""
+Production server for local installs (used by SkillEdge.py).
+
+Runs the WSGI application under waitress with a pool of threads and, on
+platforms with fork(), several worker processes sharing one listening
+socket. Collected static files are served straight from STATIC_ROOT with
+long-lived cache headers and ETags, without going through Django.
+SIGTERM / SIGINT (CTRL_BREAK on Windows) finish in-flight requests and exit.
+
+Run: python -m training_mgmt.server --port 8000 --threads 8 --workers 2
+"""
+import argparse
+import hashlib
+import mimetypes
+import os
+import signal
+import socket
+import sys
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+STATIC_MAX_AGE = 7 * 24 * 3600
+
+
+class StaticFilesApp:
+    """Serve files under ``prefix`` from ``root``; pass everything else to ``app``."""
+
+    def __init__(self, app, root, prefix):
+        self.app = app
+        self.root = Path(root).resolve()
+        self.prefix = prefix if prefix.endswith('/') else prefix + '/'
+
+    def _resolve(self, path_info):
+        relative = path_info[len(self.prefix):]
+        path = (self.root / relative).resolve()
+        if self.root not in path.parents or not path.is_file():
+            return None
+        return path
+
+    def __call__(self, environ, start_response):
+        path_info = environ.get('PATH_INFO', '')
+        if not path_info.startswith(self.prefix) or environ['REQUEST_METHOD'] not in ('GET', 'HEAD'):
+            return self.app(environ, start_response)
+        path = self._resolve(path_info)
+        if path is None:
+            return self.app(environ, start_response)
+
+        stat = path.stat()
+        etag = '"%s"' % hashlib.md5(f'{stat.st_mtime_ns}-{stat.st_size}'.encode()).hexdigest()
+        headers = [
+            ('ETag', etag),
+            ('Last-Modified', formatdate(stat.st_mtime, usegmt=True)),
+            ('Cache-Control', f'public, max-age={STATIC_MAX_AGE}'),
+        ]
+        if environ.get('HTTP_IF_NONE_MATCH') == etag or self._not_modified_since(environ, stat.st_mtime):
+            start_response('304 Not Modified', headers)
+            return [b'']
+
+        content_type = mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+        headers += [('Content-Type', content_type), ('Content-Length', str(stat.st_size))]
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return [b'']
+        handle = open(path, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        return file_wrapper(handle, 64 * 1024) if file_wrapper else iter(lambda: handle.read(64 * 1024), b'')
+
+    @staticmethod
+    def _not_modified_since(environ, mtime):
+        header = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if not header:
+            return False
+        try:
+            return int(mtime) <= parsedate_to_datetime(header).timestamp()
+        except (TypeError, ValueError):
+            return False
+
+
+def build_application():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'training_mgmt.settings')
+    from django.conf import settings
+    from django.core.wsgi import get_wsgi_application
+
+    application = get_wsgi_application()
+    try:
+        from whitenoise import WhiteNoise
+        return WhiteNoise(application, root=str(settings.STATIC_ROOT), prefix=settings.STATIC_URL)
+    except ImportError:
+        return StaticFilesApp(application, settings.STATIC_ROOT, settings.STATIC_URL)
+
+
+def _serve(application, sock, threads):
+    from waitress.server import create_server
+
+    server = create_server(application, sockets=[sock], threads=threads)
+
+    def shutdown(signum, frame):
+        # waitress treats SystemExit as a shutdown request: it stops accepting
+        # and gives in-flight requests a few seconds to finish.
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    if hasattr(signal, 'SIGBREAK'):
+        signal.signal(signal.SIGBREAK, shutdown)
+    server.run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run SkillEdge with a production WSGI server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes (requires fork; ignored on Windows)')
+    args = parser.parse_args(argv)
+
+    application = build_application()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(1024)
+    sock.setblocking(False)
+
+    workers = args.workers if hasattr(os, 'fork') else 1
+    print(f'Serving on http://{args.host}:{args.port} ({workers} process(es) x {args.threads} threads)')
+    if workers == 1:
+        _serve(application, sock, args.threads)
+        return 0
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            _serve(application, sock, args.threads)
+            os._exit(0)
+        children.append(pid)
+
+    def stop_children(signum, frame):
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop_children)
+    signal.signal(signal.SIGINT, stop_children)
+    while children:
+        try:
+            pid, _ = os.wait()
+            children.remove(pid)
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            time.sleep(0.1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
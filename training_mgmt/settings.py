@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 from django.core.exceptions import ImproperlyConfigured
 
@@ -25,6 +26,9 @@ def get_env_value(env_variable, default=None):
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
+# A PyInstaller onedir build keeps code under _internal/; writable data
+# (database, media, local storage) lives next to SkillEdge.exe instead.
+DATA_DIR = Path(sys.executable).resolve().parent if getattr(sys, 'frozen', False) else BASE_DIR
 
 
 # Quick-start development settings - unsuitable for production
@@ -40,6 +44,7 @@ ALLOWED_HOSTS = get_env_value('DJANGO_ALLOWED_HOSTS', '*').split(',')
 
 # Security settings
 SECURE_SSL_REDIRECT = not DEBUG
+SECURE_REDIRECT_EXEMPT = [r'^healthz/$']  # local readiness probe is plain HTTP
 SESSION_COOKIE_SECURE = not DEBUG
 CSRF_COOKIE_SECURE = not DEBUG
 SECURE_BROWSER_XSS_FILTER = True
@@ -69,10 +74,21 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'training_mgmt.log_config.LogSamplingMiddleware',
+    'dashboard.audit.AuditBufferMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Opt-in per-request profiling (Server-Timing headers, per-route histograms at /perf/)
+PERF_INSTRUMENTATION = get_env_value('DJANGO_PERF_INSTRUMENTATION', 'False').lower() == 'true'
+PERF_TRACK_MEMORY = get_env_value('DJANGO_PERF_TRACK_MEMORY', 'True').lower() == 'true'
+if PERF_INSTRUMENTATION:
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index('django.contrib.auth.middleware.AuthenticationMiddleware') + 1,
+        'dashboard.instrumentation.PerformanceMiddleware',
+    )
+
 ROOT_URLCONF = 'training_mgmt.urls'
 
 TEMPLATES = [
@@ -101,7 +117,7 @@ WSGI_APPLICATION = 'training_mgmt.wsgi.application'
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': DATA_DIR / 'db.sqlite3',
     }
 }
 
@@ -141,6 +157,7 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = '/static/'
+# Inside the frozen build's bundle: SkillEdge.spec collects static files at build time
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_DIRS = [
     BASE_DIR / 'static',
@@ -148,10 +165,10 @@ STATICFILES_DIRS = [
 
 # Media files (Uploaded files)
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = DATA_DIR / 'media'
 
 # Local file storage configuration
-LOCAL_STORAGE_PATH = BASE_DIR / 'local_storage'
+LOCAL_STORAGE_PATH = DATA_DIR / 'local_storage'
 EXCEL_FILES_PATH = LOCAL_STORAGE_PATH / 'excel_files'
 BACKUP_PATH = LOCAL_STORAGE_PATH / 'backups'
 
@@ -160,6 +177,32 @@ LOCAL_STORAGE_PATH.mkdir(exist_ok=True)
 EXCEL_FILES_PATH.mkdir(exist_ok=True)
 BACKUP_PATH.mkdir(exist_ok=True)
 
+# Workbook parsing: pre/post/category files are parsed in parallel worker
+# processes; a parse slower than the timeout falls back to in-process parsing.
+EXCEL_PARSE_WORKERS = int(get_env_value('DJANGO_EXCEL_PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+EXCEL_PARSE_TIMEOUT = int(get_env_value('DJANGO_EXCEL_PARSE_TIMEOUT', '120'))
+# Parsed workbooks are cached as Parquet/pickle, keyed by path + mtime + size
+FRAME_CACHE_ENABLED = get_env_value('DJANGO_FRAME_CACHE_ENABLED', 'True') == 'True'
+FRAME_CACHE_PATH = LOCAL_STORAGE_PATH / 'frame_cache'
+# Freshly parsed workbook data one request may hold; larger files are streamed
+# with only the needed columns, or refused when even that does not fit. 0 = no limit
+EXCEL_MEMORY_BUDGET_MB = int(get_env_value('DJANGO_EXCEL_MEMORY_BUDGET_MB', '512'))
+# Identical concurrent analysis requests wait for one computation (file locks
+# here) and reuse its result for this many seconds. 0 = coalesce without reuse
+SINGLE_FLIGHT_PATH = LOCAL_STORAGE_PATH / 'single_flight'
+SINGLE_FLIGHT_RESULT_TTL = int(get_env_value('DJANGO_SINGLE_FLIGHT_RESULT_TTL', '60'))
+# Uploaded documents are stored once per distinct content (SHA-256) here
+DOCUMENT_STORE_PATH = LOCAL_STORAGE_PATH / 'document_store'
+
+# Detailed-schedule history stores a full snapshot every N revisions, diffs in between
+SNAPSHOT_KEYFRAME_INTERVAL = int(get_env_value('DJANGO_SNAPSHOT_KEYFRAME_INTERVAL', '20'))
+
+# Audit entries older than this are moved to BACKUP_PATH/audit by archive_audit_logs
+AUDIT_RETENTION_DAYS = int(get_env_value('DJANGO_AUDIT_RETENTION_DAYS', '365'))
+
+# Schedule change-feed entries older than this are dropped by prune_change_feed
+CHANGE_FEED_RETENTION_DAYS = int(get_env_value('DJANGO_CHANGE_FEED_RETENTION_DAYS', '30'))
+
 # OneDrive configuration (optional)
 ONEDRIVE_ENABLED = True  # Set to False to disable OneDrive sync
 ONEDRIVE_PATH = r'C:/Users/kartikeya krishna/OneDrive - National Institute of Technology'
@@ -184,3 +227,43 @@ FILE_UPLOAD_DIRECTORY_PERMISSIONS = 0o755
 SESSION_COOKIE_AGE = 3600  # 1 hour
 SESSION_EXPIRE_AT_BROWSER_CLOSE = True
 SESSION_SAVE_EVERY_REQUEST = False
+
+
+# Logging
+# Per-module levels come from DJANGO_LOG_LEVELS, e.g.
+# "dashboard=INFO,dashboard.analysis_view=DEBUG". DEBUG records are emitted for
+# a DJANGO_LOG_DEBUG_SAMPLE_RATE fraction of requests (1.0 = every request).
+from training_mgmt.log_config import configure_sampling, parse_levels
+
+LOG_FORMAT = get_env_value('DJANGO_LOG_FORMAT', 'text' if DEBUG else 'json')
+LOG_LEVELS = {
+    'django': 'INFO',
+    'dashboard': 'DEBUG' if DEBUG else 'INFO',
+    'scheduler': 'INFO',
+    **parse_levels(get_env_value('DJANGO_LOG_LEVELS', '')),
+}
+configure_sampling(get_env_value('DJANGO_LOG_DEBUG_SAMPLE_RATE', '1.0'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'training_mgmt.log_config.JsonFormatter'},
+        'text': {'format': '%(asctime)s %(levelname)s %(name)s: %(message)s'},
+    },
+    'filters': {
+        'sampled_debug': {'()': 'training_mgmt.log_config.SampledDebugFilter'},
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': LOG_FORMAT,
+            'filters': ['sampled_debug'],
+        },
+    },
+    'root': {'handlers': ['console'], 'level': 'WARNING'},
+    'loggers': {
+        name: {'handlers': ['console'], 'level': level, 'propagate': False}
+        for name, level in LOG_LEVELS.items()
+    },
+}
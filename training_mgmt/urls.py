@@ -17,14 +17,18 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
 from dashboard.views import api_program_trainings
+from dashboard.document_store_views import serve_media
+from training_mgmt.health import health_check
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('healthz/', health_check, name='health_check'),
     path('api/program_trainings/', api_program_trainings, name='api_program_trainings'),
     path('dashboard/', include('dashboard.urls',namespace='dashboard')),
     path('', include('dashboard.urls',namespace='dashboard_home')),
     path('accounts/', include('django.contrib.auth.urls')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    # Uploaded files, with Range / ETag / If-Modified-Since support (also when DEBUG is off)
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:name>", serve_media, name='media'),
+]